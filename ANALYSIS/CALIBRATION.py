@@ -0,0 +1,289 @@
+import argparse
+import csv
+import json
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Sequence, Tuple
+from ATBAT.ATBAT_FACTORY import AtBatFactory
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from CONTEXT.ATBAT_CONTEXT import AtBatToken
+from GAMEDAY import setup_game, run_game
+from SIMULATION.BATCH_SIM import init_worker, get_team, DEFAULT_CHUNK_SIZE
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import Macro
+from UTILITIES.RANDOM import seed_random, derive_seed
+from UTILITIES.STAT_TESTS import StatTests
+
+DEFAULT_SCHEDULE = os.path.join("GAME_DATA", "SCHEDULE.csv")
+DEFAULT_GAMES = 5000
+DEFAULT_SEED = 2025
+DEFAULT_MIN_PA = 300   # Players with fewer plate appearances are left out of the player table
+DEFAULT_TOP = 20
+# The engine's default pools (500 values, repositioned each game) wrap several times a game, so
+# their draws are not independent. Calibration rebuilds them from a derived seed every POOL_GAMES
+# games, with POOL_PER_GAME values per game (a game reads about 700 from the general pool).
+POOL_GAMES = 100
+POOL_PER_GAME = 1000
+
+# Per-PA rates checked; H is every hit, home runs included
+RATES = ('SO', 'BB', 'HBP', 'HR', '1B', '2B', '3B', 'H')
+# Where each rate's realized count lives in the stat tables (pitcher lines have no HBP or hit types)
+BATTER_FIELDS = {'SO': 'SO', 'BB': 'BB', 'HBP': 'HBP', 'HR': 'HR', '1B': '1B', '2B': '2B', '3B': '3B', 'H': 'H'}
+PITCHER_FIELDS = {'SO': 'SO', 'BB': 'BB', 'HR': 'HR', 'H': 'H'}
+
+# Player key -> {'pa', 'realized', 'input', 'model', 'variance'}; the arrays run over RATES
+Tally = Dict[Tuple[str, int], Dict]
+
+
+def per_pa(probs: Dict[str, float]) -> np.ndarray:
+    """
+    Probability of each of RATES in one plate appearance, as AtBatSimulator.generate_macro_outcome
+    draws them: SO/BB/HP/HR first, then a hit on a ball in play at BA, split by the IH/SL/DL/TL shares.
+    """
+    base = probs['SO'] + probs['BB'] + probs['HP'] + probs['HR']
+    in_play_hit = max(0.0, 1.0 - base) * probs['BA']
+    hits = probs['IH'] + probs['SL'] + probs['DL'] + probs['TL']
+    if hits > 0:
+        single = in_play_hit * (probs['IH'] + probs['SL']) / hits
+        double, triple = in_play_hit * probs['DL'] / hits, in_play_hit * probs['TL'] / hits
+    else:
+        single, double, triple = in_play_hit, 0.0, 0.0  # The engine's fallback is a single
+    return np.array([probs['SO'], probs['BB'], probs['HP'], probs['HR'], single, double, triple,
+                     probs['HR'] + in_play_hit])
+
+
+def _empty() -> Dict:
+    return {'pa': 0, 'realized': np.zeros(len(RATES)), 'input': np.zeros(len(RATES)),
+            'model': np.zeros(len(RATES)), 'variance': np.zeros(len(RATES))}
+
+
+def _add_realized(batters: Tally, pitchers: Tally):
+    """ Add the lines in the current stat tables to the tallies' realized counts. """
+    for side, fields, table in ((batters, BATTER_FIELDS, StatsManager.batter_stats),
+                                (pitchers, PITCHER_FIELDS, StatsManager.pitcher_stats)):
+        for key, line in table.items():
+            totals = side.setdefault(key, _empty())
+            totals['realized'] += np.array([line[fields[rate]] if rate in fields else np.nan for rate in RATES],
+                                           dtype=float)
+
+
+def merge(into: Tally, other: Tally):
+    """ Add one tally into another. """
+    for key, found in other.items():
+        totals = into.setdefault(key, _empty())
+        totals['pa'] += found['pa']
+        for name in ('realized', 'input', 'model', 'variance'):
+            totals[name] += found[name]
+
+
+class _MatchupCounter:
+    """
+    Counts plate appearances per (batter, pitcher, home park). AtBatSimulator.simulate_at_bat is
+    swapped to note the matchup and AtBatFactory.execute_event to count its executed macro events,
+    so an at-bat cut short by a third out on the bases or a walk-off (and drawn again) is not counted.
+    """
+
+    def __init__(self):
+        self.counts: Dict[Tuple[int, int, int], list] = {}  # ids -> [batter, pitcher, home team, PAs]
+        self._saved = None
+
+    def __enter__(self):
+        self._saved = AtBatSimulator.__dict__['simulate_at_bat'], AtBatFactory.__dict__['execute_event']
+        simulate, execute = AtBatSimulator.simulate_at_bat, AtBatFactory.execute_event
+        counts = self.counts
+        current = [None]  # Entry of the at-bat being played
+
+        def simulate_at_bat(gamestate, token):
+            key = (id(token.batter), id(token.pitcher), id(gamestate.home_team))
+            entry = counts.get(key)
+            if entry is None:
+                entry = counts[key] = [token.batter, token.pitcher, gamestate.home_team, 0]
+            current[0] = entry
+            return simulate(gamestate, token)
+
+        def execute_event(code, gamestate, token):
+            result = execute(code, gamestate, token)
+            if code.__class__ is Macro:
+                current[0][3] += 1
+            return result
+        AtBatSimulator.simulate_at_bat = simulate_at_bat
+        AtBatFactory.execute_event = execute_event
+        return self
+
+    def __exit__(self, *exc):
+        AtBatSimulator.simulate_at_bat, AtBatFactory.execute_event = self._saved
+        return False
+
+
+def calibrate_chunk(pairs: Sequence[Tuple[str, str]], start: int, count: int, seed: int) -> Tuple[Tally, Tally]:
+    """
+    Play games [start, start + count) of the cycled schedule pairs and tally every player's plate
+    appearances, realized outcome counts, and expected counts under the input card alone and under
+    the engine's matchup model (with the model's variance). Each game is played in fresh stat
+    tables, so pitching changes never see another game's pitch counts. Pools are rebuilt every
+    POOL_GAMES games from (seed, first game) and read in order, so the draws are independent.
+
+    Returns:
+        (batters, pitchers) tallies keyed by (team, player_id)
+    """
+    init_worker()
+    counter = _MatchupCounter()
+    batters, pitchers = {}, {}
+    with counter:
+        for game_num in range(start, start + count):
+            if (game_num - start) % POOL_GAMES == 0:
+                seed_random(derive_seed(seed, game_num), size=POOL_GAMES * POOL_PER_GAME)
+            away, home = pairs[game_num % len(pairs)]
+            with StatsManager.isolated():
+                run_game(setup_game(get_team(away), get_team(home)))
+                _add_realized(batters, pitchers)
+
+    for batter, pitcher, home_team, n in counter.counts.values():
+        model = per_pa(AtBatSimulator.generate_matchup_probs(SimpleNamespace(home_team=home_team),
+                                                             AtBatToken(batter=batter, pitcher=pitcher)))
+        b_eff, p_eff = AtBatSimulator.get_effective_handedness(batter, pitcher)
+        cards = ((batters, batter, batter.stats_vl if p_eff == "L" else batter.stats_vr),
+                 (pitchers, pitcher, pitcher.stats_vl if b_eff == "L" else pitcher.stats_vr))
+        for side, player, card in cards:
+            totals = side.setdefault((player.team_abbrev, player.player_id), _empty())
+            totals['pa'] += n
+            totals['input'] += n * per_pa(card)
+            totals['model'] += n * model
+            totals['variance'] += n * model * (1 - model)
+    return batters, pitchers
+
+
+def load_pairs(schedule_csv: str) -> List[Tuple[str, str]]:
+    """ (away, home) for every game of a schedule, in order. """
+    with open(schedule_csv, newline='') as f:
+        return [(row['away_team'], row['home_team']) for row in csv.DictReader(f)]
+
+
+def simulate(pairs: Sequence[Tuple[str, str]], n_games: int, seed: int = DEFAULT_SEED, workers: int = 1,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[Tally, Tally]:
+    """
+    Play `n_games` games (the schedule pairs cycled) across `workers` processes into merged tallies.
+    The tallies depend on the seed and `chunk_size`, not on the number of workers.
+    """
+    plan = [(start, min(chunk_size, n_games - start)) for start in range(0, n_games, chunk_size)]
+    batters, pitchers = {}, {}
+    if workers <= 1:
+        results = (calibrate_chunk(pairs, start, count, seed) for start, count in plan)
+        for chunk_batters, chunk_pitchers in results:
+            merge(batters, chunk_batters)
+            merge(pitchers, chunk_pitchers)
+        return batters, pitchers
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [pool.submit(calibrate_chunk, list(pairs), start, count, seed) for start, count in plan]
+        for future in futures:
+            chunk_batters, chunk_pitchers = future.result()
+            merge(batters, chunk_batters)
+            merge(pitchers, chunk_pitchers)
+    return batters, pitchers
+
+
+# ==================== REPORT ====================
+
+def compare(totals: Dict, confidence: float = 0.95) -> List[Dict]:
+    """
+    Realized against expected rates for one tally entry (a player, or a whole league summed).
+
+    The realized count of each outcome is a sum of independent per-PA Bernoulli draws, so under
+    the model its variance is the summed p(1 - p); intervals on realized - model and
+    realized - input use that spread.
+
+    Returns:
+        One row per rate the tables record: {'rate', 'pa', 'input', 'model', 'realized',
+        'delta_model', 'delta_input', 'half_width', 'z'}
+    """
+    pa = totals['pa']
+    if pa == 0:
+        return []
+    z_crit = StatTests.z_score(confidence)
+    rows = []
+    for i, rate in enumerate(RATES):
+        realized = totals['realized'][i]
+        if np.isnan(realized):
+            continue
+        sd = totals['variance'][i] ** 0.5
+        rows.append({'rate': rate, 'pa': pa, 'input': totals['input'][i] / pa, 'model': totals['model'][i] / pa,
+                     'realized': realized / pa, 'delta_model': (realized - totals['model'][i]) / pa,
+                     'delta_input': (realized - totals['input'][i]) / pa, 'half_width': z_crit * sd / pa,
+                     'z': (realized - totals['model'][i]) / sd if sd > 0 else 0.0})
+    return rows
+
+
+def league_totals(tally: Tally) -> Dict:
+    """ Every player's tally summed. """
+    total = _empty()
+    for entry in tally.values():
+        total['pa'] += entry['pa']
+        for name in ('realized', 'input', 'model', 'variance'):
+            total[name] += entry[name]
+    return total
+
+
+def player_rows(tally: Tally, min_pa: int = DEFAULT_MIN_PA, confidence: float = 0.95) -> List[Dict]:
+    """ compare() rows for every player with at least `min_pa` plate appearances, tagged with the player. """
+    rows = []
+    for (team, player_id), entry in tally.items():
+        if entry['pa'] >= min_pa:
+            rows += [{'team': team, 'player_id': player_id, **row} for row in compare(entry, confidence)]
+    return rows
+
+
+def print_league(title: str, rows: List[Dict]):
+    print(f"\n{title} ({rows[0]['pa']:,} PA)" if rows else f"\n{title}: no plate appearances")
+    print(f"{'Rate':<6}{'Input':>9}{'Model':>9}{'Realized':>10}{'vs input':>10}{'vs model':>10}{'95% CI':>10}{'z':>7}")
+    for row in rows:
+        print(f"{row['rate']:<6}{row['input']:>9.4f}{row['model']:>9.4f}{row['realized']:>10.4f}"
+              f"{row['delta_input']:>+10.4f}{row['delta_model']:>+10.4f}{'+/-' + format(row['half_width'], '.4f'):>10}"
+              f"{row['z']:>7.2f}")
+
+
+def print_players(title: str, rows: List[Dict], top: int = DEFAULT_TOP, confidence: float = 0.95):
+    z_crit = StatTests.z_score(confidence)
+    outside = sum(abs(row['z']) > z_crit for row in rows)
+    print(f"\n{title}: {outside} of {len(rows)} player rates outside their {100 * confidence:.0f}% interval "
+          f"(about {len(rows) * (1 - confidence):.0f} expected by chance); largest deviations:")
+    print(f"{'Team':<6}{'Player':>8}{'Rate':>6}{'PA':>8}{'Input':>9}{'Model':>9}{'Realized':>10}{'z':>7}")
+    for row in sorted(rows, key=lambda r: -abs(r['z']))[:top]:
+        print(f"{row['team']:<6}{row['player_id']:>8}{row['rate']:>6}{row['pa']:>8,}{row['input']:>9.4f}"
+              f"{row['model']:>9.4f}{row['realized']:>10.4f}{row['z']:>7.2f}")
+
+
+def main():
+    """ Entry point: python -m ANALYSIS.CALIBRATION --games 20000 --workers 8 --out GAME_DATA/CALIBRATION.json """
+    parser = argparse.ArgumentParser(description="Compare simulated player and league rates with the input rates")
+    parser.add_argument("--schedule", default=DEFAULT_SCHEDULE, help="Matchups to play (cycled)")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--min-pa", type=int, default=DEFAULT_MIN_PA, help="Smallest sample for the player table")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Player rates listed")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--out", help="Save league and player rows as JSON")
+    args = parser.parse_args()
+
+    batters, pitchers = simulate(load_pairs(args.schedule), args.games, args.seed, args.workers)
+    report = {'games': args.games, 'seed': args.seed,
+              'league_batting': compare(league_totals(batters), args.confidence),
+              'league_pitching': compare(league_totals(pitchers), args.confidence),
+              'batters': player_rows(batters, args.min_pa, args.confidence),
+              'pitchers': player_rows(pitchers, args.min_pa, args.confidence)}
+    print(f"{args.games:,} games; 'Input' is the players' own cards, 'Model' the engine's matchup "
+          f"probabilities (batter/pitcher blend with league and park factors)")
+    print_league("League batting", report['league_batting'])
+    print_league("League pitching", report['league_pitching'])
+    print_players("Batters", report['batters'], args.top, args.confidence)
+    print_players("Pitchers", report['pitchers'], args.top, args.confidence)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1, default=float)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from DATA_LOADERS.TEAM_LOADER import TeamLoader
+from GAME_LOGIC.BASESTATE import BaseState
+from GAME_LOGIC.GAMESTATE import GameState, WE_MAX_INNING, WE_MAX_LEAD
+from GAME_LOGIC.INNING_SIM import simulate_half_inning
+from GAMEDAY import setup_game, ENGINE_VERSION, LEAGUE_YEAR
+from SERVICE.RESULT_CACHE import DataFingerprints
+from SIMULATION.BATCH_SIM import init_worker, get_team
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.FILE_PATHS import TEAM_META, ALL_TEAM_PATH
+from UTILITIES.RANDOM import reseed_streams, derive_seed
+
+DEFAULT_TABLE_PATH = os.path.join("GAME_DATA", "WIN_EXPECTANCY.npz")
+DEFAULT_SAMPLES = 1000  # Simulated half-innings per starting base-out state
+LEAGUE_ENV = "league"
+
+MAX_PA_RUNS = 6      # Runs per plate appearance (the last bin is "this many or more")
+MAX_HALF_RUNS = 30   # Runs per half-inning kept in the run distributions
+BASE_OUT_STATES = 24
+END = BASE_OUT_STATES  # Absorbing "three outs" state
+_SOLVE_LEAD = 40     # Lead range carried through the recursion (the table keeps +/-WE_MAX_LEAD)
+_MAX_EXTRAS = 30     # Extra innings followed when weighting leverage by how often states occur
+
+# Park factor columns in TEAM_META.csv, as TeamLoader maps them
+_PARK_COLUMNS = {'SL': 'single_factor', 'DL': 'double_factor', 'TL': 'triple_factor', 'HR': 'homerun_factor'}
+
+# Process-local teams with a park's factors swapped in, keyed by environment
+_env_teams = {}
+
+
+def _state_index(gamestate) -> int:
+    """ Base-out state: outs * 8 + base code (1st = 1, 2nd = 2, 3rd = 4), or END with three outs. """
+    if gamestate.outs >= 3:
+        return END
+    bases = gamestate.bases
+    return gamestate.outs * 8 + ((bases.fst is not None) | (bases.snd is not None) << 1 | (bases.thd is not None) << 2)
+
+
+def park_env(team_abbrev: str) -> str:
+    return f"park_{team_abbrev}"
+
+
+# ============================================================
+# SAMPLING
+# ============================================================
+
+class TransitionRecorder:
+    """
+    Counts plate-appearance transitions (base-out state before -> state at the next PA,
+    runs scored in between) while the engine plays, including everything that happens
+    mid-PA (steals, pickoffs, wild pitches). Installed inside a `with` block by swapping
+    AtBatSimulator.simulate_at_bat, like SIMULATION.VARIANCE_REDUCTION.StreamAligner.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros((BASE_OUT_STATES, BASE_OUT_STATES + 1, MAX_PA_RUNS + 1), dtype=np.int64)
+        self._prev = None
+        self._descriptor = None
+        self._original = None
+
+    def _record(self, state: int, runs: int):
+        if self._prev is not None:
+            prev_state, prev_runs = self._prev
+            self.counts[prev_state, state, min(runs - prev_runs, MAX_PA_RUNS)] += 1
+        self._prev = (state, runs)
+
+    def _simulate_at_bat(self, gamestate, token):
+        self._record(_state_index(gamestate), gamestate.runs_scored)
+        return self._original(gamestate, token)
+
+    def finish_half(self, gamestate):
+        """ Close the half-inning's last transition into the three-out state. """
+        self._record(END, gamestate.runs_scored)
+        self._prev = None
+
+    def __enter__(self):
+        self._descriptor = AtBatSimulator.__dict__['simulate_at_bat']
+        self._original = AtBatSimulator.simulate_at_bat
+        AtBatSimulator.simulate_at_bat = self._simulate_at_bat
+        return self
+
+    def __exit__(self, *exc):
+        AtBatSimulator.simulate_at_bat = self._descriptor
+        return False
+
+
+def _env_clubs(env: str, park_factors: dict):
+    """ Every club, each copied with the environment's park factors (the league env is neutral). """
+    clubs = _env_teams.get(env)
+    if clubs is None:
+        init_worker()
+        teams = [get_team(abbrev) for abbrev in sorted(TeamLoader.load_team_metadata(TEAM_META))]
+        clubs = _env_teams[env] = [dataclasses.replace(team, park_factors=dict(park_factors)) for team in teams]
+    return clubs
+
+
+def sample_transitions(env: str, park_factors: dict, state: int, samples: int, seed: int) -> np.ndarray:
+    """
+    Play `samples` half-innings from one base-out state in an environment.
+
+    Each sample draws a random batting club, fielding club and lineup spot (runners are the
+    hitters ahead in the order) and plays to the third out; every PA along the way is counted,
+    so later states collect many more transitions than the one started from.
+
+    Returns:
+        Transition counts of shape (24, 25, MAX_PA_RUNS + 1)
+    """
+    clubs = _env_clubs(env, park_factors)
+    picker = random.Random(derive_seed(seed, state))
+    outs, code = divmod(state, 8)
+
+    recorder = TransitionRecorder()
+    with recorder:
+        for k in range(samples):
+            reseed_streams(derive_seed(seed, state, k))
+            batting, fielding = picker.sample(clubs, 2)
+            with StatsManager.isolated():
+                game = setup_game(batting, fielding)
+                gs, lineup = game.gamestate, game.away_lineup
+                spot = picker.randrange(9)
+                order = lineup.batting_order
+                lineup.current_batter_index = spot
+                gs.outs = outs
+                gs.bases = BaseState(*(order[(spot - base) % 9] if code & (1 << (base - 1)) else None
+                                       for base in (1, 2, 3)))
+                simulate_half_inning(gs, lineup, game.home_pitching, resume=True)
+                recorder.finish_half(gs)
+    return recorder.counts
+
+
+# ============================================================
+# SOLVING
+# ============================================================
+
+def _transition_matrix(counts: np.ndarray) -> np.ndarray:
+    totals = counts.sum(axis=(1, 2), keepdims=True)
+    return counts / np.maximum(totals, 1)
+
+
+def half_inning_runs(T: np.ndarray) -> np.ndarray:
+    """
+    Distribution of runs still to score in the half-inning from each state.
+
+    Returns:
+        Array of shape (25, MAX_HALF_RUNS + 1); row END is "no more runs"
+    """
+    F = np.zeros((BASE_OUT_STATES + 1, MAX_HALF_RUNS + 1))
+    F[END, 0] = 1.0
+    for _ in range(500):
+        new = np.zeros_like(F)
+        for r in range(MAX_PA_RUNS + 1):
+            shifted = np.zeros_like(F)
+            shifted[:, r:] = F[:, :MAX_HALF_RUNS + 1 - r]
+            shifted[:, -1] += F[:, MAX_HALF_RUNS + 1 - r:].sum(axis=1)  # Lump the tail into the last bin
+            new[:BASE_OUT_STATES] += T[:, :, r] @ shifted
+        new[END, 0] = 1.0
+        if np.abs(new - F).max() < 1e-12:
+            break
+        F = new
+    return new / new.sum(axis=1, keepdims=True)
+
+
+def _spread(F: np.ndarray, C: np.ndarray, sign: int) -> np.ndarray:
+    """ Expected continuation value from each (state, lead) given runs distribution F; runs move the lead by `sign`. """
+    lead = np.arange(-_SOLVE_LEAD, _SOLVE_LEAD + 1)
+    runs = np.arange(F.shape[1])[:, None]
+    idx = np.clip(lead[None, :] + sign * runs + _SOLVE_LEAD, 0, 2 * _SOLVE_LEAD)
+    return F @ C[idx]
+
+
+def _game_end(tie: float) -> np.ndarray:
+    lead = np.arange(-_SOLVE_LEAD, _SOLVE_LEAD + 1)
+    return np.where(lead > 0, 1.0, np.where(lead < 0, 0.0, tie))
+
+
+def win_expectancy(F: np.ndarray):
+    """
+    Home win expectancy by backward recursion over half-innings.
+
+    Returns:
+        (values, ends): values[i, half] is a (25, lead) array for inning i + 1 (the last
+        slice covers extras), ends[i, half] the value at that half's third out by lead
+    """
+    def ninth(tie):
+        bot = _spread(F, _game_end(tie), +1)
+        top = _spread(F, np.where(np.arange(-_SOLVE_LEAD, _SOLVE_LEAD + 1) > 0, 1.0, bot[0]), -1)
+        return top, bot
+
+    # Extras repeat the ninth: solve tie = P(home wins a tied extra inning) + P(still tied) * tie
+    a = ninth(0.0)[0][0, _SOLVE_LEAD]
+    b = ninth(1.0)[0][0, _SOLVE_LEAD] - a
+    tie = a / (1 - b)
+
+    width = 2 * _SOLVE_LEAD + 1
+    values = np.zeros((WE_MAX_INNING, 2, BASE_OUT_STATES + 1, width))
+    ends = np.zeros((WE_MAX_INNING, 2, width))
+    top, bot = ninth(tie)
+    values[-1] = top, bot
+    ends[-1] = np.where(np.arange(-_SOLVE_LEAD, _SOLVE_LEAD + 1) > 0, 1.0, bot[0]), _game_end(tie)
+    for i in range(WE_MAX_INNING - 2, -1, -1):
+        ends[i, 1] = values[i + 1, 0, 0]
+        values[i, 1] = _spread(F, ends[i, 1], +1)
+        ends[i, 0] = values[i, 1, 0]
+        values[i, 0] = _spread(F, ends[i, 0], -1)
+    return values, ends
+
+
+def _shift(m: np.ndarray, r: int) -> np.ndarray:
+    """ Move mass r leads along the last axis (negative = toward the away side), piling up at the edges. """
+    if r == 0:
+        return m
+    out = np.zeros_like(m)
+    if r > 0:
+        out[..., r:] = m[..., :-r]
+        out[..., -1] += m[..., -r:].sum(axis=-1)
+    else:
+        out[..., :r] = m[..., -r:]
+        out[..., 0] += m[..., :-r].sum(axis=-1)
+    return out
+
+
+def _occupancy(T: np.ndarray) -> np.ndarray:
+    """ Expected PAs per game in each (inning slice, half, state, lead), extras folded into the last slice. """
+    width = 2 * _SOLVE_LEAD + 1
+    occ = np.zeros((WE_MAX_INNING, 2, BASE_OUT_STATES, width))
+    lead = np.arange(-_SOLVE_LEAD, _SOLVE_LEAD + 1)
+    start = np.zeros(width)
+    start[_SOLVE_LEAD] = 1.0
+
+    for inning in range(WE_MAX_INNING + _MAX_EXTRAS):
+        i = min(inning, WE_MAX_INNING - 1)
+        final = inning >= WE_MAX_INNING - 1
+        for half, sign in ((0, -1), (1, +1)):
+            if half == 1 and final:
+                start = np.where(lead > 0, 0.0, start)  # Home already ahead: bottom half not played
+            m = np.zeros((BASE_OUT_STATES, width))
+            m[0] = start
+            done = np.zeros(width)
+            while m.sum() > 1e-9:
+                occ[i, half] += m
+                new = np.zeros((BASE_OUT_STATES + 1, width))
+                for r in range(MAX_PA_RUNS + 1):
+                    new += _shift(T[:, :, r].T @ m, sign * r)
+                if half == 1 and final:
+                    new[:BASE_OUT_STATES, lead > 0] = 0.0  # Walk-off
+                done += new[END]
+                m = new[:BASE_OUT_STATES]
+            start = done
+        if final:
+            start = np.where(lead == 0, start, 0.0)
+        if start.sum() < 1e-9:
+            break
+    return occ
+
+
+def leverage(T: np.ndarray, values: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Leverage index: expected absolute win-expectancy swing of the next PA, divided by the
+    average swing over every PA of a typical game (so 1.0 is an average spot).
+    """
+    swing = np.zeros((WE_MAX_INNING, 2, BASE_OUT_STATES, 2 * _SOLVE_LEAD + 1))
+    for i in range(WE_MAX_INNING):
+        for half, sign in ((0, -1), (1, +1)):
+            nxt = values[i, half].copy()
+            nxt[END] = ends[i, half]
+            now = values[i, half, :BASE_OUT_STATES]
+            for r in range(MAX_PA_RUNS + 1):
+                moved = np.clip(np.arange(2 * _SOLVE_LEAD + 1) + sign * r, 0, 2 * _SOLVE_LEAD)
+                after = nxt[:, moved]  # (25, lead): value after the PA lands in each next state
+                swing[i, half] += np.einsum('sn,snl->sl', T[:, :, r], np.abs(after[None] - now[:, None]))
+    occ = _occupancy(T)
+    mean = (occ * swing).sum() / occ.sum()
+    return swing / mean if mean > 0 else np.ones_like(swing)
+
+
+def solve_tables(counts: np.ndarray):
+    """
+    Turn transition counts into (win expectancy, leverage) tables of shape
+    (WE_MAX_INNING, 2, 3, 8, 2 * WE_MAX_LEAD + 1), as GameState looks them up.
+    """
+    T = _transition_matrix(counts)
+    values, ends = win_expectancy(half_inning_runs(T))
+    li = leverage(T, values, ends)
+    keep = slice(_SOLVE_LEAD - WE_MAX_LEAD, _SOLVE_LEAD + WE_MAX_LEAD + 1)
+    shape = (WE_MAX_INNING, 2, 3, 8, 2 * WE_MAX_LEAD + 1)
+    we = values[:, :, :BASE_OUT_STATES, keep].reshape(shape)
+    return we.astype(np.float32), li[..., keep].reshape(shape).astype(np.float32)
+
+
+# ============================================================
+# STORAGE
+# ============================================================
+
+def environments(parks=None) -> dict:
+    """
+    Park factors per environment: the neutral league env plus `park_<ABBR>` for each requested
+    park (True = every club in TEAM_META.csv).
+    """
+    envs = {LEAGUE_ENV: {}}
+    if parks:
+        meta = TeamLoader.load_team_metadata(TEAM_META)
+        for abbrev in (sorted(meta) if parks is True else [p.upper() for p in parks]):
+            row = meta[abbrev]
+            envs[park_env(abbrev)] = {key: float(row.get(column, 1.0)) for key, column in _PARK_COLUMNS.items()}
+    return envs
+
+
+def _fingerprint(park_factors: dict, samples: int, seed: int, inputs: dict) -> str:
+    identity = dict(inputs, park=park_factors, samples=samples, seed=seed)
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def _load(path: str):
+    """ Existing tables as (meta, arrays), or empty if there is no file yet. """
+    if not os.path.exists(path):
+        return {}, {}
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != "meta"}
+        meta = json.loads(str(data["meta"])) if "meta" in data.files else {}
+    return meta, arrays
+
+
+def build_tables(path: str = DEFAULT_TABLE_PATH, parks=None, samples: int = DEFAULT_SAMPLES, seed: int = 0,
+                 workers: int = 1, force: bool = False) -> list:
+    """
+    Build or refresh the win-expectancy file.
+
+    Every environment is fingerprinted (engine version, league factors, rosters, its park
+    factors, samples, seed). Environments whose fingerprint still matches are copied from
+    the existing file, so editing one park's factors only re-simulates that park.
+
+    Returns:
+        Environment names that were (re)computed
+    """
+    init_worker()
+    fingerprints = DataFingerprints()
+    inputs = {"engine": ENGINE_VERSION, "league": fingerprints.league(LEAGUE_YEAR),
+              "rosters": fingerprints.file(ALL_TEAM_PATH)}
+    old_meta, old_arrays = _load(path)
+
+    envs = environments(parks)
+    meta = {env: _fingerprint(factors, samples, seed, inputs) for env, factors in envs.items()}
+    stale = [env for env in envs if force or old_meta.get(env) != meta[env] or f"we_{env}" not in old_arrays]
+
+    arrays = {}
+    for env in envs:
+        if env not in stale:
+            for prefix in ("we", "li", "counts"):
+                arrays[f"{prefix}_{env}"] = old_arrays[f"{prefix}_{env}"]
+
+    # Each environment samples its own stream, fixed by its name, so adding parks never reshuffles another
+    tasks = [(env, envs[env], state, samples, derive_seed(seed, int.from_bytes(env.encode(), 'big')))
+             for env in stale for state in range(BASE_OUT_STATES)]
+    if workers <= 1:
+        results = [sample_transitions(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            results = list(pool.map(sample_transitions, *zip(*tasks))) if tasks else []
+
+    for n, env in enumerate(stale):
+        counts = sum(results[n * BASE_OUT_STATES:(n + 1) * BASE_OUT_STATES])
+        arrays[f"we_{env}"], arrays[f"li_{env}"] = solve_tables(counts)
+        arrays[f"counts_{env}"] = counts.astype(np.int32)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez_compressed(tmp, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+    return stale
+
+
+def install_tables(path: str = DEFAULT_TABLE_PATH) -> int:
+    """
+    Load a table file into GameState (league table as the default, park tables by home club).
+
+    Returns:
+        Number of park tables installed
+    """
+    _, arrays = _load(path)
+    GameState.we_default = (arrays[f"we_{LEAGUE_ENV}"], arrays[f"li_{LEAGUE_ENV}"])
+    GameState.we_tables = {name[len("we_park_"):]: (arrays[name], arrays["li_" + name[3:]])
+                           for name in arrays if name.startswith("we_park_")}
+    return len(GameState.we_tables)
+
+
+def uninstall_tables():
+    GameState.we_default = None
+    GameState.we_tables = {}
+
+
+def main():
+    """ Entry point: python -m ANALYSIS.WIN_EXPECTANCY --parks --samples 1000 --workers 4 """
+    parser = argparse.ArgumentParser(description="Build the win-expectancy / leverage lookup tables")
+    parser.add_argument("--path", default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--parks", nargs="*", default=None,
+                        help="Also build per-park tables (no names = every park in TEAM_META.csv)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Half-innings per base-out state")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="Recompute every environment")
+    parser.add_argument("--show", action="store_true", help="Print the league table's bases-empty rows")
+    args = parser.parse_args()
+
+    parks = True if args.parks == [] else args.parks
+    rebuilt = build_tables(args.path, parks, args.samples, args.seed, args.workers, args.force)
+    print(f"{args.path}: recomputed {', '.join(rebuilt) if rebuilt else 'nothing (all up to date)'}")
+
+    if args.show:
+        _, arrays = _load(args.path)
+        we, li = arrays[f"we_{LEAGUE_ENV}"], arrays[f"li_{LEAGUE_ENV}"]
+        leads = range(-3, 4)
+        print("Inn Half  " + "".join(f"{lead:>+8d}" for lead in leads) + "   LI(tie)")
+        for inning in range(WE_MAX_INNING):
+            for half, label in ((0, "Top"), (1, "Bot")):
+                row = we[inning, half, 0, 0]
+                print(f"{inning + 1:>3} {label}  " + "".join(f"{row[lead + WE_MAX_LEAD]:>8.3f}" for lead in leads)
+                      + f"{li[inning, half, 0, 0, WE_MAX_LEAD]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import argparse
+import csv
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Optional, Sequence
+from DATA_LOADERS.TEAM_LOADER import TeamLoader
+from SIMULATION.BATCH_SIM import simulate_chunk, init_worker
+from SIMULATION.PRECISION import PrecisionTracker
+from UTILITIES.FILE_PATHS import TEAM_META
+
+DEFAULT_WIDTH = 0.05          # Full width of each cell's confidence interval
+DEFAULT_BATCH = 200           # Smallest batch sent to a worker
+DEFAULT_MAX_GAMES = 20000     # Per-cell cap for matchups that sit right at .500
+DEFAULT_OUT = os.path.join("GAME_DATA", "H2H")
+
+
+def _pair_stream(away_abbrev: str, home_abbrev: str) -> int:
+    """ Random stream for a matchup, fixed by the team codes so adding teams never reshuffles a cell. """
+    return int.from_bytes(f"{away_abbrev}@{home_abbrev}".encode(), 'big')
+
+
+def away_wins(away_abbrev: str, home_abbrev: str, start: int, count: int, seed=None) -> int:
+    """ Simulate games [start, start + count) of a matchup and count away wins (worker task). """
+    games = simulate_chunk(away_abbrev, home_abbrev, start, count, seed, _pair_stream(away_abbrev, home_abbrev))
+    return int((games['away_runs'] > games['home_runs']).sum())
+
+
+class MatrixCell:
+    """ One (away, home) cell: a PrecisionTracker counting away wins. """
+
+    def __init__(self, away: str, home: str, width: float, confidence: float, batch: int, max_games: int):
+        self.away = away
+        self.home = home
+        self.tracker = PrecisionTracker(win_margin=width / 2, confidence=confidence,
+                                        min_batch=batch, max_games=max_games)
+        self.cached = False
+
+
+def compute_win_matrix(teams: Optional[Sequence[str]] = None, width: float = DEFAULT_WIDTH,
+                       confidence: float = 0.95, seed=None, workers: int = None,
+                       batch: int = DEFAULT_BATCH, max_games: int = DEFAULT_MAX_GAMES,
+                       cache=None) -> dict:
+    """
+    P(away beats home) for every ordered pair of teams.
+
+    Each cell keeps simulating until its Wilson interval is no wider than `width` (or it hits
+    `max_games`). Cells are independent tasks on a process pool, so cheap lopsided matchups
+    finish early and free their workers for close ones. A cell has one batch in flight at a
+    time and every game depends only on (seed, cell, game number), so a seeded matrix is the
+    same whatever the worker count or the order in which batches finish.
+
+    Args:
+        teams: Team abbreviations (default: every team in TEAM_META.csv)
+        width: Target full width of each cell's confidence interval
+        confidence: Interval confidence level
+        seed: Base seed; seeded cells are reproducible and cacheable
+        workers: Processes (default: CPU count; 1 = run in this process)
+        batch: Minimum games per task
+        max_games: Per-cell cap
+        cache: Optional SERVICE.RESULT_CACHE.ResultCache for finished cells
+
+    Returns:
+        Dict of arrays indexed [away, home]: teams, p, lo, hi, games (diagonal is NaN / 0)
+    """
+    if teams is None:
+        teams = list(TeamLoader.load_team_metadata(TEAM_META).keys())
+    teams = [abbrev.upper() for abbrev in teams]
+    workers = workers or os.cpu_count() or 1
+    params = {"width": width, "confidence": confidence, "batch": batch, "max_games": max_games}
+
+    cells: List[MatrixCell] = []
+    keys = {}
+    for away in teams:
+        for home in teams:
+            if away == home:
+                continue
+            cell = MatrixCell(away, home, width, confidence, batch, max_games)
+            if cache is not None and seed is not None:
+                key, deps = cache.make_key("h2h_cell", [away, home], seed, params={**params, "away": away, "home": home})
+                hit = cache.get(key)
+                if hit is not None:
+                    cell.tracker.add(hit["wins"], hit["games"])
+                    cell.cached = True
+                else:
+                    keys[id(cell)] = (key, deps)
+            cells.append(cell)
+
+    pending = [cell for cell in cells if not cell.cached]
+    if workers <= 1:
+        for cell in pending:
+            tracker = cell.tracker
+            while not tracker.done:
+                count = tracker.next_batch()
+                tracker.add(away_wins(cell.away, cell.home, tracker.games, count, seed), count)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            def submit(cell):
+                count = cell.tracker.next_batch()
+                return pool.submit(away_wins, cell.away, cell.home, cell.tracker.games, count, seed), count
+
+            running = {}
+            for cell in pending:
+                future, count = submit(cell)
+                running[future] = (cell, count)
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    cell, count = running.pop(future)
+                    cell.tracker.add(future.result(), count)
+                    if not cell.tracker.done:
+                        future, count = submit(cell)
+                        running[future] = (cell, count)
+
+    if cache is not None:
+        for cell in pending:
+            if id(cell) in keys:
+                key, deps = keys[id(cell)]
+                cache.put(key, deps, {"wins": cell.tracker.wins, "games": cell.tracker.games})
+
+    n = len(teams)
+    index = {abbrev: i for i, abbrev in enumerate(teams)}
+    p = np.full((n, n), np.nan)
+    lo = np.full((n, n), np.nan)
+    hi = np.full((n, n), np.nan)
+    games = np.zeros((n, n), dtype=np.int64)
+    for cell in cells:
+        i, j = index[cell.away], index[cell.home]
+        p[i, j] = cell.tracker.win_rate
+        lo[i, j], hi[i, j] = cell.tracker.win_interval()
+        games[i, j] = cell.tracker.games
+
+    return {"teams": np.array(teams), "p": p, "lo": lo, "hi": hi, "games": games,
+            "cached_cells": sum(cell.cached for cell in cells)}
+
+
+def save_win_matrix(matrix: dict, out_prefix: str = DEFAULT_OUT):
+    """ Write `<prefix>.npz` (all arrays) and `<prefix>_cells.csv` (one row per cell with its CI). """
+    os.makedirs(os.path.dirname(out_prefix) or ".", exist_ok=True)
+    np.savez_compressed(out_prefix + ".npz", teams=matrix["teams"], p=matrix["p"],
+                        lo=matrix["lo"], hi=matrix["hi"], games=matrix["games"])
+
+    teams = list(matrix["teams"])
+    with open(out_prefix + "_cells.csv", 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["away", "home", "p_away_win", "ci_low", "ci_high", "games"])
+        for i, away in enumerate(teams):
+            for j, home in enumerate(teams):
+                if i != j:
+                    writer.writerow([away, home, f"{matrix['p'][i, j]:.4f}", f"{matrix['lo'][i, j]:.4f}",
+                                     f"{matrix['hi'][i, j]:.4f}", int(matrix['games'][i, j])])
+
+
+def print_matrix(matrix: dict):
+    """ Print P(away beats home) with away teams as rows and home teams as columns. """
+    teams = list(matrix["teams"])
+    print("away\\home " + " ".join(f"{home:>5}" for home in teams))
+    for i, away in enumerate(teams):
+        row = ["  -  " if i == j else f"{matrix['p'][i, j]:.3f}" for j in range(len(teams))]
+        print(f"{away:>9} " + " ".join(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Head-to-head P(away beats home) matrix for every team pair")
+    parser.add_argument("--teams", nargs="+", help="Team abbreviations (default: all of TEAM_META.csv)")
+    parser.add_argument("--width", type=float, default=DEFAULT_WIDTH, help="Target CI width per cell")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=1, help="Base seed (-1 for unseeded, disables caching)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH)
+    parser.add_argument("--max-games", type=int, default=DEFAULT_MAX_GAMES)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Output prefix for .npz and _cells.csv")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    seed = None if args.seed < 0 else args.seed
+    cache = None
+    if not args.no_cache and seed is not None:
+        from SERVICE.RESULT_CACHE import ResultCache
+        cache = ResultCache()
+
+    started = time.perf_counter()
+    matrix = compute_win_matrix(args.teams, args.width, args.confidence, seed, args.workers,
+                                args.batch, args.max_games, cache)
+    elapsed = time.perf_counter() - started
+
+    save_win_matrix(matrix, args.out)
+    print_matrix(matrix)
+    total = int(matrix["games"].sum())
+    print(f"\n{total:,} games across {len(matrix['teams']) ** 2 - len(matrix['teams'])} cells "
+          f"({matrix['cached_cells']} from cache) in {elapsed:.1f}s -> {args.out}.npz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from CONTEXT.GAME_CONTEXT import GameContext, GameSnapshot
+from GAMEDAY import run_game
+from SIMULATION.BATCH_SIM import GAME_DTYPE, init_worker, get_team
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import InningHalf
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed
+from UTILITIES.STAT_TESTS import StatTests
+
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_MAX_SIMS = 2000
+
+
+def _fork(snap: GameSnapshot, away_team, home_team):
+    """ Restore a snapshot and settle a finished half-inning; returns (game, resume flag). """
+    game = GameContext.from_snapshot(snap, away_team, home_team)
+    gs = game.gamestate
+    if gs.is_game_over or gs.outs < 3:
+        return game, True
+    if gs.can_game_end():
+        return game, False
+    if gs.inninghalf == InningHalf.TOP:
+        gs.toggle_inning_half()
+        return game, True
+    gs.reset_inning()
+    return game, False
+
+
+def simulate_continuations(snap: GameSnapshot, start: int, count: int, seed=None,
+                           deadline: Optional[float] = None, teams=None) -> np.ndarray:
+    """
+    Play continuations [start, start + count) of a snapshot to the final out.
+
+    Args:
+        snap: Game to continue
+        seed: Base seed; continuation i reseeds from (seed, i)
+        deadline: time.time() after which no new continuation starts
+        teams: (away_team, home_team) to play against; default loads the snapshot's clubs
+            from the process-local cache (always the case in pool workers)
+
+    Returns:
+        GAME_DTYPE array of the continuations that finished (final scores, innings, hits)
+    """
+    if teams is None:
+        init_worker()
+        teams = (get_team(snap.away_abbrev), get_team(snap.home_abbrev))
+    away_team, home_team = teams
+    if seed is not None:
+        seed_random(seed)
+
+    out = np.zeros(count, dtype=GAME_DTYPE)
+    done = 0
+    for i in range(count):
+        if deadline is not None and time.time() >= deadline:
+            break
+        if seed is not None:
+            reseed_streams(derive_seed(seed, start + i))
+        with StatsManager.isolated():
+            game, resume = _fork(snap, away_team, home_team)
+            run_game(game, resume)
+
+        stats = game.gamestate.stats
+        out[done] = (stats['away_team']['score'], stats['home_team']['score'], game.gamestate.current_inning,
+                     stats['away_team']['hits'], stats['home_team']['hits'], 0, 0)
+        done += 1
+    return out[:done]
+
+
+class WinProbabilityEngine:
+    """
+    Live win probability: forks continuations from a GameSnapshot and reports the home
+    team's chance to win, within a wall-clock budget for live feeds.
+
+    With workers, continuations run on a warm process pool (rosters and league context
+    loaded once per worker, as in SIMULATION.BATCH_SIM); pool workers load clubs by
+    abbreviation. Without workers everything runs in-process, which has the lowest
+    latency and also accepts custom (edited) teams.
+    """
+
+    def __init__(self, workers: int = 0, budget_ms: Optional[float] = DEFAULT_BUDGET_MS,
+                 max_sims: int = DEFAULT_MAX_SIMS):
+        self.workers = workers
+        self.budget_ms = budget_ms
+        self.max_sims = max_sims
+        self.pool = None
+        if workers:
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+            for future in [self.pool.submit(init_worker) for _ in range(workers)]:
+                future.result()
+        else:
+            init_worker()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def estimate(self, game, seed=None, max_sims: int = None, budget_ms: Optional[float] = None,
+                 teams=None, confidence: float = 0.95) -> dict:
+        """
+        Home win probability from a GameContext or GameSnapshot.
+
+        Args:
+            game: Live GameContext (snapshotted here) or a GameSnapshot
+            seed: Base seed for reproducible continuations
+            max_sims: Continuations to run at most (default: engine setting)
+            budget_ms: Wall-clock budget (default: engine setting, where None means no limit)
+            teams: (away_team, home_team) for in-process runs; defaults to the live game's
+                clubs, or the cached clubs for a bare snapshot
+
+        Returns:
+            Dict with home_win_prob, away_win_prob, ci_low, ci_high (home), sims,
+            mean_away_runs, mean_home_runs, elapsed_ms
+        """
+        started = time.time()
+        max_sims = max_sims or self.max_sims
+        budget_ms = budget_ms or self.budget_ms
+        deadline = None if budget_ms is None else started + budget_ms / 1000
+
+        if isinstance(game, GameContext):
+            if teams is None:
+                teams = (game.gamestate.away_team, game.gamestate.home_team)
+            snap = game.snapshot()
+        else:
+            snap = game
+
+        if snap.game_over:
+            home_won = float(snap.home_score > snap.away_score)
+            return {"home_win_prob": home_won, "away_win_prob": 1 - home_won, "ci_low": home_won,
+                    "ci_high": home_won, "sims": 0, "mean_away_runs": float(snap.away_score),
+                    "mean_home_runs": float(snap.home_score), "elapsed_ms": 0.0}
+
+        if self.pool is None:
+            results = simulate_continuations(snap, 0, max_sims, seed, deadline, teams)
+        else:
+            per_worker = -(-max_sims // self.workers)
+            futures = [self.pool.submit(simulate_continuations, snap, start, min(per_worker, max_sims - start),
+                                        seed, deadline)
+                       for start in range(0, max_sims, per_worker)]
+            results = np.concatenate([future.result() for future in futures])
+
+        sims = len(results)
+        home_wins = int((results['home_runs'] > results['away_runs']).sum())
+        low, high = StatTests.wilson_interval(home_wins, sims, confidence)
+        return {
+            "home_win_prob": home_wins / sims if sims else 0.5,
+            "away_win_prob": 1 - home_wins / sims if sims else 0.5,
+            "ci_low": low, "ci_high": high, "sims": sims,
+            "mean_away_runs": float(results['away_runs'].mean()) if sims else float(snap.away_score),
+            "mean_home_runs": float(results['home_runs'].mean()) if sims else float(snap.home_score),
+            "elapsed_ms": (time.time() - started) * 1000,
+        }
@@ -22,6 +22,11 @@ class AtBatSimulator:
         'SB': 0.150,      # Stolen base (per ball - context dependent)
         'P1': 0.010       # Pickoff attempt (per pitch with runner on 1st)
     }
+
+    # Matchup probabilities keyed by the identities of (batter, pitcher, park factors, league factors).
+    # Entries hold references to those objects so their ids cannot be reused while cached.
+    _matchup_cache = {}
+    _NO_FACTORS = {}
     
     @staticmethod
     def initialize_matchup(batting_lineup_mgr, pitching_team_mgr):
@@ -39,11 +44,21 @@ class AtBatSimulator:
         
         return batter_eff, pitcher_eff
 
+    @classmethod
+    def clear_matchup_cache(cls):
+        """ Drop cached matchup probabilities (call after editing player, park or league data in place). """
+        cls._matchup_cache.clear()
+
     @classmethod
     def generate_matchup_probs(cls, gamestate, token):
-        """ Generate adjusted outcome probabilities for the current batter-pitcher matchup. """
-        leag = LeagueLoader.get_league_factors() or {}
-        park = gamestate.home_team.park_factors or {}
+        """ Generate adjusted outcome probabilities for the current batter-pitcher matchup (cached). """
+        leag = LeagueLoader.get_league_factors() or cls._NO_FACTORS
+        park = gamestate.home_team.park_factors or cls._NO_FACTORS
+
+        key = (id(token.batter), id(token.pitcher), id(park), id(leag))
+        cached = cls._matchup_cache.get(key)
+        if cached is not None:
+            return cached[4]
 
         b_eff, p_eff = cls.get_effective_handedness(token.batter, token.pitcher)
         b_stats = token.batter.stats_vl if p_eff == "L" else token.batter.stats_vr
@@ -61,6 +76,7 @@ class AtBatSimulator:
             )
 
         outcome_probs = base_probs.copy()
+        cls._matchup_cache[key] = (token.batter, token.pitcher, park, leag, outcome_probs)
         return outcome_probs
 
     @classmethod
@@ -0,0 +1,142 @@
+import argparse
+import os
+import sys
+from typing import Dict, List, Tuple
+from BENCHMARKS.BENCH_RUNNER import (BENCH_SEED, SCHEDULE, run_suite, select, write_report, load_report,
+                                     format_seconds)
+from BENCHMARKS.BENCH_SUITE import build_suite
+from UTILITIES.STAT_TESTS import StatTests
+
+# Recorded on the reference machine with --update-baseline and committed. A missing baseline
+# fails the gate (exit 2); --allow-missing-baseline passes instead while CI is bootstrapped.
+DEFAULT_BASELINE = os.path.join("BENCHMARKS", "BASELINE.json")
+DEFAULT_THRESHOLD = 0.05  # Relative change in the median that counts as a regression
+DEFAULT_ALPHA = 0.05      # Mann-Whitney significance level
+
+# Report fields that must match for a comparison to mean anything
+_ENVIRONMENT = ('engine_version', 'python', 'implementation', 'machine', 'seed')
+
+
+def tracked(report: Dict, all_benchmarks: bool = False) -> Dict[str, Dict]:
+    """
+    Metrics the gate compares: the report's headline metrics, plus every benchmark's
+    per-call time with `all_benchmarks`. Each is {'samples', 'median', 'better', 'unit'}.
+    """
+    out = dict(report.get('metrics', {}))
+    if all_benchmarks:
+        for name, result in report['benchmarks'].items():
+            out[name] = {'unit': "s/call", 'better': 'lower', **result['seconds']}
+    return out
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD, alpha: float = DEFAULT_ALPHA,
+            all_benchmarks: bool = False) -> List[Dict]:
+    """
+    One row per metric in the baseline. A metric regresses when its median moves the wrong
+    way by more than `threshold` and a one-sided Mann-Whitney test on the repetition
+    samples says the shift is real (p < alpha).
+
+    Returns:
+        Rows of {'metric', 'unit', 'baseline', 'current', 'change', 'p', 'status'}, status one of
+        'REGRESSED', 'worse (noise)', 'improved', 'ok' or 'missing'
+    """
+    old, new = tracked(baseline, all_benchmarks), tracked(current, all_benchmarks)
+    rows = []
+    for name, before in old.items():
+        row = {'metric': name, 'unit': before['unit'], 'baseline': before['median'],
+               'current': None, 'change': None, 'p': None, 'status': 'missing'}
+        rows.append(row)
+        after = new.get(name)
+        if after is None:
+            continue
+        higher = before['better'] == 'higher'
+        change = (after['median'] - before['median']) / before['median'] if before['median'] else 0.0
+        # Worse means the current samples sit below (higher-is-better) or above the baseline ones
+        _, p = StatTests.mann_whitney_u(after['samples'], before['samples'], "less" if higher else "greater")
+        worse = -change if higher else change
+        if worse > threshold:
+            status = 'REGRESSED' if p < alpha else 'worse (noise)'
+        elif worse < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        row.update(current=after['median'], change=change, p=p, status=status)
+    return rows
+
+
+def _value(value, unit: str) -> str:
+    if value is None:
+        return "-"
+    if unit == "s/call":
+        return format_seconds(value)
+    return f"{value:,.3f}" if abs(value) < 100 else f"{value:,.1f}"
+
+
+def print_table(rows: List[Dict]):
+    print(f"{'Metric':<34}{'Unit':>8}{'Baseline':>14}{'Current':>14}{'Change':>9}{'p':>8}  Status")
+    for row in rows:
+        change = f"{100 * row['change']:+.1f}%" if row['change'] is not None else "-"
+        p = f"{row['p']:.3f}" if row['p'] is not None else "-"
+        print(f"{row['metric']:<34}{row['unit']:>8}{_value(row['baseline'], row['unit']):>14}"
+              f"{_value(row['current'], row['unit']):>14}{change:>9}{p:>8}  {row['status']}")
+
+
+def environment_differences(baseline: Dict, current: Dict) -> List[Tuple[str, object, object]]:
+    return [(key, baseline.get(key), current.get(key)) for key in _ENVIRONMENT if baseline.get(key) != current.get(key)]
+
+
+def main() -> int:
+    """
+    Entry point: python -m BENCHMARKS.BENCH_GATE [--threshold 0.05] [--update-baseline]
+
+    Exit status: 0 no regression, 1 regression, 2 no baseline (0 with --allow-missing-baseline).
+    """
+    parser = argparse.ArgumentParser(description="Run the benchmarks and fail on regressions against a baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Committed baseline report")
+    parser.add_argument("--report", help="Compare this existing report instead of running the benchmarks")
+    parser.add_argument("--out", help="Also save the current report here")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative slowdown")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level for the rank test")
+    parser.add_argument("--all", action="store_true", help="Gate every benchmark's time, not just the headline metrics")
+    parser.add_argument("--only", nargs="*", default=None, help="Run benchmarks whose names start with these")
+    parser.add_argument("--skip", nargs="*", default=(), help="Leave out benchmarks whose names start with these")
+    parser.add_argument("--schedule", default=SCHEDULE, help="Schedule for the full-season benchmark")
+    parser.add_argument("--update-baseline", action="store_true", help="Record the current run as the new baseline")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="Pass instead of failing when there is no baseline yet (bootstrapping CI)")
+    args = parser.parse_args()
+
+    if args.report:
+        current = load_report(args.report)
+    else:
+        current = run_suite(select(build_suite(args.schedule), args.only, args.skip), BENCH_SEED)
+    if args.out:
+        write_report(current, args.out)
+
+    if args.update_baseline:
+        write_report(current, args.baseline)
+        print(f"\nBaseline written to {args.baseline} ({len(current['benchmarks'])} benchmarks)")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; record one on the reference machine with --update-baseline")
+        if args.allow_missing_baseline:
+            print("Nothing to compare against: passing (--allow-missing-baseline)")
+            return 0
+        return 2
+
+    baseline = load_report(args.baseline)
+    for key, before, after in environment_differences(baseline, current):
+        print(f"Warning: {key} differs from the baseline ({before} -> {after}); timings may not be comparable")
+    rows = compare(baseline, current, args.threshold, args.alpha, args.all)
+    print()
+    print_table(rows)
+    regressed = [row['metric'] for row in rows if row['status'] == 'REGRESSED']
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) beyond {100 * args.threshold:.0f}%: {', '.join(regressed)}")
+        return 1
+    print(f"\nNo regressions beyond {100 * args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
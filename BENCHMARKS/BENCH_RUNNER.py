@@ -0,0 +1,168 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from BENCHMARKS.BENCH_SUITE import BENCH_SEED, SCHEDULE, BenchCase, build_suite, import_seconds, allocation_peak
+from GAMEDAY import ENGINE_VERSION
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+
+BENCH_FORMAT = 1
+DEFAULT_OUT = os.path.join("GAME_DATA", "BENCH", "latest.json")
+DEFAULT_METRIC_REPETITIONS = 10
+
+# Headline metrics read off benchmark rates: name -> (benchmark, rate, unit)
+RATE_METRICS = {
+    'games_per_sec': ("game.play_game", "games_per_sec", "games/s"),
+    'plate_appearances_per_sec': ("game.play_game", "plate_appearances_per_sec", "PA/s"),
+    'season_games_per_sec': ("season.full", "games_per_sec", "games/s"),
+}
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """ Mean, median, spread and range of repetition samples. """
+    mean = statistics.fmean(samples)
+    variance = statistics.variance(samples) if len(samples) > 1 else 0.0
+    return {'mean': mean, 'median': statistics.median(samples), 'stdev': variance ** 0.5, 'variance': variance,
+            'cv': variance ** 0.5 / mean if mean else 0.0, 'min': min(samples), 'max': max(samples)}
+
+
+def _repetition(case: BenchCase, seed: int) -> Tuple[float, Dict[str, int]]:
+    """ Time `case.number` calls from a fresh setup; returns (seconds, units of work counted). """
+    with StatsManager.isolated():
+        run, units = case.setup(seed)
+        gc.collect()  # Start every repetition from the same heap; collections during the run still count
+        start = time.perf_counter()
+        for _ in range(case.number):
+            run()
+        elapsed = time.perf_counter() - start
+        counted = units() if units is not None else {}
+    return elapsed, counted
+
+
+def run_case(case: BenchCase, seed: int = BENCH_SEED, repetitions: Optional[int] = None,
+             warmup: Optional[int] = None) -> Dict:
+    """
+    Run one benchmark: warmup repetitions (discarded), then timed ones.
+
+    Every repetition starts from the same seed and empty stat tables, so each does identical
+    work and the samples differ only by timing noise.
+
+    Returns:
+        {'number', 'warmup', 'repetitions', 'seconds': per-call summary plus 'samples', and for
+         cases that count work, 'units' (per call) and 'rates' (units per second, summary plus
+         'samples')}
+    """
+    repetitions = repetitions or case.repetitions
+    warmup = case.warmup if warmup is None else warmup
+    for _ in range(warmup):
+        _repetition(case, seed)
+    timed = [_repetition(case, seed) for _ in range(repetitions)]
+
+    per_call = [elapsed / case.number for elapsed, _ in timed]
+    out = {'number': case.number, 'warmup': warmup, 'repetitions': repetitions,
+           'seconds': {**summarize(per_call), 'samples': per_call}}
+    counted = timed[0][1]
+    if counted:
+        out['units'] = {unit: count / case.number for unit, count in counted.items()}
+        out['rates'] = {}
+        for unit in counted:
+            samples = [units[unit] / elapsed for elapsed, units in timed]
+            out['rates'][f"{unit}_per_sec"] = {**summarize(samples), 'samples': samples}
+    return out
+
+
+def collect_metrics(report: Dict, seed: int = BENCH_SEED, repetitions: int = DEFAULT_METRIC_REPETITIONS) -> Dict:
+    """
+    Headline metrics for the regression gate, each with its samples and which way is better:
+    throughput from the game and season benchmarks (when they ran), peak bytes allocated
+    per game and the engine's import time (measured here, `repetitions` samples each).
+    """
+    metrics = {}
+    for name, (benchmark, rate, unit) in RATE_METRICS.items():
+        if benchmark in report['benchmarks']:
+            metrics[name] = {'unit': unit, 'better': 'higher', **report['benchmarks'][benchmark]['rates'][rate]}
+    for name, unit, measure in (('alloc_kib_per_game', "KiB", lambda: allocation_peak(seed) / 1024),
+                                ('import_seconds', "s", import_seconds)):
+        samples = [measure() for _ in range(repetitions)]
+        metrics[name] = {'unit': unit, 'better': 'lower', **summarize(samples), 'samples': samples}
+    return metrics
+
+
+def run_suite(cases: List[BenchCase], seed: int = BENCH_SEED, repetitions: Optional[int] = None,
+              warmup: Optional[int] = None, verbose: bool = True, metrics: bool = True) -> Dict:
+    """ Run benchmarks in order into one report (see write_report), then the headline metrics. """
+    report = {'format': BENCH_FORMAT, 'created': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+              'engine_version': ENGINE_VERSION, 'python': platform.python_version(),
+              'implementation': platform.python_implementation(), 'machine': platform.machine(),
+              'seed': seed, 'benchmarks': {}}
+    for case in cases:
+        result = report['benchmarks'][case.name] = run_case(case, seed, repetitions, warmup)
+        if verbose:
+            print(format_row(case.name, result))
+    if metrics:
+        report['metrics'] = collect_metrics(report, seed)
+    return report
+
+
+def write_report(report: Dict, path: str):
+    """ Write a report as JSON (atomically, so a tracked file is never left half written). """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(report, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def load_report(path: str) -> Dict:
+    with open(path) as f:
+        report = json.load(f)
+    if report.get('format') != BENCH_FORMAT:
+        raise ValueError(f"Unsupported benchmark format in {path}: {report.get('format')}")
+    return report
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def format_row(name: str, result: Dict) -> str:
+    seconds = result['seconds']
+    rates = "  ".join(f"{unit.replace('_per_sec', '')}/s {rate['median']:,.1f}"
+                      for unit, rate in result.get('rates', {}).items())
+    return f"{name:<34}{format_seconds(seconds['median']):>12} +/-{100 * seconds['cv']:5.1f}%  {rates}"
+
+
+def select(cases: List[BenchCase], only: Optional[Sequence[str]] = None, skip: Sequence[str] = ()) -> List[BenchCase]:
+    """ Cases whose names start with one of `only` (all when None) and none of `skip`. """
+    return [case for case in cases
+            if (only is None or case.name.startswith(tuple(only))) and not case.name.startswith(tuple(skip))]
+
+
+def main():
+    """ Entry point: python -m BENCHMARKS.BENCH_RUNNER --out GAME_DATA/BENCH/latest.json --only atbat game """
+    parser = argparse.ArgumentParser(description="Run the fixed-seed engine benchmarks")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="JSON report path")
+    parser.add_argument("--only", nargs="*", default=None, help="Run benchmarks whose names start with these")
+    parser.add_argument("--skip", nargs="*", default=(), help="Leave out benchmarks whose names start with these")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--repetitions", type=int, default=None, help="Override every benchmark's repetitions")
+    parser.add_argument("--warmup", type=int, default=None, help="Override every benchmark's warmup repetitions")
+    parser.add_argument("--schedule", default=SCHEDULE, help="Schedule for the full-season benchmark")
+    parser.add_argument("--no-metrics", action="store_true", help="Skip the allocation and import-time measurements")
+    args = parser.parse_args()
+
+    cases = select(build_suite(args.schedule), args.only, args.skip)
+    print(f"{'Benchmark':<34}{'Per call':>12}{'CV':>10}  Rates")
+    report = run_suite(cases, args.seed, args.repetitions, args.warmup, metrics=not args.no_metrics)
+    write_report(report, args.out)
+    print(f"\nWrote {len(cases)} benchmarks to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
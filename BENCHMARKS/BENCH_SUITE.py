@@ -0,0 +1,207 @@
+import importlib
+import inspect
+import itertools
+import os
+import subprocess
+import sys
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from ATBAT.ATBAT_PITCHES import PitchEngine
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from CONTEXT.ATBAT_CONTEXT import AtBatToken
+from CONTEXT.GAME_CONTEXT import GameContext
+from GAMEDAY import setup_game, play_game
+from GAME_LOGIC.INNING_SIM import simulate_half_inning
+from OUTCOMES.MACRO_HITS import execute_SL
+from SEASON import SeasonSimulator
+from SIMULATION.BATCH_SIM import init_worker, get_team
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.RANDOM import seed_random
+
+BENCH_SEED = 2025
+AWAY_TEAM, HOME_TEAM = "PIT", "WAS"  # Fixed rosters (the GAMEDAY demo matchup)
+SCHEDULE = os.path.join("GAME_DATA", "SCHEDULE.csv")
+IMPORT_MODULE = "SEASON"  # The entry point that pulls in the whole engine
+
+# Every module of plate-appearance executors; each execute_* defined there is one case
+OUTCOME_MODULES = ("PITCHES", "MICROES", "MACRO_FREE", "MACRO_HITS", "MACRO_OUTS",
+                   "GROUNDOUTS", "GSINGLEOUTS", "GDOUBLEOUTS")
+
+# setup(seed) -> (run, units): `run` is the timed call, `units()` (or None) counts work done
+# so far in the repetition's stat tables, e.g. {'plate_appearances': 412}
+Setup = Callable[[int], Tuple[Callable[[], object], Optional[Callable[[], Dict[str, int]]]]]
+
+_simulators = {}  # Schedule path -> initialized SeasonSimulator, reused across repetitions
+
+
+class BenchCase:
+    """ One benchmark: how to set it up and how many calls make a repetition. """
+
+    def __init__(self, name: str, setup: Setup, number: int = 1, repetitions: int = 20, warmup: int = 3):
+        self.name = name
+        self.setup = setup
+        self.number = number            # Timed calls per repetition
+        self.repetitions = repetitions  # Samples kept
+        self.warmup = warmup            # Repetitions run first and discarded
+
+
+def _fixed_game(seed: int) -> GameContext:
+    """ A fresh game between the fixed rosters, lineups and starters drawn from `seed`. """
+    init_worker()
+    seed_random(seed)
+    return setup_game(get_team(AWAY_TEAM), get_team(HOME_TEAM))
+
+
+def _tokens(game: GameContext) -> List[AtBatToken]:
+    """ The away lineup against the home starter. """
+    pitcher = game.home_pitching.get_current_pitcher()
+    return [AtBatToken(batter=batter, pitcher=pitcher) for batter in game.away_lineup.batting_order]
+
+
+def _plate_appearances() -> Dict[str, int]:
+    return {'plate_appearances': sum(stats['PA'] for stats in StatsManager.batter_stats.values())}
+
+
+# ==================== AT-BAT ====================
+
+def _matchup_probs(seed: int, cached: bool = True):
+    game = _fixed_game(seed)
+    tokens = itertools.cycle(_tokens(game))
+    gamestate = game.gamestate
+
+    def run():
+        if not cached:
+            AtBatSimulator.clear_matchup_cache()
+        return AtBatSimulator.generate_matchup_probs(gamestate, next(tokens))
+    return run, None
+
+
+def _macro_outcome(seed: int):
+    game = _fixed_game(seed)
+    probs = AtBatSimulator.generate_matchup_probs(game.gamestate, _tokens(game)[0])
+    return lambda: AtBatSimulator.generate_macro_outcome(probs), None
+
+
+def _pitch_sequence(seed: int):
+    _fixed_game(seed)
+    outcomes = itertools.cycle([outcome for _, outcome in
+                                AtBatSimulator._BASE + AtBatSimulator._HITS + AtBatSimulator._OUTS])
+    return lambda: PitchEngine.generate_sequence(next(outcomes)), None
+
+
+# ==================== OUTCOMES ====================
+
+def _outcome_executors() -> List[Tuple[str, Callable]]:
+    """ (code, function) for every execute_<code> defined in the OUTCOMES modules. """
+    found = []
+    for module_name in OUTCOME_MODULES:
+        module = importlib.import_module(f"OUTCOMES.{module_name}")
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("execute_") and function.__module__ == module.__name__:
+                found.append((name[len("execute_"):], function))
+    return found
+
+
+def _outcome(function: Callable) -> Setup:
+    def setup(seed: int):
+        # Runners on first and second, one out: every executor (double plays included) has work to do
+        game = _fixed_game(seed)
+        lineup = game.away_lineup.batting_order
+        gamestate = game.gamestate
+        gamestate.outs = 1
+        gamestate.bases.fst, gamestate.bases.snd = lineup[1], lineup[0]
+        token = AtBatToken(batter=lineup[2], pitcher=game.home_pitching.get_current_pitcher())
+        if len(inspect.signature(function).parameters) == 3:  # execute_DP / execute_FC take the base code
+            base_state = gamestate.get_base_state()
+            return lambda: function(gamestate, base_state, token), None
+        return lambda: function(gamestate, token), None
+    return setup
+
+
+# ==================== STATS / INNING / GAME / SEASON ====================
+
+def _record_at_bat(seed: int):
+    game = _fixed_game(seed)
+    result = execute_SL(game.gamestate, _tokens(game)[0])
+    return lambda: StatsManager.record_at_bat(result), None
+
+
+def _half_inning(seed: int):
+    game = _fixed_game(seed)
+    return lambda: simulate_half_inning(game.gamestate, game.away_lineup, game.home_pitching), _plate_appearances
+
+
+def _play_game(seed: int):
+    init_worker()
+    seed_random(seed)
+    away, home = get_team(AWAY_TEAM), get_team(HOME_TEAM)
+    games = [0]
+
+    def run():
+        games[0] += 1
+        return play_game(away, home)
+    return run, lambda: {'games': games[0], **_plate_appearances()}
+
+
+def _season(seed: int, schedule: str = SCHEDULE):
+    sim = _simulators.get(schedule)
+    if sim is None:
+        sim = _simulators[schedule] = SeasonSimulator(schedule, keep_results=False)
+        sim.initialize(verbose=False)
+
+    def run():
+        sim.reset_season(0)
+        sim.play_schedule(seed, verbose=False)
+    return run, lambda: {'games': sim.cursor, **_plate_appearances()}
+
+
+def build_suite(schedule: str = SCHEDULE) -> List[BenchCase]:
+    """ Every benchmark, cheapest layer first. """
+    cases = [
+        BenchCase("atbat.matchup_probs", _matchup_probs, number=20000),
+        BenchCase("atbat.matchup_probs_uncached", lambda seed: _matchup_probs(seed, cached=False), number=2000),
+        BenchCase("atbat.macro_outcome", _macro_outcome, number=20000),
+        BenchCase("atbat.pitch_sequence", _pitch_sequence, number=10000),
+    ]
+    cases += [BenchCase(f"outcomes.{code}", _outcome(function), number=1000)
+              for code, function in _outcome_executors()]
+    cases += [
+        BenchCase("stats.record_at_bat", _record_at_bat, number=20000),
+        BenchCase("inning.simulate_half_inning", _half_inning, number=27),
+        BenchCase("game.play_game", _play_game, number=5, repetitions=15),
+        BenchCase("season.full", lambda seed: _season(seed, schedule), repetitions=5, warmup=1),
+    ]
+    return cases
+
+
+# ==================== PROCESS METRICS ====================
+
+def import_seconds(module: str = IMPORT_MODULE) -> float:
+    """ Cumulative import time of a module in a fresh interpreter, as reported by python -X importtime. """
+    done = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    for line in reversed(done.stderr.splitlines()):
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1e6
+    raise RuntimeError(f"python -X importtime reported nothing for {module}")
+
+
+def allocation_peak(seed: int = BENCH_SEED) -> int:
+    """
+    Peak bytes allocated above the starting heap while playing one fixed game (tracemalloc),
+    after an untraced game has filled the engine's caches.
+    """
+    init_worker()
+    away, home = get_team(AWAY_TEAM), get_team(HOME_TEAM)
+    with StatsManager.isolated():
+        seed_random(seed)
+        play_game(away, home)
+        seed_random(seed)
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            play_game(away, home)
+            return tracemalloc.get_traced_memory()[1] - start
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,210 @@
+import argparse
+import importlib
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Sequence, Tuple
+from BENCHMARKS.BENCH_SUITE import BENCH_SEED, AWAY_TEAM, HOME_TEAM
+from CONTEXT.GAME_CONTEXT import GameContext
+from CONTEXT.TEAM_CONTEXT import Team
+from GAMEDAY import setup_game, run_game
+from SIMULATION.BATCH_SIM import init_worker, get_team, DEFAULT_CHUNK_SIZE
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed
+from UTILITIES.STAT_TESTS import StatTests
+
+REFERENCE = "BENCHMARKS.EQUIVALENCE:reference_engine"
+DEFAULT_GAMES = 2000      # Games per engine (split across the matchups)
+DEFAULT_ALPHA = 0.01      # Family-wise: each of the tests is run at alpha / number of tests
+DEFAULT_TOLERANCE = 0.02  # Largest distribution gap (TVD, KS D or rate difference) still called equivalent
+MAX_RUNS = 15             # Runs per game above this share one bin
+
+# Batting lines counted per game; every other plate appearance is an out in play
+OUTCOMES = ('1B', '2B', '3B', 'HR', 'BB', 'HBP', 'SO')
+
+# One row per simulated game
+EQUIV_DTYPE = np.dtype([
+    ('away_runs', np.int16),
+    ('home_runs', np.int16),
+    ('innings', np.int16),
+    ('pitches', np.int16),
+    ('plate_appearances', np.int16),
+    *[(outcome, np.int16) for outcome in OUTCOMES],
+])
+
+# An engine plays one game between two clubs (away, home) and returns the finished game,
+# recording into StatsManager as it goes
+Engine = Callable[[Team, Team], GameContext]
+
+
+def reference_engine(away_team: Team, home_team: Team) -> GameContext:
+    """ The object-based engine, as GAMEDAY.play_game runs it. """
+    return run_game(setup_game(away_team, home_team))
+
+
+def load_engine(spec: str) -> Engine:
+    """ Resolve "package.module:function" to the engine function. """
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"Engine must be given as module:function, not {spec!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def play_chunk(engine_spec: str, away_abbrev: str, home_abbrev: str, start: int, count: int,
+               seed: int, stream: int) -> np.ndarray:
+    """ Play games [start, start + count) of one matchup with an engine, each in empty stat tables. """
+    init_worker()
+    engine = load_engine(engine_spec)
+    away_team, home_team = get_team(away_abbrev), get_team(home_abbrev)
+    seed_random(seed)
+    out = np.zeros(count, dtype=EQUIV_DTYPE)
+    for i in range(count):
+        reseed_streams(derive_seed(seed, stream, start + i))
+        with StatsManager.isolated():
+            game = engine(away_team, home_team)
+            batting = StatsManager.batter_stats.values()
+            counts = [sum(line[outcome] for line in batting) for outcome in OUTCOMES]
+            out[i] = (*game.score, game.gamestate.current_inning,
+                      sum(line['PT'] for line in StatsManager.pitcher_stats.values()),
+                      sum(line['PA'] for line in batting), *counts)
+    return out
+
+
+def simulate_engine(engine_spec: str, pairs: Sequence[Tuple[str, str]], n_games: int, seed: int, stream: int,
+                    workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """ `n_games` games of an engine spread evenly over the matchups, as one EQUIV_DTYPE array. """
+    bounds = [n_games * i // len(pairs) for i in range(len(pairs) + 1)]
+    plan = [(away, home, start, min(chunk_size, bounds[i + 1] - start))
+            for i, (away, home) in enumerate(pairs) for start in range(bounds[i], bounds[i + 1], chunk_size)]
+    if workers <= 1:
+        return np.concatenate([play_chunk(engine_spec, away, home, start, count, seed, stream)
+                               for away, home, start, count in plan])
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [pool.submit(play_chunk, engine_spec, away, home, start, count, seed, stream)
+                   for away, home, start, count in plan]
+        return np.concatenate([future.result() for future in futures])
+
+
+# ==================== COMPARISON ====================
+
+def _runs(games: np.ndarray) -> np.ndarray:
+    """ Runs scored per team per game. """
+    return np.concatenate([games['away_runs'], games['home_runs']])
+
+
+def _outcome_counts(games: np.ndarray) -> List[int]:
+    counts = [int(games[outcome].sum()) for outcome in OUTCOMES]
+    return counts + [int(games['plate_appearances'].sum()) - sum(counts)]
+
+
+def _tvd(a: Sequence[float], b: Sequence[float]) -> float:
+    """ Total variation distance between two count vectors' distributions. """
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return float(0.5 * np.abs(a / a.sum() - b / b.sum()).sum())
+
+
+def _categorical(name: str, a: Sequence[float], b: Sequence[float], summary: Tuple[float, float]) -> Dict:
+    statistic, dof, p = StatTests.chi_squared_homogeneity([a, b])
+    return {'comparison': name, 'test': f"chi2({dof})", 'statistic': statistic, 'p': p,
+            'effect': _tvd(a, b), 'reference': summary[0], 'candidate': summary[1]}
+
+
+def _distribution(name: str, a: np.ndarray, b: np.ndarray) -> Dict:
+    d, p = StatTests.ks_two_sample(a.tolist(), b.tolist())
+    return {'comparison': name, 'test': "KS", 'statistic': d, 'p': p, 'effect': d,
+            'reference': float(a.mean()), 'candidate': float(b.mean())}
+
+
+def _rate(name: str, a: np.ndarray, b: np.ndarray) -> Dict:
+    hits = [int(a.sum()), int(b.sum())]
+    return _categorical(name, [hits[0], len(a) - hits[0]], [hits[1], len(b) - hits[1]],
+                        (float(a.mean()), float(b.mean())))
+
+
+def compare(reference: np.ndarray, candidate: np.ndarray, alpha: float = DEFAULT_ALPHA,
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Test the candidate's games against the reference's on each baseball quantity.
+
+    A comparison fails when its test rejects equality at alpha / (number of tests) and the
+    gap between the distributions exceeds `tolerance`: total variation distance for the
+    chi-squared tests (the rate difference for win and extra-innings rates), D for KS.
+    Large samples therefore do not fail on differences too small to matter, and small
+    samples do not fail on noise.
+
+    Returns:
+        Rows of {'comparison', 'test', 'statistic', 'p', 'effect', 'reference', 'candidate', 'status'}
+        ('reference' / 'candidate' are means or rates for display, None for the outcome mix)
+    """
+    runs_a, runs_b = _runs(reference), _runs(candidate)
+    outcomes_a, outcomes_b = _outcome_counts(reference), _outcome_counts(candidate)
+    rows = [
+        _categorical("runs_per_game", np.bincount(np.minimum(runs_a, MAX_RUNS + 1), minlength=MAX_RUNS + 2),
+                     np.bincount(np.minimum(runs_b, MAX_RUNS + 1), minlength=MAX_RUNS + 2),
+                     (float(runs_a.mean()), float(runs_b.mean()))),
+        _distribution("runs_per_game", runs_a, runs_b),
+        _categorical("pa_outcomes", outcomes_a, outcomes_b, (None, None)),
+        _distribution("pitches_per_game", reference['pitches'], candidate['pitches']),
+        _rate("extra_innings_rate", reference['innings'] > 9, candidate['innings'] > 9),
+        _rate("home_win_rate", reference['home_runs'] > reference['away_runs'],
+              candidate['home_runs'] > candidate['away_runs']),
+    ]
+    for row in rows:
+        row['status'] = "FAIL" if row['p'] < alpha / len(rows) and row['effect'] > tolerance else "ok"
+    return rows
+
+
+def outcome_table(reference: np.ndarray, candidate: np.ndarray) -> List[Tuple[str, float, float]]:
+    """ Each PA outcome's share of plate appearances in both engines (OUT = outs in play). """
+    a, b = _outcome_counts(reference), _outcome_counts(candidate)
+    return [(name, a[i] / sum(a), b[i] / sum(b)) for i, name in enumerate(OUTCOMES + ('OUT',))]
+
+
+def print_report(rows: List[Dict], outcomes: List[Tuple[str, float, float]]):
+    print(f"{'Comparison':<22}{'Test':>9}{'Reference':>11}{'Candidate':>11}{'Effect':>9}{'p':>10}  Status")
+    for row in rows:
+        reference, candidate = ("-" if value is None else f"{value:.4f}" for value in (row['reference'], row['candidate']))
+        print(f"{row['comparison']:<22}{row['test']:>9}{reference:>11}{candidate:>11}"
+              f"{row['effect']:>9.4f}{row['p']:>10.2g}  {row['status']}")
+    print(f"\n{'Outcome':<10}{'Reference':>11}{'Candidate':>11}")
+    for name, a, b in outcomes:
+        print(f"{name:<10}{a:>11.4f}{b:>11.4f}")
+
+
+def _pair(text: str) -> Tuple[str, str]:
+    away, _, home = text.upper().partition("@")
+    if not home:
+        raise argparse.ArgumentTypeError(f"Matchups are AWAY@HOME, not {text!r}")
+    return away, home
+
+
+def main() -> int:
+    """ Entry point: python -m BENCHMARKS.EQUIVALENCE --candidate FAST_ENGINE:play --games 5000 --workers 8 """
+    parser = argparse.ArgumentParser(description="Check that an alternative engine plays the same baseball as the reference")
+    parser.add_argument("--candidate", required=True, help="Engine under test, as module:function")
+    parser.add_argument("--reference", default=REFERENCE, help="Engine to compare against, as module:function")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="Games per engine")
+    parser.add_argument("--matchups", type=_pair, nargs="*", default=[(AWAY_TEAM, HOME_TEAM), (HOME_TEAM, AWAY_TEAM)],
+                        help="AWAY@HOME matchups the games are spread over")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Family-wise significance level")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Largest gap still equivalent")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    # Independent streams per engine, so the two samples are independent as the tests assume
+    reference = simulate_engine(args.reference, args.matchups, args.games, args.seed, 0, args.workers)
+    candidate = simulate_engine(args.candidate, args.matchups, args.games, args.seed, 1, args.workers)
+    rows = compare(reference, candidate, args.alpha, args.tolerance)
+    print(f"{args.games:,} games per engine: {args.reference} vs {args.candidate}\n")
+    print_report(rows, outcome_table(reference, candidate))
+    failed = [row['comparison'] for row in rows if row['status'] == "FAIL"]
+    if failed:
+        print(f"\nNot equivalent: {', '.join(failed)}")
+        return 1
+    print(f"\nEquivalent within tolerance {args.tolerance} at alpha {args.alpha}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
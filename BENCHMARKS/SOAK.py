@@ -0,0 +1,216 @@
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+from collections import Counter
+import numpy as np
+from typing import Callable, Dict, List
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from BENCHMARKS.BENCH_SUITE import BENCH_SEED, SCHEDULE
+from SEASON import SeasonSimulator
+from SIMULATION.TELEMETRY import rss_bytes
+from TEAM_UTILS.BULLPEN_MANAGER import BullpenManager
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.STAT_TESTS import StatTests
+
+WORKLOADS = ("season", "monte_carlo")
+DEFAULT_DURATION = 600.0   # Seconds of simulation
+DEFAULT_SAMPLE_GAMES = 200  # Games between samples
+DEFAULT_WARMUP = 0.2        # Share of the samples dropped before looking for trends (caches filling up)
+DEFAULT_ALPHA = 0.01        # Mann-Kendall significance level
+DEFAULT_MIN_GROWTH = 0.05   # Relative rise (or throughput fall) over the run that counts
+MIN_OBJECTS = 1000          # Object types with fewer live instances are not tracked
+TOP_TYPES = 25              # Most numerous object types recorded per sample
+
+# Long-lived containers the engine grows as it plays: name -> size
+WATCHED: Dict[str, Callable[[], int]] = {
+    'StatsManager._key_cache': lambda: len(StatsManager._key_cache),
+    'StatsManager.batter_stats': lambda: len(StatsManager.batter_stats),
+    'StatsManager.pitcher_stats': lambda: len(StatsManager.pitcher_stats),
+    'AtBatSimulator._matchup_cache': lambda: len(AtBatSimulator._matchup_cache),
+    'BullpenManager._matchup_cache': lambda: len(BullpenManager._matchup_cache),
+    'BullpenManager._pen_cache': lambda: len(BullpenManager._pen_cache),
+}
+
+
+class _Elapsed(Exception):
+    """ Raised from the sampling hook to stop the workload mid-season once the duration is up. """
+
+
+class SoakTest:
+    """
+    Plays games back to back for `duration` seconds and samples the process every
+    `sample_games` games: RSS, live objects of the most numerous types, the sizes of the
+    engine's long-lived containers, garbage collections per generation and games/sec.
+
+    Workloads: "season" replays the schedule on one SeasonSimulator (results kept, stat
+    tables carried from pass to pass, as repeated SEASON runs in one process would);
+    "monte_carlo" plays each season on empty stat tables with nothing kept, as
+    MonteCarloRunner does. Time spent taking samples is left out of the throughput.
+    """
+
+    def __init__(self, schedule_csv: str = SCHEDULE, workload: str = "season", duration: float = DEFAULT_DURATION,
+                 sample_games: int = DEFAULT_SAMPLE_GAMES, seed: int = BENCH_SEED):
+        if workload not in WORKLOADS:
+            raise ValueError(f"workload must be one of {WORKLOADS}")
+        self.workload = workload
+        self.duration = duration
+        self.sample_games = sample_games
+        self.seed = seed
+        self.sim = SeasonSimulator(schedule_csv, keep_results=workload == "season")
+        self.samples: List[Dict] = []
+        self._finished_games = 0  # Games in the season passes already completed
+        self._deadline = None
+        self._clock = None        # When the current interval's simulation time started
+        self._simulated = 0.0     # Simulation seconds so far (sampling excluded)
+
+    @property
+    def games(self) -> int:
+        return self._finished_games + self.sim.cursor
+
+    def _sample(self):
+        self._simulated += time.perf_counter() - self._clock
+        previous = self.samples[-1] if self.samples else {'games': 0, 'simulated_seconds': 0.0}
+        interval = self._simulated - previous['simulated_seconds']
+        counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+        containers = {name: size() for name, size in WATCHED.items()}
+        containers['SeasonSimulator.game_results'] = len(self.sim.game_results)
+        self.samples.append({
+            'games': self.games,
+            'simulated_seconds': self._simulated,
+            'games_per_sec': (self.games - previous['games']) / interval if interval > 0 else 0.0,
+            'rss_bytes': rss_bytes(),
+            'gc_collections': [generation['collections'] for generation in gc.get_stats()],
+            'containers': containers,
+            'objects': dict(counts.most_common(TOP_TYPES)),
+        })
+        if time.perf_counter() > self._deadline:
+            raise _Elapsed
+        self._clock = time.perf_counter()
+
+    def _play_season(self, season: int):
+        self.sim.reset_season(season)
+        self.sim.play_schedule(self.seed, checkpoint=self._sample, checkpoint_every=self.sample_games)
+
+    def run(self, verbose: bool = True) -> List[Dict]:
+        """ Run the workload until the duration is up; returns the samples. """
+        self.sim.initialize(verbose=False)
+        self._deadline = time.perf_counter() + self.duration
+        self._clock = time.perf_counter()
+        season = 0
+        try:
+            while True:
+                if self.workload == "monte_carlo":
+                    with StatsManager.isolated():
+                        self._play_season(season)
+                else:
+                    self._play_season(season)
+                self._finished_games += self.sim.cursor
+                season += 1
+                if verbose:
+                    print(f"Season pass {season} done: {self.games:,} games, {len(self.samples)} samples")
+        except _Elapsed:
+            pass
+        return self.samples
+
+
+# ==================== ANALYSIS ====================
+
+def series(samples: List[Dict]) -> Dict[str, Dict]:
+    """ Every sampled quantity as {'values', 'unit', 'bad'}: 'bad' is the direction that signals trouble. """
+    out = {'rss': {'values': [s['rss_bytes'] / 2**20 for s in samples if s['rss_bytes'] is not None],
+                   'unit': "MiB", 'bad': "increasing"},
+           'games_per_sec': {'values': [s['games_per_sec'] for s in samples], 'unit': "games/s", 'bad': "decreasing"}}
+    for name in samples[0]['containers'] if samples else ():
+        out[name] = {'values': [s['containers'][name] for s in samples], 'unit': "items", 'bad': "increasing"}
+    # Only types in every sample's top list: a type missing from one has no count there
+    common = set.intersection(*(set(s['objects']) for s in samples)) if samples else set()
+    for name in sorted(common):
+        values = [s['objects'][name] for s in samples]
+        if max(values) >= MIN_OBJECTS:
+            out[f"objects.{name}"] = {'values': values, 'unit': "objects", 'bad': "increasing"}
+    return out
+
+
+def theil_sen_slope(values: List[float]) -> float:
+    """ Median of the pairwise slopes against sample position (robust to the odd outlier). """
+    y = np.asarray(values, dtype=float)
+    i, j = np.triu_indices(len(y), k=1)
+    return float(np.median((y[j] - y[i]) / (j - i))) if len(i) else 0.0
+
+
+def analyze(samples: List[Dict], warmup: float = DEFAULT_WARMUP, alpha: float = DEFAULT_ALPHA,
+            min_growth: float = DEFAULT_MIN_GROWTH) -> List[Dict]:
+    """
+    Look for a monotonic trend the bad way in each series, after dropping the first `warmup`
+    share of samples. A series is flagged when the Mann-Kendall test finds the trend
+    (p < alpha) and the Theil-Sen line moves by more than `min_growth` of the series'
+    median over the run.
+
+    Returns:
+        Rows of {'series', 'unit', 'start', 'end', 'change', 'tau', 'p', 'flagged'}
+    """
+    rows = []
+    for name, found in series(samples[int(len(samples) * warmup):]).items():
+        values = found['values']
+        if len(values) < 3:
+            continue
+        tau, p = StatTests.mann_kendall(values, found['bad'])
+        middle = float(np.median(values))
+        drift = theil_sen_slope(values) * (len(values) - 1)
+        change = drift / abs(middle) if middle else (float("inf") if drift else 0.0)
+        worse = change if found['bad'] == "increasing" else -change
+        rows.append({'series': name, 'unit': found['unit'], 'start': values[0], 'end': values[-1], 'change': change,
+                     'tau': tau, 'p': p, 'flagged': p < alpha and worse > min_growth})
+    return rows
+
+
+def print_report(rows: List[Dict], samples: List[Dict]):
+    last = samples[-1]
+    print(f"\n{last['games']:,} games in {last['simulated_seconds']:.0f} s of simulation, {len(samples)} samples; "
+          f"GC collections by generation {last['gc_collections']}")
+    print(f"{'Series':<44}{'Unit':>9}{'Start':>12}{'End':>12}{'Change':>9}{'Tau':>7}{'p':>9}  Status")
+    for row in sorted(rows, key=lambda r: (not r['flagged'], r['series'])):
+        status = ("DECAY" if row['unit'] == "games/s" else "GROWTH") if row['flagged'] else "ok"
+        print(f"{row['series']:<44}{row['unit']:>9}{row['start']:>12,.1f}{row['end']:>12,.1f}"
+              f"{100 * row['change']:>8.1f}%{row['tau']:>7.2f}{row['p']:>9.2g}  {status}")
+
+
+def main() -> int:
+    """ Entry point: python -m BENCHMARKS.SOAK --duration 3600 --workload monte_carlo --out GAME_DATA/BENCH/soak.json """
+    parser = argparse.ArgumentParser(description="Play games for a long time and flag memory growth or throughput decay")
+    parser.add_argument("--schedule", default=SCHEDULE)
+    parser.add_argument("--workload", choices=WORKLOADS, default="season")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds to run")
+    parser.add_argument("--sample-games", type=int, default=DEFAULT_SAMPLE_GAMES, help="Games between samples")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP, help="Share of samples ignored at the start")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level for the trend test")
+    parser.add_argument("--min-growth", type=float, default=DEFAULT_MIN_GROWTH,
+                        help="Relative change over the run that counts as growth or decay")
+    parser.add_argument("--out", help="Save the samples and the analysis as JSON")
+    args = parser.parse_args()
+
+    soak = SoakTest(args.schedule, args.workload, args.duration, args.sample_games, args.seed)
+    samples = soak.run()
+    if not samples:
+        print("No samples taken; run longer or sample more often")
+        return 2
+    rows = analyze(samples, args.warmup, args.alpha, args.min_growth)
+    print_report(rows, samples)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, 'w') as f:
+            json.dump({'workload': args.workload, 'samples': samples, 'analysis': rows}, f, indent=1)
+    flagged = [row['series'] for row in rows if row['flagged']]
+    if flagged:
+        print(f"\n{len(flagged)} series trending the wrong way: {', '.join(flagged)}")
+        return 1
+    print("\nNo monotonic memory growth or throughput decay")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
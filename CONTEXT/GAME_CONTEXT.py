@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from GAME_LOGIC.BASESTATE import BaseState
+from GAME_LOGIC.GAMESTATE import GameState
+from TEAM_UTILS.LINEUP_MANAGER import LineupManager
+from TEAM_UTILS.PITCHING_MANAGER import PitchingManager
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import InningHalf
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    """
+    Immutable, compact copy of a game in progress.
+
+    Players are stored as indices into their team's `batters` / `pitchers` lists, so a
+    snapshot is a few hundred bytes of ints: cheap to hash, pickle to worker processes,
+    and restore against teams already loaded there. Pitcher lines hold every stat field
+    except the player reference, keyed by pitcher index.
+    """
+    away_abbrev: str
+    home_abbrev: str
+    inning: int
+    half: InningHalf
+    outs: int
+    balls: int
+    strikes: int
+    bases: Tuple[Optional[int], Optional[int], Optional[int]]  # Batting team's batter indices
+    away_score: int
+    home_score: int
+    away_hits: int
+    home_hits: int
+    away_line: Tuple[int, ...]
+    home_line: Tuple[int, ...]
+    away_order: Tuple[int, ...]
+    home_order: Tuple[int, ...]
+    away_batter: int
+    home_batter: int
+    away_pitchers: Tuple[int, ...]  # Pitchers used in order; the last one is on the mound
+    home_pitchers: Tuple[int, ...]
+    pitcher_lines: Tuple[Tuple[str, int, Tuple[Tuple[str, float], ...]], ...]  # (side, index, stats)
+    game_over: bool = False
+    away_entry_bf: int = 0  # Current pitcher's BF total when he entered (PitchingManager.entry_batters_faced)
+    home_entry_bf: int = 0
+
+
+@dataclass
+class GameContext:
+    """
+    Everything needed to drive one game: the live GameState plus both clubs' managers.
+    Built by GAMEDAY.setup_game and advanced by GAMEDAY.run_game.
+    """
+    gamestate: GameState
+    away_lineup: LineupManager
+    away_pitching: PitchingManager
+    home_lineup: LineupManager
+    home_pitching: PitchingManager
+
+    @property
+    def score(self):
+        """ Current (away_score, home_score). """
+        stats = self.gamestate.stats
+        return stats['away_team']['score'], stats['home_team']['score']
+
+    # ==================== SNAPSHOTS ====================
+
+    def snapshot(self) -> GameSnapshot:
+        """ Capture the current state (count, bases, score, lineup spots, pitchers and their lines). """
+        gs = self.gamestate
+        away_bat = {id(p): i for i, p in enumerate(gs.away_team.batters)}
+        home_bat = {id(p): i for i, p in enumerate(gs.home_team.batters)}
+        away_pit = {id(p): i for i, p in enumerate(gs.away_team.pitchers)}
+        home_pit = {id(p): i for i, p in enumerate(gs.home_team.pitchers)}
+        # Outcomes deep-copy the bases, so runners are matched to the roster by player id
+        batting_team = gs.away_team if gs.inninghalf == InningHalf.TOP else gs.home_team
+        batting = {p.player_id: i for i, p in enumerate(batting_team.batters)}
+
+        lines = []
+        for side, mgr, index in (('away', self.away_pitching, away_pit), ('home', self.home_pitching, home_pit)):
+            for pitcher in mgr.pitchers_used:
+                stats = StatsManager.get_pitcher_stats(pitcher)
+                stats.pop('player', None)
+                lines.append((side, index[id(pitcher)], tuple(sorted(stats.items()))))
+
+        away, home = gs.stats['away_team'], gs.stats['home_team']
+        return GameSnapshot(
+            away_abbrev=gs.away_team.abbreviation, home_abbrev=gs.home_team.abbreviation,
+            inning=gs.current_inning, half=gs.inninghalf,
+            outs=gs.outs, balls=gs.balls, strikes=gs.strikes,
+            bases=tuple(None if runner is None else batting[runner.player_id]
+                        for runner in (gs.bases.fst, gs.bases.snd, gs.bases.thd)),
+            away_score=away['score'], home_score=home['score'],
+            away_hits=away['hits'], home_hits=home['hits'],
+            away_line=tuple(away['score_by_inning']), home_line=tuple(home['score_by_inning']),
+            away_order=tuple(away_bat[id(p)] for p in self.away_lineup.batting_order),
+            home_order=tuple(home_bat[id(p)] for p in self.home_lineup.batting_order),
+            away_batter=self.away_lineup.current_batter_index,
+            home_batter=self.home_lineup.current_batter_index,
+            away_pitchers=tuple(away_pit[id(p)] for p in self.away_pitching.pitchers_used),
+            home_pitchers=tuple(home_pit[id(p)] for p in self.home_pitching.pitchers_used),
+            pitcher_lines=tuple(lines),
+            game_over=gs.is_game_over,
+            away_entry_bf=self.away_pitching.entry_batters_faced,
+            home_entry_bf=self.home_pitching.entry_batters_faced,
+        )
+
+    @classmethod
+    def from_snapshot(cls, snap: GameSnapshot, away_team, home_team) -> 'GameContext':
+        """
+        Rebuild a playable game from a snapshot against already-loaded teams.
+
+        Teams, players and the (copy-on-write) BaseState are shared, only the small mutable
+        game state is new. Pitcher lines are written into the current StatsManager tables,
+        so call this inside StatsManager.isolated() when forking many continuations.
+        """
+        gs = GameState(away_team, home_team)
+        gs.current_inning = snap.inning
+        gs.inninghalf = snap.half
+        top = snap.half == InningHalf.TOP
+        gs.batting_team = away_team if top else home_team
+        gs.fielding_team = gs.pitching_team = home_team if top else away_team
+        gs.outs, gs.balls, gs.strikes = snap.outs, snap.balls, snap.strikes
+
+        batters = (away_team if top else home_team).batters
+        gs.bases = BaseState(*(None if i is None else batters[i] for i in snap.bases))
+
+        gs.away_score, gs.home_score = snap.away_score, snap.home_score
+        gs.stats['away_team'].update(score=snap.away_score, hits=snap.away_hits, score_by_inning=list(snap.away_line))
+        gs.stats['home_team'].update(score=snap.home_score, hits=snap.home_hits, score_by_inning=list(snap.home_line))
+        gs.is_game_over = snap.game_over
+
+        away_lineup = LineupManager(away_team.batters)
+        away_lineup.batting_order = [away_team.batters[i] for i in snap.away_order]
+        away_lineup.current_batter_index = snap.away_batter
+        home_lineup = LineupManager(home_team.batters)
+        home_lineup.batting_order = [home_team.batters[i] for i in snap.home_order]
+        home_lineup.current_batter_index = snap.home_batter
+
+        away_pitching = PitchingManager(away_team.pitchers)
+        home_pitching = PitchingManager(home_team.pitchers)
+        for mgr, team, used, entry_bf in ((away_pitching, away_team, snap.away_pitchers, snap.away_entry_bf),
+                                          (home_pitching, home_team, snap.home_pitchers, snap.home_entry_bf)):
+            mgr.pitchers_used = [team.pitchers[i] for i in used]
+            mgr.starting_pitcher = mgr.pitchers_used[0] if used else None
+            mgr.current_pitcher = mgr.pitchers_used[-1] if used else None
+            mgr.entry_batters_faced = entry_bf
+
+        for side, index, stats in snap.pitcher_lines:
+            team = away_team if side == 'away' else home_team
+            StatsManager.load_pitcher_stats(team.pitchers[index], dict(stats))
+
+        return cls(gs, away_lineup, away_pitching, home_lineup, home_pitching)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Tuple
+from CONTEXT.GAME_CONTEXT import GameSnapshot
+
+
+@dataclass(frozen=True)
+class PACheckpoint:
+    """
+    A game stopped just before plate appearance `pa` (0-based, counted like the event
+    log's `pa` column): the game itself plus the read position of every random stream.
+    """
+    game: int
+    pa: int
+    snapshot: GameSnapshot
+    streams: Tuple  # UTILITIES.RANDOM.stream_state()
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from CONTEXT.PLAYER_CONTEXT import Player
+from CONTEXT.TEAM_CONTEXT import Team
+
+
+@dataclass
+class SimVariant:
+    """
+    One side of a comparative simulation: the two clubs as they should be played,
+    plus optional fixed batting orders (otherwise lineups are selected as usual).
+    """
+    label: str
+    away_team: Team
+    home_team: Team
+    away_order: Optional[List[Player]] = None
+    home_order: Optional[List[Player]] = None
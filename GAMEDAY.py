@@ -1,14 +1,21 @@
+import argparse
+import contextlib
 import time
 from DATA_LOADERS.TEAM_LOADER import TeamLoader
 from DATA_LOADERS.LEAGUE_STATS_LOADER import LeagueLoader
 from GAME_LOGIC.GAMESTATE import GameState
+from GAME_LOGIC.INNING_SIM import simulate_inning
+from CONTEXT.GAME_CONTEXT import GameContext
 from TEAM_UTILS.LINEUP_MANAGER import LineupManager
 from TEAM_UTILS.PITCHING_MANAGER import PitchingManager
-from ATBAT.ATBAT_SIM import AtBatSimulator
-from TEAM_UTILS.STATS_MANAGER import StatsManager
 from UTILITIES.FUNCTIONS import *
 from UTILITIES.FILE_PATHS import TEAM_META, LEAGUE_DATA, ALL_TEAM_PATH
-from UTILITIES.RANDOM import init_random_pool
+from SIMULATION.PROFILING import PROFILERS, DEFAULT_OUT as PROFILE_OUT, DEFAULT_TOP, profiled, allocation_sites
+from UTILITIES.RANDOM import init_random_pool, seed_random
+
+# Bump whenever a change alters simulated outcomes (invalidates cached results)
+ENGINE_VERSION = "3"
+LEAGUE_YEAR = 2025
 
 
 def setup_managers(team):
@@ -24,62 +31,34 @@ def setup_managers(team):
     return lineup_mgr, pitching_mgr
 
 
-def simulate_half_inning(gamestate, batting_lineup, pitching_mgr):
-    """ Simulate one half-inning (3 outs). """
-    # Reset half-inning state
-    gamestate.reset_half_inning()
-    
-    while gamestate.outs < 3:
-        # Get current batter and pitcher, calculate base probabilities
-        batter, pitcher, base_probs = AtBatSimulator.step_initialize_matchup(batting_lineup, pitching_mgr)
-        # Simulate the at-bat (apply modifiers, determine outcome, execute)
-        AtBatSimulator.simulate_at_bat(gamestate, batter, pitcher, base_probs)
-        # Advance to next batter
-        AtBatSimulator.step_advance_batter(batting_lineup)
-        # Check if pitcher should be changed (after at-bat, before next batter faces them)
-        if pitching_mgr.should_change_pitcher():
-            pitching_mgr.change_pitcher()
-
-
-def simulate_inning(gamestate, away_team, home_team, away_lineup, away_pitching, home_lineup, home_pitching):
-    """ Simulate one full inning (top and bottom). """
-    # Top of inning (away team bats)
-    simulate_half_inning(gamestate, away_lineup, home_pitching)
-    
-    # Check if game can end (home team ahead in 9th+, skip bottom half)
-    if gamestate.can_game_end():
-        return
-    
-    # Bottom of inning (home team bats)
-    gamestate.toggle_inning_half()
-    simulate_half_inning(gamestate, home_lineup, away_pitching)
-    
-    # Check if game ended (walk-off or away team ahead after bottom of 9th+)
-    if gamestate.can_game_end():
-        return
-    
-    # Advance to next inning if game continues
-    gamestate.reset_inning()
-
-def play_game(away_team, home_team):
-    """ Simulate a single game between two teams. """
-
-    # Initialize game state
-    gamestate = GameState(away_team, home_team)
-    
-    # Setup managers for both teams
+def setup_game(away_team, home_team) -> GameContext:
+    """ Create the game state and both clubs' managers (lineups set, starters chosen). """
     away_lineup, away_pitching = setup_managers(away_team)
     home_lineup, home_pitching = setup_managers(home_team)
+    return GameContext(GameState(away_team, home_team), away_lineup, away_pitching, home_lineup, home_pitching)
+
+
+def run_game(game: GameContext, resume: bool = False) -> GameContext:
+    """ Simulate innings until the game is over; `resume` picks up mid-inning (e.g. from a snapshot). """
+    gamestate = game.gamestate
 
     # Main game loop - simulate 9 innings (or more for extras)
     while not gamestate.is_game_over:
         simulate_inning(
-            gamestate, away_team, home_team,
-            away_lineup, away_pitching,
-            home_lineup, home_pitching
+            gamestate, gamestate.away_team, gamestate.home_team,
+            game.away_lineup, game.away_pitching,
+            game.home_lineup, game.home_pitching,
+            resume
         )
+        resume = False
     
-    return gamestate.stats["away_team"]["score"], gamestate.stats["home_team"]["score"]
+    return game
+
+
+def play_game(away_team, home_team):
+    """ Simulate a single game between two teams. """
+    game = run_game(setup_game(away_team, home_team))
+    return game.score
 
 
 def load_game_data():
@@ -88,7 +67,7 @@ def load_game_data():
     
     # Load all players from ALL_TEAMS.csv
     TeamLoader.initialize_player_cache(ALL_TEAM_PATH)
-    LeagueLoader.load_league_data(LEAGUE_DATA, 2025)
+    LeagueLoader.load_league_data(LEAGUE_DATA, LEAGUE_YEAR)
 
 
 def load_team(team_abbrev: str):
@@ -99,14 +78,29 @@ def load_team(team_abbrev: str):
     return TeamLoader.load_team_from_cache(team_abbrev=team_abbrev, teams_csv=TEAM_META)
 
 
-if __name__ == "__main__":
+def main():
+    """ Entry point: python GAMEDAY.py [AWAY HOME] [--games N] [--profile cprofile|sample] [--tracemalloc [TOP]] """
+    parser = argparse.ArgumentParser(description="Simulate a single game")
+    parser.add_argument("away", nargs="?", default="PIT")
+    parser.add_argument("home", nargs="?", default="WAS")
+    parser.add_argument("--games", type=int, default=1, help="Play the matchup this many times")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=PROFILERS, default=None,
+                        help="Profile the games (pstats and/or collapsed stacks for flamegraphs)")
+    parser.add_argument("--profile-out", default=PROFILE_OUT, help="Path prefix for profile output")
+    parser.add_argument("--tracemalloc", nargs="?", const=DEFAULT_TOP, type=int, default=None, metavar="TOP",
+                        help="Report the top allocation sites per game")
+    args = parser.parse_args()
+
     # Load game data once (caches, league context, etc.)
     print("Loading game data...")
     load_game_data()
+    if args.seed is not None:
+        seed_random(args.seed)
     
     # Load teams
-    away_abbrev = "PIT"
-    home_abbrev = "WAS"
+    away_abbrev = args.away.upper()
+    home_abbrev = args.home.upper()
     
     print(f"Loading teams: {away_abbrev} @ {home_abbrev}")
     away_team = load_team(away_abbrev)
@@ -115,8 +109,16 @@ if __name__ == "__main__":
     # Simulate game
     start_time = time.time()
 
-    away_score, home_score = play_game(away_team, home_team)
-    print(f"{away_abbrev} {away_score:2} - {home_abbrev} {home_score:2}")
+    with profiled(args.profile, args.profile_out) if args.profile else contextlib.nullcontext(), \
+            allocation_sites(lambda: args.games, args.tracemalloc) if args.tracemalloc else contextlib.nullcontext():
+        for _ in range(args.games):
+            away_score, home_score = play_game(away_team, home_team)
+            print(f"{away_abbrev} {away_score:2} - {home_abbrev} {home_score:2}")
     
     elapsed = time.time() - start_time
-    print(f"\nGame simulated in {elapsed:.7f} seconds")
\ No newline at end of file
+    print(f"\nGame simulated in {elapsed:.7f} seconds" if args.games == 1 else
+          f"\n{args.games} games simulated in {elapsed:.3f} seconds ({args.games / elapsed:.1f} games/sec)")
+
+
+if __name__ == "__main__":
+    main()
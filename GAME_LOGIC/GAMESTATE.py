@@ -3,8 +3,19 @@ from UTILITIES.FILE_PATHS import *
 from UTILITIES.ENUMS import *
 from GAME_LOGIC.BASESTATE import BaseState
 
+# Win expectancy table shape: innings 1..WE_MAX_INNING (the last slice covers extras),
+# and the home lead capped at +/-WE_MAX_LEAD
+WE_MAX_INNING = 9
+WE_MAX_LEAD = 10
+
 
 class GameState:
+    # Precomputed (win expectancy, leverage index) arrays indexed
+    # [inning - 1, half, outs, base code, home lead + WE_MAX_LEAD].
+    # Installed by ANALYSIS.WIN_EXPECTANCY.install_tables: one pair per park, plus the league default.
+    we_tables = {}
+    we_default = None
+
     def __init__(self, away_team, home_team):
         self.away_team = away_team
         self.home_team = home_team
@@ -196,3 +207,29 @@ class GameState:
         if self.outs >= 3 or self.can_game_end():
             return True, is_macro_outcome  # End half-inning, break at-bat if macro
         return False, False
+
+    # ============================================================
+    # WIN EXPECTANCY METHODS
+    # ============================================================
+
+    def _we_lookup(self, which: int):
+        tables = GameState.we_tables.get(self.home_team.abbreviation, GameState.we_default)
+        if tables is None:
+            return None
+        lead = self.home_score - self.away_score
+        lead = WE_MAX_LEAD if lead > WE_MAX_LEAD else -WE_MAX_LEAD if lead < -WE_MAX_LEAD else lead
+        bases = self.bases
+        code = (bases.fst is not None) | (bases.snd is not None) << 1 | (bases.thd is not None) << 2
+        return float(tables[which][
+            min(self.current_inning, WE_MAX_INNING) - 1,
+            0 if self.inninghalf == InningHalf.TOP else 1,
+            min(self.outs, 2), code, lead + WE_MAX_LEAD
+        ])
+
+    def win_expectancy(self):
+        """ Home win probability for the current state from the installed table (None if not installed). """
+        return self._we_lookup(0)
+
+    def leverage(self):
+        """ Leverage index of the current state (1.0 = average plate appearance; None if not installed). """
+        return self._we_lookup(1)
@@ -1,11 +1,14 @@
 from ATBAT.ATBAT_SIM import AtBatSimulator
 from ATBAT.ATBAT_FACTORY import AtBatFactory
+from TEAM_UTILS.BULLPEN_MANAGER import BullpenManager
 from TEAM_UTILS.STATS_MANAGER import StatsManager
-from UTILITIES.ENUMS import EventType, Pitch
+from UTILITIES.ENUMS import EventType, Pitch, InningHalf
 from UTILITIES.SCOREBOARD import Scoreboard
 
-def simulate_half_inning(gamestate, batting_lineup, pitching_mgr):
-    gamestate.reset_half_inning()
+def simulate_half_inning(gamestate, batting_lineup, pitching_mgr, resume: bool = False):
+    """ Simulate plate appearances until the half-inning ends; `resume` continues one already in progress. """
+    if not resume:
+        gamestate.reset_half_inning()
     # Scoreboard.inning_start(gamestate, gamestate.inninghalf)
 
     while gamestate.outs < 3:
@@ -58,22 +61,26 @@ def simulate_half_inning(gamestate, batting_lineup, pitching_mgr):
         gamestate.reset_count()
         AtBatSimulator.advance_next_batter(batting_lineup)
 
-        if pitching_mgr.should_change_pitcher():
-            pitching_mgr.change_pitcher()
+        if BullpenManager.should_change_pitcher(gamestate, batting_lineup, pitching_mgr):
+            BullpenManager.change_pitcher(gamestate, batting_lineup, pitching_mgr)
 
 
-def simulate_inning(gamestate, away_team, home_team, away_lineup, away_pitching, home_lineup, home_pitching):
-    """ Simulate one full inning (top and bottom). """
-    # Top of inning (away team bats)
-    simulate_half_inning(gamestate, away_lineup, home_pitching)
-    
-    if gamestate.can_game_end():
-        return
+def simulate_inning(gamestate, away_team, home_team, away_lineup, away_pitching, home_lineup, home_pitching,
+                    resume: bool = False):
+    """ Simulate one full inning (top and bottom), or with `resume` the rest of the one in progress. """
+    resume_bottom = resume and gamestate.inninghalf == InningHalf.BOT
+
+    if not resume_bottom:
+        # Top of inning (away team bats)
+        simulate_half_inning(gamestate, away_lineup, home_pitching, resume)
+        
+        if gamestate.can_game_end():
+            return
 
-    # Bottom of inning (home team bats)
-    gamestate.toggle_inning_half()
+        # Bottom of inning (home team bats)
+        gamestate.toggle_inning_half()
     
-    simulate_half_inning(gamestate, home_lineup, away_pitching)
+    simulate_half_inning(gamestate, home_lineup, away_pitching, resume_bottom)
     
     if gamestate.can_game_end():
         return
@@ -1,24 +1,64 @@
+import argparse
+import contextlib
 import csv
+import copy
+import os
 import time
+import numpy as np
 from GAMEDAY import play_game, load_game_data, load_team
 from DATA_LOADERS.TEAM_LOADER import TeamLoader
+from SIMULATION.CHECKPOINT import save_checkpoint, load_checkpoint, cached_players
+from SIMULATION.EVENT_LOG import EventLog
+from SIMULATION.EXPORT import FORMATS, game_results_table, write_table, export_stats
+from SIMULATION.INSTRUMENT import Instrumentation
+from SIMULATION.PROFILING import PROFILERS, DEFAULT_OUT as PROFILE_OUT, DEFAULT_TOP, profiled, allocation_sites
+from SIMULATION.RESULT_STREAM import ResultWriter
+from SIMULATION.STANDINGS import StandingsIndex
+from SIMULATION.TELEMETRY import Telemetry, DEFAULT_INTERVAL as TELEMETRY_INTERVAL
+from SIMULATION.WAREHOUSE import ResultsWarehouse, WAREHOUSE_EXTENSIONS
+from TEAM_UTILS.STATS_MANAGER import StatsManager
 from UTILITIES.FILE_PATHS import TEAM_META, ALL_TEAM_PATH
 from UTILITIES.COLOR_CODES import *
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed, export_random_state, import_random_state
+
+DEFAULT_CHECKPOINT_EVERY = 100  # Games between checkpoints
+
+
+def open_results(path: str, resume=None):
+    """ Results sink for a path: SQLite warehouse (.db / .sqlite), CSV file, or column directory. """
+    if path.lower().endswith(WAREHOUSE_EXTENSIONS):
+        return ResultsWarehouse(path, resume=resume)
+    return ResultWriter(path, resume=resume)
 
 
 class SeasonSimulator:
-    def __init__(self, schedule_csv: str):
-        """ Initialize season simulator with schedule CSV file. """       
+    def __init__(self, schedule_csv: str, keep_results: bool = True):
+        """
+        Initialize season simulator with schedule CSV file.
+
+        Args:
+            schedule_csv: Schedule to play
+            keep_results: Keep every game in `game_results` (turn off for long runs that stream
+                results through a SIMULATION.RESULT_STREAM.ResultWriter instead)
+        """
         self.schedule_csv = schedule_csv
         self.schedule = []
+        self.keep_results = keep_results
         self.game_results = []
+        self.results_writer = None  # ResultWriter / ResultsWarehouse receiving every game, if streaming
+        self.event_log = None  # SIMULATION.EVENT_LOG.EventLog recording every game, if logging
+        self.season = 0
+        self.cursor = 0  # Scheduled games already played this season
         self.teams_cache = {}  # Cache loaded teams for reuse
+        self.instrumentation = None  # Per-stage timings of the last instrumented simulate_season
+        self.telemetry = None  # SIMULATION.TELEMETRY.Telemetry counting every game, if attached
         self.team_records = {}  # Track W-L records for each team
         self._initialized = False
         
         self._load_schedule()
         self._load_team_info()
         self._initialize_records()
+        self.home_wins = np.zeros(len(self.schedule), dtype=bool)  # Per scheduled game, for StandingsIndex
     
 
     def _load_team_info(self):
@@ -37,6 +77,41 @@ class SeasonSimulator:
             self.team_records[abbrev] = {'wins': 0, 'losses': 0}
     
 
+    def reset_season(self, season: int = 0):
+        """ Clear records and kept results to play the schedule again as `season`. """
+        self.season = season
+        self.cursor = 0
+        self.game_results = []
+        self.home_wins = np.zeros(len(self.schedule), dtype=bool)
+        self._initialize_records()
+    
+
+    def state(self) -> dict:
+        """ Everything needed to continue the season exactly from here (see restore). """
+        return {
+            'season': self.season,
+            'cursor': self.cursor,
+            'team_records': copy.deepcopy(self.team_records),
+            'game_results': list(self.game_results),
+            'home_wins': self.home_wins.copy(),
+            'stats': StatsManager.export_tables(),
+            'random': export_random_state(),
+            'results_position': self.results_writer.position() if self.results_writer is not None else None,
+            'event_log_position': self.event_log.position() if self.event_log is not None else None,
+        }
+    
+
+    def restore(self, state: dict):
+        """ Continue from a `state()` (game data must be initialized; results writers are reopened by the caller). """
+        self.season = state['season']
+        self.cursor = state['cursor']
+        self.team_records = copy.deepcopy(state['team_records'])
+        self.game_results = list(state['game_results'])
+        self.home_wins = state['home_wins'].copy()
+        StatsManager.import_tables(state['stats'], cached_players())
+        import_random_state(state['random'])
+    
+
     def _load_schedule(self):
         """Load schedule from CSV file"""
         try:
@@ -45,6 +120,7 @@ class SeasonSimulator:
                 for row in reader:
                     self.schedule.append({
                         'date': row.get('date', ''),
+                        'day': int(row.get('day') or 0),
                         'away_team': row['away_team'].strip().upper(),
                         'home_team': row['home_team'].strip().upper()
                     })
@@ -64,14 +140,17 @@ class SeasonSimulator:
         return self.teams_cache[team_abbrev]
     
 
-    def simulate_game(self, game_num: int, away_abbrev: str, home_abbrev: str, show_score: bool = True):
+    def simulate_game(self, game_num: int, away_abbrev: str, home_abbrev: str, show_score: bool = True, day: int = 0):
         """ Simulate a single game and update standings. """
         try:
             # Get teams (from cache if already loaded)
             away_team = self._get_team(away_abbrev)
             home_team = self._get_team(home_abbrev)
             
+            start = time.perf_counter()
             away_score, home_score = play_game(away_team, home_team)
+            if self.telemetry is not None:
+                self.telemetry.game_finished(time.perf_counter() - start)
             
             # Update records
             if away_score > home_score:
@@ -80,16 +159,20 @@ class SeasonSimulator:
             else:
                 self.team_records[home_abbrev]['wins'] += 1
                 self.team_records[away_abbrev]['losses'] += 1
+            if 0 < game_num <= len(self.home_wins):
+                self.home_wins[game_num - 1] = home_score > away_score
             
             # Store result
-            result = {
-                'game_num': game_num,
-                'away_team': away_abbrev,
-                'home_team': home_abbrev,
-                'away_score': away_score,
-                'home_score': home_score
-            }
-            self.game_results.append(result)
+            if self.keep_results:
+                self.game_results.append({
+                    'game_num': game_num,
+                    'away_team': away_abbrev,
+                    'home_team': home_abbrev,
+                    'away_score': away_score,
+                    'home_score': home_score
+                })
+            if self.results_writer is not None:
+                self.results_writer.write((self.season, game_num, day, away_abbrev, home_abbrev, away_score, home_score))
             
             if show_score:
                 away_rec = self.team_records[away_abbrev]
@@ -106,51 +189,131 @@ class SeasonSimulator:
             raise
     
 
-    def simulate_season(self, verbose: bool = True, show_progress: bool = True):
+    def attach_telemetry(self, telemetry: Telemetry):
+        """ Report every game to `telemetry`, with the results writer's utilization and queue depth while one is open. """
+        self.telemetry = telemetry
+        telemetry.add_worker("results_writer", lambda: self.results_writer.busy_seconds)
+        telemetry.add_queue("results", lambda: self.results_writer.queue_depth())
+    
+
+    def initialize(self, verbose: bool = True):
+        """ Load game data (player cache, league context, random pools) once per simulator. """
+        if self._initialized:
+            return
+        if verbose:
+            print(f"{YELLOW}Initializing game data (caches, league context)...{RESET}")
+        init_time = time.time()
+        
+        # Load all players once from ALL_TEAMS.csv
+        TeamLoader.initialize_player_cache(ALL_TEAM_PATH)
+        
+        # Initialize other game data (matchup cache, league context, etc.)
+        load_game_data()
+        
+        self._initialized = True
+        if verbose:
+            print(f"{GREEN}✓{RESET} Initialized in {time.time() - init_time:.3f}s\n")
+    
+
+    def play_schedule(self, seed=None, log: EventLog = None, verbose: bool = False, show_progress: bool = False,
+                      checkpoint=None, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        """
+        Play the rest of the schedule (the loop behind simulate_season, without the banners).
+
+        With a seed, every game reseeds its streams from (seed, season, game number), so a
+        season plays out identically however many seasons ran before it. `checkpoint` is
+        called after every `checkpoint_every` games (e.g. to save `state()`).
+        """
+        if seed is not None:
+            seed_random(seed)
+        start_time = time.time()
+        first = self.cursor
+
+        for i in range(self.cursor + 1, len(self.schedule) + 1):
+            game = self.schedule[i - 1]
+            away_team = game['away_team']
+            home_team = game['home_team']
+            
+            # Show progress periodically
+            if show_progress and i % 100 == 0:
+                elapsed = time.time() - start_time
+                games_per_sec = (i - first) / elapsed if elapsed > 0 else 0
+                print(f"\n{YELLOW}--- Progress: {i}/{len(self.schedule)} games ({games_per_sec:.1f} games/sec) ---{RESET}\n")
+            
+            key = 0
+            if seed is not None:
+                key = derive_seed(seed, self.season, i)
+                reseed_streams(key)
+            if log is not None:
+                log.start_game(i, key)
+            self.simulate_game(i, away_team, home_team, show_score=verbose, day=game['day'])
+            self.cursor = i
+            if checkpoint is not None and i % checkpoint_every == 0:
+                checkpoint()
+    
+
+    def simulate_season(self, verbose: bool = True, show_progress: bool = True, event_log: str = None,
+                        results: str = None, seed=None, checkpoint: str = None,
+                        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY, resume: bool = False,
+                        instrument: bool = False):
         """
         Simulate entire season from schedule.
         
         Args:
             verbose: Print each game result
             show_progress: Show progress updates every N games
+            event_log: Directory to record play-by-play into (SIMULATION.EVENT_LOG); game ids are game numbers
+            results: Stream every result to this file (.csv), SQLite warehouse (.db) or column directory
+                as games finish
+            seed: Reproducible season (see play_schedule)
+            checkpoint: File to save the season's state to every `checkpoint_every` games
+            resume: Continue from `checkpoint` if it exists; the finished season (records, stats,
+                results file, event log) is identical to an uninterrupted run
+            instrument: Time every stage of the plate appearance (SIMULATION.INSTRUMENT), print the
+                breakdown at the end and keep it in `self.instrumentation`
         """
         print(f"\n{BOLD}{'='*60}{RESET}")
         print(f"{BOLD}  SEASON SIMULATION - {len(self.schedule)} Games{RESET}")
         print(f"{BOLD}{'='*60}{RESET}\n")
         
         # Initialize game data once for the entire season
-        if not self._initialized:
-            print(f"{YELLOW}Initializing game data (caches, league context)...{RESET}")
-            init_time = time.time()
-            
-            # Load all players once from ALL_TEAMS.csv
-            TeamLoader.initialize_player_cache(ALL_TEAM_PATH)
-            
-            # Initialize other game data (matchup cache, league context, etc.)
-            load_game_data()
-            
-            self._initialized = True
-            print(f"{GREEN}✓{RESET} Initialized in {time.time() - init_time:.3f}s\n")
+        self.initialize()
+        
+        saved = load_checkpoint(checkpoint) if checkpoint and resume else None
+        if saved is not None:
+            self.restore(saved)
+            print(f"{GREEN}✓{RESET} Resuming after game {self.cursor} from {checkpoint}\n")
         
         start_time = time.time()
+        first = self.cursor
+        if saved is not None and event_log and saved.get('event_log_position') is None:
+            raise ValueError(f"{checkpoint} was saved without an event log, so {event_log} cannot be resumed")
+        self.event_log = EventLog(event_log, resume=saved['event_log_position'] if saved else None) if event_log else None
+        self.results_writer = open_results(results, saved['results_position'] if saved else None) if results else None
+        save = (lambda: save_checkpoint(checkpoint, self.state())) if checkpoint else None
+        self.instrumentation = Instrumentation() if instrument else None
         
-        for i, game in enumerate(self.schedule, 1):
-            away_team = game['away_team']
-            home_team = game['home_team']
-            
-            # Show progress periodically
-            if show_progress and i % 100 == 0:
-                elapsed = time.time() - start_time
-                games_per_sec = i / elapsed if elapsed > 0 else 0
-                print(f"\n{YELLOW}--- Progress: {i}/{len(self.schedule)} games ({games_per_sec:.1f} games/sec) ---{RESET}\n")
-            
-            self.simulate_game(i, away_team, home_team, show_score=verbose)
+        with self.event_log if self.event_log is not None else contextlib.nullcontext(), \
+                self.results_writer if self.results_writer is not None else contextlib.nullcontext(), \
+                self.instrumentation if self.instrumentation is not None else contextlib.nullcontext():
+            self.play_schedule(seed, self.event_log, verbose, show_progress, save, checkpoint_every)
+            if isinstance(self.results_writer, ResultsWarehouse):
+                self.results_writer.write_player_lines(self.season)
+        self.results_writer = None
+        self.event_log = None
         
         elapsed = time.time() - start_time
         print(f"\n{BOLD}{'='*60}{RESET}")
         print(f"{GREEN}✓{RESET} Season simulation complete!")
-        print(f"  Total time: {elapsed:.2f} seconds ({len(self.schedule)/elapsed:.2f} games/sec)")
+        print(f"  Total time: {elapsed:.2f} seconds ({(self.cursor - first)/elapsed:.2f} games/sec)")
         print(f"{BOLD}{'='*60}{RESET}\n")  # Extra newlines for spacing
+        if self.instrumentation is not None:
+            print(self.instrumentation.report() + "\n")
+    
+    def standings_index(self) -> StandingsIndex:
+        """ Cumulative W-L by schedule day (SIMULATION.STANDINGS) for the games played so far this season. """
+        return StandingsIndex.build(self.schedule, {abbrev: info['league'] for abbrev, info in self.team_info.items()},
+                                    self.home_wins, played=self.cursor)
     
     def export_results(self, output_csv: str):
         """Export game results to CSV file."""
@@ -163,18 +326,55 @@ class SeasonSimulator:
             print(f"{GREEN}✓{RESET} Results exported to {output_csv}")
         except Exception as e:
             print(f"{RED}✗{RESET} Error exporting results: {e}")
+    
+    def export_columns(self, directory: str, fmt: str = "parquet"):
+        """ Write results, batting and pitching tables as Parquet, Arrow IPC or .npz (SIMULATION.EXPORT). """
+        export_stats(directory, fmt)
+        extension = next(ext for ext, name in FORMATS.items() if name == fmt)
+        write_table(game_results_table(self.game_results, self.season), os.path.join(directory, f"results{extension}"), fmt)
+        print(f"{GREEN}✓{RESET} Results and player stats exported to {directory}")
 
 
 def main():
     """Main entry point for season simulation"""
-    # Example usage - modify schedule path as needed
-    schedule_file = "GAME_DATA\\SCHEDULE1.csv"
+    parser = argparse.ArgumentParser(description="Simulate a season from a schedule")
+    parser.add_argument("--schedule", default="GAME_DATA\\SCHEDULE1.csv")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="Skip per-game output (maximum speed)")
+    parser.add_argument("--checkpoint", default=None, help="Save progress to this file periodically")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY)
+    parser.add_argument("--resume", action="store_true", help="Continue from --checkpoint")
+    parser.add_argument("--instrument", nargs="?", const="", default=None, metavar="JSON",
+                        help="Time each stage of the plate appearance; optionally save the histograms to JSON")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=PROFILERS, default=None,
+                        help="Profile the season (pstats and/or collapsed stacks for flamegraphs)")
+    parser.add_argument("--profile-out", default=PROFILE_OUT, help="Path prefix for profile output")
+    parser.add_argument("--tracemalloc", nargs="?", const=DEFAULT_TOP, type=int, default=None, metavar="TOP",
+                        help="Report the top allocation sites per game")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve live telemetry as Prometheus text on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-json", default=None, help="Rewrite live telemetry to this JSON file")
+    parser.add_argument("--metrics-interval", type=float, default=TELEMETRY_INTERVAL, help="Seconds between samples")
+    args = parser.parse_args()
     
     # Create simulator
-    sim = SeasonSimulator(schedule_csv=schedule_file)
+    sim = SeasonSimulator(schedule_csv=args.schedule)
+    telemetry = None
+    if args.metrics_port is not None or args.metrics_json:
+        telemetry = Telemetry(args.metrics_port, args.metrics_json, args.metrics_interval)
+        sim.attach_telemetry(telemetry)
     
-    # Simulate season (verbose=False for maximum speed)
-    sim.simulate_season(verbose=True, show_progress=True)
+    # Simulate season
+    with profiled(args.profile, args.profile_out) if args.profile else contextlib.nullcontext(), \
+            allocation_sites(lambda: sim.cursor, args.tracemalloc) if args.tracemalloc else contextlib.nullcontext(), \
+            telemetry if telemetry is not None else contextlib.nullcontext():
+        if telemetry is not None and telemetry.port is not None:
+            print(f"Telemetry on http://127.0.0.1:{telemetry.port}/metrics")
+        sim.simulate_season(verbose=not args.quiet, show_progress=True, seed=args.seed, checkpoint=args.checkpoint,
+                            checkpoint_every=args.checkpoint_every, resume=args.resume,
+                            instrument=args.instrument is not None)
+    if args.instrument:
+        sim.instrumentation.save(args.instrument)
     
     # Export results
     sim.export_results("GAME_DATA\\RESULTS.csv")
@@ -0,0 +1,200 @@
+import csv
+import hashlib
+import io
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from GAMEDAY import ENGINE_VERSION, LEAGUE_YEAR
+from UTILITIES.FILE_PATHS import TEAM_META, LEAGUE_DATA, ALL_TEAM_PATH
+
+DEFAULT_CACHE_DIR = os.path.join("GAME_DATA", "CACHE")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class DataFingerprints:
+    """
+    Content hashes of the simulation inputs, split by what they affect:
+    one hash per team (its ALL_TEAMS.csv rows + its TEAM_META.csv row) and one per league year.
+
+    Files are only re-read when their size or mtime changes; `version` increments each time
+    something was re-hashed so callers know to purge stale cache entries.
+    """
+
+    def __init__(self, roster_csv: str = ALL_TEAM_PATH, meta_csv: str = TEAM_META, league_csv: str = LEAGUE_DATA):
+        self.roster_csv = roster_csv
+        self.meta_csv = meta_csv
+        self.league_csv = league_csv
+        self.version = 0
+        self._files: Dict[str, Tuple[tuple, Dict[str, str]]] = {}
+
+    def _rows_by_key(self, path: str, key_column: str) -> Dict[str, str]:
+        """ Hash every row of a CSV grouped by one column (cached on file stat). """
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        # latin-1 maps every byte, so hashes are stable whatever the file's real encoding
+        with open(path, 'rb') as f:
+            reader = csv.reader(io.StringIO(f.read().decode('latin-1')))
+            header = next(reader)
+            key_index = header.index(key_column)
+            groups: Dict[str, list] = {}
+            for row in reader:
+                if row:
+                    groups.setdefault(row[key_index].strip().upper(), []).append(",".join(row))
+
+        hashes = {key: _sha(",".join(header) + "\n" + "\n".join(rows)) for key, rows in groups.items()}
+        self._files[path] = (signature, hashes)
+        self.version += 1
+        return hashes
+
+    def team(self, team_abbrev: str) -> str:
+        """ Hash of everything that defines a team for simulation (roster + park factors). """
+        rosters = self._rows_by_key(self.roster_csv, 'TM')
+        metas = self._rows_by_key(self.meta_csv, 'team_abbrev')
+        if team_abbrev not in rosters or team_abbrev not in metas:
+            raise KeyError(f"Unknown team: {team_abbrev}")
+        return _sha(rosters[team_abbrev] + metas[team_abbrev])
+
+    def league(self, year: int = LEAGUE_YEAR) -> str:
+        """ Hash of the league factor row for a season. """
+        years = self._rows_by_key(self.league_csv, 'YEAR')
+        if str(year) not in years:
+            raise KeyError(f"No league data for year {year}")
+        return years[str(year)]
+
+    @staticmethod
+    def file(path: str) -> str:
+        """ Hash of a whole file (schedules). """
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def dependencies(self, teams: Iterable[str], year: int = LEAGUE_YEAR) -> dict:
+        """ Current fingerprints for a set of teams and a league year. """
+        return {"teams": {abbrev: self.team(abbrev) for abbrev in sorted(set(teams))},
+                "year": year, "league": self.league(year)}
+
+
+class ResultCache:
+    """
+    Content-addressed, size-bounded on-disk cache of simulation results.
+
+    Keys hash (teams in away/home order, roster snapshot, league year, schedule hash, seed, N, engine version), so a
+    changed input can never return an old result. Each entry also stores the fingerprints it
+    was computed from, letting `purge_stale` delete entries made obsolete by edited CSVs.
+    Eviction is least-recently-used by file mtime, which `get` refreshes on every hit.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 fingerprints: Optional[DataFingerprints] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fingerprints = fingerprints or DataFingerprints()
+        self._purged_version = None
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        files = [e for e in os.scandir(cache_dir) if e.name.endswith(".json")]
+        for entry in sorted(files, key=lambda e: e.stat().st_mtime_ns):
+            size = entry.stat().st_size
+            self._entries[entry.name[:-5]] = size
+            self.total_bytes += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    # ==================== KEYS ====================
+
+    def make_key(self, op: str, teams: Iterable[str], seed, n_games: int = None,
+                 schedule: str = None, year: int = LEAGUE_YEAR, params: dict = None) -> Tuple[Optional[str], dict]:
+        """
+        Build the cache key and dependency record for a job.
+        `teams` is taken in order, so a matchup must be given as [away, home]; a set (every
+        club in a schedule, whose order the schedule hash already fixes) is sorted.
+        `params` holds any other settings that change the result (stopping rules, etc.).
+
+        Returns:
+            (key, dependencies); key is None for unseeded jobs, which are not reproducible
+        """
+        teams = sorted(teams) if isinstance(teams, (set, frozenset)) else list(teams)
+        deps = self.fingerprints.dependencies(teams, year)
+        if schedule is not None:
+            deps["schedule"] = self.fingerprints.file(schedule)
+        if self._purged_version != self.fingerprints.version:
+            self.purge_stale()
+
+        if seed is None:
+            return None, deps
+        identity = {"engine": ENGINE_VERSION, "op": op, "teams": teams, "year": year, "seed": seed, "n": n_games,
+                    "deps": deps, "params": params or {}}
+        return _sha(json.dumps(identity, sort_keys=True)), deps
+
+    # ==================== ENTRIES ====================
+
+    def get(self, key: str):
+        """ Return the cached result for a key, or None. Counts as a use for LRU. """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+            os.utime(self._path(key))
+        except (OSError, json.JSONDecodeError):
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["result"]
+
+    def put(self, key: str, deps: dict, result):
+        """ Store a result atomically, then evict least-recently-used entries over the size limit. """
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"deps": deps, "result": result}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)
+        size = os.path.getsize(path)
+        self._entries[key] = size
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        self.total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def purge_stale(self) -> int:
+        """ Delete entries whose input fingerprints no longer match the CSVs on disk. """
+        removed = 0
+        for key in list(self._entries):
+            try:
+                with open(self._path(key), 'r') as f:
+                    deps = json.load(f)["deps"]
+                current = self.fingerprints.dependencies(deps["teams"], deps["year"])
+                stale = current["teams"] != deps["teams"] or current["league"] != deps["league"]
+            except (OSError, KeyError, json.JSONDecodeError):
+                stale = True
+            if stale:
+                self._drop(key)
+                removed += 1
+        self._purged_version = self.fingerprints.version
+        return removed
@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import json
+from SERVICE.SIM_SERVER import DEFAULT_SOCKET
+
+
+async def stream_job(request: dict, socket_path: str = DEFAULT_SOCKET, port: int = None):
+    """
+    Send one request to the simulation service and yield its messages as they arrive.
+    Stops after the job's final "done", "cancelled" or "error" message.
+    """
+    if port is not None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+
+    try:
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+
+        while line := await reader.readline():
+            message = json.loads(line)
+            yield message
+            if message.get("event") in ("done", "cancelled", "error"):
+                break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _run(request: dict, socket_path: str, port: int):
+    async for message in stream_job(request, socket_path, port):
+        if message["event"] == "chunk":
+            print(f"[{message['id']}] chunk {message['index']}: {len(message['results'])} games")
+        else:
+            print(json.dumps(message))
+
+
+def main():
+    """ Entry point: python -m SERVICE.SIM_CLIENT games PIT WAS -n 1000 --seed 7 """
+    parser = argparse.ArgumentParser(description="Submit a job to the local simulation service.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--port", type=int, default=None)
+    sub = parser.add_subparsers(dest="op", required=True)
+
+    games = sub.add_parser("games", help="Simulate N games of AWAY @ HOME")
+    games.add_argument("away")
+    games.add_argument("home")
+    games.add_argument("-n", type=int, default=1000)
+    games.add_argument("--seed", type=int, default=None)
+
+    season = sub.add_parser("season", help="Simulate a season from a schedule CSV")
+    season.add_argument("schedule")
+    season.add_argument("--seed", type=int, default=None)
+
+    cancel = sub.add_parser("cancel", help="Cancel a queued or running job")
+    cancel.add_argument("id")
+
+    sub.add_parser("status", help="List queued and running jobs")
+
+    args = parser.parse_args()
+    request = {"op": args.op}
+    if args.op == "games":
+        request.update(away=args.away, home=args.home, n=args.n, seed=args.seed)
+    elif args.op == "season":
+        request.update(schedule=args.schedule, seed=args.seed)
+    elif args.op == "cancel":
+        request["id"] = args.id
+
+    if args.op in ("games", "season"):
+        asyncio.run(_run(request, args.socket, args.port))
+    else:
+        asyncio.run(_single(request, args.socket, args.port))
+
+
+async def _single(request: dict, socket_path: str, port: int):
+    """ Send a control request (cancel/status) and print the one reply. """
+    if port is not None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    else:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    writer.write((json.dumps(request) + "\n").encode())
+    await writer.drain()
+    print((await reader.readline()).decode().strip())
+    writer.close()
+    await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    main()
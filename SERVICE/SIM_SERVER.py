@@ -0,0 +1,362 @@
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from DATA_LOADERS.TEAM_LOADER import TeamLoader
+from SERVICE import SIM_WORKER
+from SERVICE.RESULT_CACHE import ResultCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from UTILITIES.FILE_PATHS import TEAM_META
+
+DEFAULT_SOCKET = "/tmp/baseball_sim.sock"
+DEFAULT_CHUNK_SIZE = 250
+
+
+class SimulationJob:
+    """
+    One running computation ("games" or "season").
+
+    Identical requests that arrive while it runs are coalesced onto it as extra listeners;
+    late joiners are first replayed the chunks already streamed.
+    """
+
+    def __init__(self, job_id: str, op: str, chunks: list, key=None, deps=None):
+        self.id = job_id
+        self.op = op
+        self.chunks = chunks  # List of (worker function, args) submitted to the pool
+        self.key = key        # Result cache key (None for unseeded jobs)
+        self.deps = deps
+        self.state = "queued"
+        self.games_done = 0
+        self.task = None
+        self.listeners = {}   # request id -> send coroutine
+        self.request_ids = set()
+        self.streamed = []    # Chunk results so far (replayed to late joiners, written to the cache)
+        self.records = {}     # Season jobs: team -> [wins, losses]
+        self.final = None     # Terminal message once done/cancelled/failed
+
+    def add_chunk(self, results: list):
+        """ Keep a finished chunk and fold it into the running totals. """
+        self.streamed.append(results)
+        self.games_done += len(results)
+        if self.op == "season":
+            for _, away, home, away_score, home_score in results:
+                winner, loser = (away, home) if away_score > home_score else (home, away)
+                self.records.setdefault(winner, [0, 0])[0] += 1
+                self.records.setdefault(loser, [0, 0])[1] += 1
+
+    def result(self) -> dict:
+        """ Complete result in the form stored in the cache. """
+        result = {"results": [game for chunk in self.streamed for game in chunk]}
+        if self.op == "season":
+            result["records"] = self.records
+        return result
+
+    async def broadcast(self, message: dict):
+        """ Send a message to every listener; a job nobody listens to anymore is cancelled. """
+        for listener_id, send in list(self.listeners.items()):
+            try:
+                await send({"id": listener_id, **message})
+            except ConnectionError:
+                self.listeners.pop(listener_id, None)
+        if not self.listeners:
+            self.cancel()
+
+    async def attach(self, listener_id: str, send):
+        """ Add a coalesced listener, replaying what it missed. """
+        self.request_ids.add(listener_id)
+        sent = 0
+        while sent < len(self.streamed):
+            await send({"id": listener_id, "event": "chunk", "index": sent, "results": self.streamed[sent]})
+            sent += 1
+        if self.final is not None:
+            await send({"id": listener_id, **self.final})
+        else:
+            self.listeners[listener_id] = send
+
+    async def detach(self, listener_id: str, notify: bool = True):
+        """ Remove one listener; the computation stops only when its last listener leaves. """
+        send = self.listeners.pop(listener_id, None)
+        if send and notify:
+            await send({"id": listener_id, "event": "cancelled", "games": self.games_done})
+        if not self.listeners:
+            self.cancel()
+
+    def cancel(self):
+        """ Cancel the job; chunks that have not started are dropped from the pool queue. """
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    def describe(self) -> dict:
+        return {"id": self.id, "op": self.op, "state": self.state, "games_done": self.games_done,
+                "listeners": sorted(self.listeners)}
+
+
+class SimulationServer:
+    """
+    Long-running local simulation service.
+
+    Keeps a warm process pool whose workers hold the player cache, league context and
+    loaded teams, so each request only pays for simulation. Speaks newline-delimited
+    JSON over a Unix socket (or localhost TCP):
+
+        {"op": "games", "away": "PIT", "home": "WAS", "n": 1000, "seed": 7}
+        {"op": "season", "schedule": "GAME_DATA/SCHEDULE.csv", "seed": 7}
+        {"op": "cancel", "id": "3"}
+        {"op": "status"}
+
+    Results are streamed back per chunk as {"id", "event": "chunk", ...} messages,
+    followed by a final {"event": "done"} (or "cancelled" / "error").
+
+    Seeded jobs are answered from the result cache when possible, and identical seeded
+    requests that arrive while one is running share that computation.
+    """
+
+    def __init__(self, workers: int = None, max_jobs: int = 2, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 cache: Optional[ResultCache] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.pool = None
+        self.jobs = {}       # request id -> job (coalesced requests share a job)
+        self.inflight = {}   # cache key -> running job
+        self.team_abbrevs = set()
+        self._job_slots = None
+        self._ids = itertools.count(1)
+
+    # ==================== LIFECYCLE ====================
+
+    def start_pool(self):
+        """ Start the worker pool and block until every worker has loaded game data. """
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=SIM_WORKER.init_worker)
+        pings = [self.pool.submit(SIM_WORKER.ping, 0.2) for _ in range(self.workers)]
+        pids = {f.result() for f in pings}
+        print(f"Warm pool ready: {len(pids)} worker(s)")
+
+        self.team_abbrevs = set(TeamLoader.load_team_metadata(TEAM_META))
+        if self.cache:
+            print(f"Result cache: {len(self.cache._entries)} entries, {self.cache.purge_stale()} stale removed")
+
+    async def serve(self, socket_path: str = DEFAULT_SOCKET, port: int = None):
+        """ Serve requests until cancelled (Ctrl+C). """
+        self._job_slots = asyncio.Semaphore(self.max_jobs)
+        self.start_pool()
+
+        if port is not None:
+            server = await asyncio.start_server(self.handle_client, host="127.0.0.1", port=port)
+            print(f"Listening on 127.0.0.1:{port}")
+        else:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+            print(f"Listening on {socket_path}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for job in list(self.jobs.values()):
+                job.cancel()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            if port is None and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    # ==================== CONNECTIONS ====================
+
+    async def handle_client(self, reader, writer):
+        """ Read requests from one connection and stream job output back on it. """
+        async def send(message: dict):
+            writer.write((json.dumps(message) + "\n").encode())
+            await writer.drain()
+
+        client_requests = []  # (request id, job or None, task streaming to this client)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    await send({"event": "error", "error": f"Invalid JSON: {e}"})
+                    continue
+
+                op = request.get("op")
+                if op in ("games", "season"):
+                    try:
+                        client_requests.append(await self.submit(request, send))
+                    except (KeyError, ValueError, OSError) as e:
+                        await send({"id": request.get("id"), "event": "error", "error": str(e)})
+                elif op == "cancel":
+                    request_id = str(request.get("id"))
+                    job = self.jobs.pop(request_id, None)
+                    if job:
+                        await job.detach(request_id)
+                    await send({"id": request_id, "event": "cancel", "found": job is not None})
+                elif op == "status":
+                    jobs = {job.id: job for job in self.jobs.values()}
+                    status = {"event": "status", "workers": self.workers,
+                              "jobs": [job.describe() for job in jobs.values()]}
+                    if self.cache:
+                        status["cache"] = {"entries": len(self.cache._entries), "bytes": self.cache.total_bytes,
+                                           "hits": self.cache.hits, "misses": self.cache.misses}
+                    await send(status)
+                else:
+                    await send({"event": "error", "error": f"Unknown op: {op}"})
+
+            # Client finished sending; keep streaming until its requests complete
+            await asyncio.gather(*(task for _, _, task in client_requests), return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            for request_id, job, _ in client_requests:
+                if job and self.jobs.pop(request_id, None):
+                    await job.detach(request_id, notify=False)
+        finally:
+            writer.close()
+
+    # ==================== JOBS ====================
+
+    def _parse_request(self, request: dict) -> Tuple[list, list, Optional[int]]:
+        """ Validate a request; returns (pool chunks, teams involved, games requested). """
+        seed = request.get("seed")
+        chunk = int(request.get("chunk_size", self.chunk_size))
+
+        if request["op"] == "games":
+            away, home = request["away"].upper(), request["home"].upper()
+            for abbrev in (away, home):
+                if abbrev not in self.team_abbrevs:
+                    raise KeyError(f"Unknown team: {abbrev}")
+            n_games = int(request["n"])
+            if n_games <= 0:
+                raise ValueError("n must be positive")
+            chunks = [(SIM_WORKER.run_matchup_chunk, (away, home, start, min(chunk, n_games - start), seed))
+                      for start in range(0, n_games, chunk)]
+            return chunks, [away, home], n_games
+
+        games = []
+        with open(request["schedule"], 'r') as f:
+            for game_num, row in enumerate(csv.DictReader(f), 1):
+                games.append((game_num, row['away_team'].strip().upper(), row['home_team'].strip().upper()))
+        chunks = [(SIM_WORKER.run_schedule_chunk, (games[i:i + chunk], seed))
+                  for i in range(0, len(games), chunk)]
+        return chunks, {team for _, away, home in games for team in (away, home)}, None
+
+    async def submit(self, request: dict, send) -> tuple:
+        """
+        Accept a request: answer it from the cache, coalesce it onto an identical running
+        job, or start a new job.
+
+        Returns:
+            (request id, job or None, task streaming the answer to this client)
+        """
+        request_id = str(request.get("id") or next(self._ids))
+        if request_id in self.jobs:
+            raise ValueError(f"Job id {request_id} already in use")
+        chunks, teams, n_games = self._parse_request(request)
+
+        key = deps = None
+        if self.cache:
+            key, deps = self.cache.make_key(request["op"], teams, request.get("seed"), n_games,
+                                            schedule=request.get("schedule"))
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                await send({"id": request_id, "event": "accepted", "cached": True})
+                return request_id, None, asyncio.create_task(self.stream_cached(request_id, cached, send))
+
+            job = self.inflight.get(key)
+            if job is not None:
+                self.jobs[request_id] = job
+                await send({"id": request_id, "event": "accepted", "coalesced_with": job.id})
+                await job.attach(request_id, send)
+                return request_id, job, job.task
+
+        job = SimulationJob(request_id, request["op"], chunks, key, deps)
+        job.listeners[request_id] = send
+        job.request_ids.add(request_id)
+        self.jobs[request_id] = job
+        if key:
+            self.inflight[key] = job
+        job.task = asyncio.create_task(self.run_job(job))
+        await send({"id": request_id, "event": "accepted"})
+        return request_id, job, job.task
+
+    async def stream_cached(self, request_id: str, cached: dict, send):
+        """ Stream a cached result in the same chunked form as a live job. """
+        results = cached["results"]
+        for index, start in enumerate(range(0, len(results), self.chunk_size)):
+            await send({"id": request_id, "event": "chunk", "index": index,
+                        "results": results[start:start + self.chunk_size]})
+        done = {"id": request_id, "event": "done", "games": len(results), "elapsed": 0.0, "cached": True}
+        if "records" in cached:
+            done["records"] = cached["records"]
+        await send(done)
+
+    async def run_job(self, job: SimulationJob):
+        """ Run a job under the concurrency limit, streaming chunks to its listeners in order. """
+        loop = asyncio.get_running_loop()
+        futures = []
+        try:
+            async with self._job_slots:
+                job.state = "running"
+                await job.broadcast({"event": "started"})
+                start_time = time.perf_counter()
+
+                futures = [loop.run_in_executor(self.pool, fn, *args) for fn, args in job.chunks]
+                for index, future in enumerate(futures):
+                    results = await future
+                    job.add_chunk(results)
+                    await job.broadcast({"event": "chunk", "index": index, "results": results})
+
+            if job.key:
+                self.cache.put(job.key, job.deps, job.result())
+                self.inflight.pop(job.key, None)
+            job.state = "done"
+            job.final = {"event": "done", "games": job.games_done, "elapsed": time.perf_counter() - start_time}
+            if job.op == "season":
+                job.final["records"] = job.records
+            await job.broadcast(job.final)
+        except asyncio.CancelledError:
+            job.state = "cancelled"
+            job.final = {"event": "cancelled", "games": job.games_done}
+            for future in futures:
+                future.cancel()
+            await job.broadcast(job.final)
+        except Exception as e:
+            job.state = "error"
+            job.final = {"event": "error", "error": str(e)}
+            for future in futures:
+                future.cancel()
+            await job.broadcast(job.final)
+        finally:
+            if self.inflight.get(job.key) is job:
+                self.inflight.pop(job.key)
+            for request_id in job.request_ids:
+                if self.jobs.get(request_id) is job:
+                    self.jobs.pop(request_id)
+
+
+def main():
+    """ Entry point: python -m SERVICE.SIM_SERVER [--socket PATH | --port N] """
+    parser = argparse.ArgumentParser(description="Run the local baseball simulation service.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path to listen on")
+    parser.add_argument("--port", type=int, default=None, help="Listen on 127.0.0.1:PORT instead of a Unix socket")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-jobs", type=int, default=2, help="Jobs allowed to run at once; others queue")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Games per pool task")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for the on-disk result cache")
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help="Result cache size limit")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the result cache")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir, args.cache_mb * 1024 * 1024)
+    server = SimulationServer(workers=args.workers, max_jobs=args.max_jobs, chunk_size=args.chunk_size, cache=cache)
+    try:
+        asyncio.run(server.serve(socket_path=args.socket, port=args.port))
+    except KeyboardInterrupt:
+        print("\nSimulation service stopped")
+
+
+if __name__ == "__main__":
+    main()
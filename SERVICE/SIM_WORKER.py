@@ -0,0 +1,55 @@
+import os
+import time
+from GAMEDAY import play_game
+from SIMULATION.BATCH_SIM import init_worker, get_team, simulate_chunk
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed
+
+
+def ping(hold: float = 0.0) -> int:
+    """ Warm-up task; holding the worker briefly makes the pool spawn every process. """
+    init_worker()
+    time.sleep(hold)
+    return os.getpid()
+
+
+def run_matchup_chunk(away_abbrev: str, home_abbrev: str, start: int, count: int, seed=None):
+    """
+    Simulate games [start, start + count) of an "N games of A @ B" job.
+
+    Every game reseeds from (seed, game number), so results do not depend on how
+    the job was split into chunks or which worker ran them.
+
+    Returns:
+        List of (away_score, home_score) tuples
+    """
+    games = simulate_chunk(away_abbrev, home_abbrev, start, count, seed)
+    return games[['away_runs', 'home_runs']].tolist()
+
+
+def run_schedule_chunk(games, seed=None):
+    """
+    Simulate a slice of a season schedule.
+
+    Each game is played in its own isolated stat tables and, with a seed, reseeds from
+    (seed, game number), so a game's result does not depend on the chunk or worker it ran in.
+
+    Args:
+        games: List of (game_num, away_abbrev, home_abbrev)
+        seed: Season seed (None for unseeded)
+
+    Returns:
+        List of (game_num, away_abbrev, home_abbrev, away_score, home_score)
+    """
+    init_worker()
+    if seed is not None:
+        seed_random(seed)
+
+    results = []
+    for game_num, away_abbrev, home_abbrev in games:
+        if seed is not None:
+            reseed_streams(derive_seed(seed, game_num))
+        with StatsManager.isolated():
+            away_score, home_score = play_game(get_team(away_abbrev), get_team(home_abbrev))
+        results.append((game_num, away_abbrev, home_abbrev, away_score, home_score))
+    return results
@@ -0,0 +1,129 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
+from GAMEDAY import setup_game, run_game, load_game_data, load_team
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed
+
+# One row per simulated game
+GAME_DTYPE = np.dtype([
+    ('away_runs', np.int16),
+    ('home_runs', np.int16),
+    ('innings', np.int16),
+    ('away_hits', np.int16),
+    ('home_hits', np.int16),
+    ('away_starter_pitches', np.int16),
+    ('home_starter_pitches', np.int16),
+])
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Process-local state kept resident between calls (rosters, league context, random pools)
+_teams = {}
+_loaded = False
+
+
+def init_worker():
+    """ Load player cache and league context once per process (also used as a pool initializer). """
+    global _loaded
+    if not _loaded:
+        load_game_data()
+        _loaded = True
+
+
+def get_team(team_abbrev: str):
+    """ Get a team from the process-local cache, loading it on first use. """
+    team = _teams.get(team_abbrev)
+    if team is None:
+        team = _teams[team_abbrev] = load_team(team_abbrev)
+    return team
+
+
+def simulate_chunk(away_abbrev: str, home_abbrev: str, start: int, count: int,
+                   seed=None, stream: int = 0, event_log=None) -> np.ndarray:
+    """
+    Simulate games [start, start + count) of one matchup into a GAME_DTYPE array.
+
+    Each game is played in its own isolated stat tables, so pitch counts (and with them the
+    bullpen decisions) start from zero every game and the caller's tables are untouched.
+    With a seed, every game reseeds from (seed, stream, game number), so the output does not
+    depend on chunking or on which process ran it. An active SIMULATION.EVENT_LOG.EventLog
+    passed as `event_log` records each game under its game number and stream key.
+    """
+    init_worker()
+    away_team = get_team(away_abbrev)
+    home_team = get_team(home_abbrev)
+    if seed is not None:
+        seed_random(seed)
+
+    out = np.zeros(count, dtype=GAME_DTYPE)
+    for i in range(count):
+        key = 0
+        if seed is not None:
+            key = derive_seed(seed, stream, start + i)
+            reseed_streams(key)
+        if event_log is not None:
+            event_log.start_game(start + i, key)
+
+        with StatsManager.isolated():
+            game = run_game(setup_game(away_team, home_team))
+            stats = game.gamestate.stats
+            out[i] = (
+                stats['away_team']['score'], stats['home_team']['score'],
+                game.gamestate.current_inning,
+                stats['away_team']['hits'], stats['home_team']['hits'],
+                StatsManager.get_pitcher_stat(game.away_pitching.starting_pitcher, 'PT'),
+                StatsManager.get_pitcher_stat(game.home_pitching.starting_pitcher, 'PT'),
+            )
+    return out
+
+
+def _chunk_plan(pairs: Sequence[Tuple[str, str]], n_games: int, chunk_size: int):
+    for pair_index, (away, home) in enumerate(pairs):
+        for start in range(0, n_games, chunk_size):
+            yield pair_index, away, home, start, min(chunk_size, n_games - start)
+
+
+def simulate_matchups(pairs: Sequence[Tuple[str, str]], n_games: int, seed=None,
+                      workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Simulate many (away, home) matchups at once.
+
+    Args:
+        pairs: Sequence of (away_abbrev, home_abbrev)
+        n_games: Games per pair
+        seed: Base seed (None for unseeded); pair i uses stream i
+        workers: Processes to spread chunks across (1 = run in this process)
+        chunk_size: Games per task
+
+    Returns:
+        GAME_DTYPE structured array of shape (len(pairs), n_games), e.g.
+        results['home_runs'].mean(axis=1) gives each pair's mean home runs scored.
+    """
+    pairs = [(away.upper(), home.upper()) for away, home in pairs]
+    results = np.zeros((len(pairs), n_games), dtype=GAME_DTYPE)
+    plan = list(_chunk_plan(pairs, n_games, chunk_size))
+
+    if workers <= 1:
+        for pair_index, away, home, start, count in plan:
+            results[pair_index, start:start + count] = simulate_chunk(away, home, start, count, seed, pair_index)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [(pair_index, start, count,
+                    pool.submit(simulate_chunk, away, home, start, count, seed, pair_index))
+                   for pair_index, away, home, start, count in plan]
+        for pair_index, start, count, future in futures:
+            results[pair_index, start:start + count] = future.result()
+    return results
+
+
+def summarize(results: np.ndarray) -> List[dict]:
+    """ Per-pair summary (home win rate, mean runs, extra-innings rate) computed vectorized. """
+    home_wins = (results['home_runs'] > results['away_runs']).mean(axis=1)
+    away_runs = results['away_runs'].mean(axis=1)
+    home_runs = results['home_runs'].mean(axis=1)
+    extras = (results['innings'] > 9).mean(axis=1)
+    return [{'home_win_pct': float(home_wins[i]), 'away_runs': float(away_runs[i]),
+             'home_runs': float(home_runs[i]), 'extra_innings_pct': float(extras[i])}
+            for i in range(results.shape[0])]
@@ -0,0 +1,36 @@
+import os
+import pickle
+from typing import Dict, Optional
+from DATA_LOADERS.TEAM_LOADER import TeamLoader
+
+CHECKPOINT_FORMAT = 1
+
+
+def save_checkpoint(path: str, state: Dict):
+    """
+    Write a run's state atomically: the new file is complete and synced before it replaces
+    the previous checkpoint, so a run killed mid-write still has the last good one.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump({"format": CHECKPOINT_FORMAT, "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    """ State saved by save_checkpoint, or None when there is no checkpoint yet. """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        saved = pickle.load(f)
+    if saved.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"Unsupported checkpoint format in {path}: {saved.get('format')}")
+    return saved["state"]
+
+
+def cached_players() -> Dict:
+    """ Every cached Player by (team_abbrev, player_id), for StatsManager.import_tables. """
+    return {(p.team_abbrev, p.player_id): p
+            for batters, pitchers in TeamLoader._all_players_cache.values() for p in batters + pitchers}
@@ -0,0 +1,449 @@
+import csv
+import json
+import os
+import numpy as np
+from typing import Dict, Optional, Tuple
+from ATBAT.ATBAT_FACTORY import AtBatFactory
+from DATA_LOADERS.TEAM_LOADER import TeamLoader
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import InningHalf, Pitch, Micro, Macro
+
+DEFAULT_CHUNK_ROWS = 65536
+LOG_FORMAT = 1
+
+# One row per pitch (in-play pitches included), micro or macro event. State columns are as the
+# event began; runs and outs_made are what the event produced.
+EVENT_DTYPE = np.dtype([
+    ('game_id', np.uint32),
+    ('pa', np.uint16),         # Plate appearance number within the game (0-based)
+    ('inning', np.uint8),
+    ('half', np.uint8),        # 0 = top, 1 = bottom
+    ('outs', np.uint8),
+    ('bases', np.uint8),       # Base code: 1st = 1, 2nd = 2, 3rd = 4
+    ('batter', np.int32),      # Player index (players.csv)
+    ('pitcher', np.int32),
+    ('opcode', np.uint8),      # Index into OPCODES
+    ('runs', np.uint8),
+    ('outs_made', np.uint8),
+])
+
+# One row per logged game
+GAME_LOG_DTYPE = np.dtype([
+    ('game_id', np.uint32),
+    ('away', 'S4'),
+    ('home', 'S4'),
+    ('key', np.uint64),        # Stream key the game was played from (0 = unknown)
+    ('first_event', np.uint64),
+])
+
+OPCODES = tuple(Pitch) + tuple(Micro) + tuple(Macro)
+OPCODE_INDEX = {code: i for i, code in enumerate(OPCODES)}
+_OPCODE_BY_ID = {id(code): i for i, code in enumerate(OPCODES)}
+FIRST_MICRO = len(Pitch)
+FIRST_MACRO = OPCODES.index(Macro.NA)
+IN_PLAY = OPCODE_INDEX[Pitch.IP]
+PLAYER_FIELDS = ('index', 'team', 'player_id', 'name', 'position', 'bats', 'throws')
+
+# Secondary indexes built while writing: name -> key of each event row
+INDEX_KEYS = {
+    'batter': lambda chunk: chunk['batter'],
+    'pitcher': lambda chunk: chunk['pitcher'],
+    'state': lambda chunk: chunk['outs'].astype(np.int32) * 8 + chunk['bases'],  # Base-out state 0..23
+}
+
+
+def opcode_name(opcode: int) -> str:
+    code = OPCODES[opcode]
+    return f"{type(code).__name__}.{code.name}"
+
+
+class PlayerIndex:
+    """
+    Stable integer ids for players: every cached roster in team order (batters, then
+    pitchers), so logs written from the same ALL_TEAMS.csv agree on them. Players not in
+    the cache (edited copies, custom rosters) are numbered after, as they first appear.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, int] = {}
+        self.players = []
+        for team in sorted(TeamLoader._all_players_cache):
+            batters, pitchers = TeamLoader._all_players_cache[team]
+            for player in batters + pitchers:
+                self.add(player)
+
+    def add(self, player) -> int:
+        index = self._by_id.get(id(player))
+        if index is None:
+            index = self._by_id[id(player)] = len(self.players)
+            self.players.append(player)
+        return index
+
+    def rows(self):
+        for index, p in enumerate(self.players):
+            yield (index, p.team_abbrev, p.player_id, f"{p.first_name} {p.last_name}", p.position, p.bats, p.throws)
+
+
+class _ColumnWriter:
+    """
+    Appends structured chunks to one file per column (`<prefix>.<column>.bin`). With `rows`,
+    existing files are cut back to that many rows and appended to (resuming a run).
+    """
+
+    def __init__(self, path: str, prefix: str, dtype: np.dtype, rows: int = 0):
+        self.dtype = dtype
+        self.rows = rows
+        self.files = {}
+        for name in dtype.names:
+            file_path = os.path.join(path, f"{prefix}.{name}.bin")
+            if rows:
+                f = self.files[name] = open(file_path, 'r+b')
+                f.truncate(rows * dtype.fields[name][0].itemsize)
+                f.seek(0, os.SEEK_END)
+            else:
+                self.files[name] = open(file_path, 'wb')
+
+    def write(self, chunk: np.ndarray):
+        for name, f in self.files.items():
+            chunk[name].tofile(f)
+        self.rows += len(chunk)
+
+    def flush(self):
+        for f in self.files.values():
+            f.flush()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class _IndexWriter:
+    """
+    Builds INDEX_KEYS postings at write time. Each flushed chunk appends its (key, row)
+    pairs, sorted by key, to a run file; `finalize` merges the runs into a CSR layout per
+    index: `index.<name>.rows.bin` holds row offsets grouped by key (ascending within a
+    key) and `index.<name>.bounds.bin` where each key's group starts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.runs = {name: (open(self._file(name, "keys.tmp"), 'wb'), open(self._file(name, "rows.tmp"), 'wb'))
+                     for name in INDEX_KEYS}
+
+    def _file(self, name: str, suffix: str) -> str:
+        return os.path.join(self.path, f"index.{name}.{suffix}")
+
+    def add(self, chunk: np.ndarray, first_row: int):
+        for name, key_of in INDEX_KEYS.items():
+            keys = key_of(chunk).astype(np.int32)
+            order = np.argsort(keys, kind='stable')
+            keys_f, rows_f = self.runs[name]
+            keys[order].tofile(keys_f)
+            (order.astype(np.uint64) + np.uint64(first_row)).tofile(rows_f)
+
+    def finalize(self):
+        for name, (keys_f, rows_f) in self.runs.items():
+            keys_f.close()
+            rows_f.close()
+            keys = np.fromfile(self._file(name, "keys.tmp"), dtype=np.int32)
+            rows = np.fromfile(self._file(name, "rows.tmp"), dtype=np.uint64)
+            order = np.argsort(keys, kind='stable')  # Runs are in row order, so rows stay ascending per key
+            keys = keys[order]
+            bounds = np.searchsorted(keys, np.arange(int(keys.max()) + 2 if len(keys) else 1)).astype(np.uint64)
+            rows[order].tofile(self._file(name, "rows.bin"))
+            bounds.tofile(self._file(name, "bounds.bin"))
+            os.remove(self._file(name, "keys.tmp"))
+            os.remove(self._file(name, "rows.tmp"))
+
+
+def _read_columns(path: str, prefix: str, dtype: np.dtype, rows: int) -> Dict[str, np.ndarray]:
+    """ Memory-map every column of a table (empty arrays for an empty table). """
+    columns = {}
+    for name in dtype.names:
+        column_dtype = dtype.fields[name][0]
+        if rows:
+            columns[name] = np.memmap(os.path.join(path, f"{prefix}.{name}.bin"), column_dtype, 'r', shape=(rows,))
+        else:
+            columns[name] = np.empty(0, column_dtype)
+    return columns
+
+
+class EventLog:
+    """
+    Optional play-by-play recorder.
+
+    Installed inside a `with` block by swapping AtBatFactory.execute_event, so every
+    executed pitch, micro and macro event gets a row; the engine runs untouched outside the
+    block. The in-play pitch is counted but never executed, so StatsManager.record_pitch is
+    swapped too and a pitch counted without being executed is logged (as Pitch.IP) ahead of
+    the event that follows it. Rows are collected as tuples and converted column by column
+    into an EVENT_DTYPE chunk when it fills; full chunks are appended to per-column files
+    under `path`, and meta.json is rewritten after each flush, so a log is readable
+    (EventStore) up to its last flush even while still being written.
+
+    Games are detected automatically when a new GameState produces its first event; call
+    `start_game` beforehand to give the next game its own id and stream key.
+
+    `resume` with a `position()` taken earlier cuts the log back to those events and games
+    and appends from there (the postings of the kept events are re-read for the indexes).
+    Player indices are only stable across processes for cached rosters, as a season uses.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, resume: Optional[Tuple[int, int]] = None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.players = PlayerIndex()
+        self.chunk = np.zeros(chunk_rows, dtype=EVENT_DTYPE)
+        self._rows = [None] * chunk_rows  # Row tuples staged for the chunk
+        self._chunk_rows = chunk_rows
+        self.games = np.zeros(max(chunk_rows // 64, 16), dtype=GAME_LOG_DTYPE)
+        events, games = resume or (0, 0)
+        self._events = _ColumnWriter(path, "events", EVENT_DTYPE, rows=events)
+        self._game_rows = _ColumnWriter(path, "games", GAME_LOG_DTYPE, rows=games)
+        self._index = _IndexWriter(path)
+        if events:
+            self._reindex(events)
+        self._indexed = False
+        self._n = 0
+        self._n_games = 0
+        self._gamestate = None
+        self._game_id = 0
+        self._next_game = 0
+        self._pending = None
+        self._pa = 0
+        self._token = None
+        self._matchup = None
+        self._unlogged_pitches = 0  # Pitches counted by StatsManager but not yet logged
+        self._descriptor = None
+        self._original = None
+        self._record_descriptor = None
+        self._original_record = None
+
+    # ==================== GAMES ====================
+
+    def start_game(self, game_id: Optional[int] = None, key: int = 0):
+        """ Id (default: next in sequence) and stream key for the next game to produce events. """
+        self._pending = (self._next_game if game_id is None else game_id, key)
+
+    def _begin(self, gamestate):
+        game_id, key = self._pending or (self._next_game, 0)
+        self._pending = None
+        self._gamestate = gamestate
+        self._game_id = game_id
+        self._next_game = game_id + 1
+        self._pa = 0
+
+        if self._n_games == len(self.games):
+            self._flush_games()
+        self.games[self._n_games] = (game_id, gamestate.away_team.abbreviation, gamestate.home_team.abbreviation,
+                                     key, self._events.rows + self._n)
+        self._n_games += 1
+
+    # ==================== RECORDING ====================
+
+    def _record_pitch(self, pitcher, pitch_count: int = 1):
+        self._original_record(pitcher, pitch_count)
+        self._unlogged_pitches += pitch_count
+
+    def _append(self, row: tuple):
+        n = self._n
+        if n == self._chunk_rows:
+            self._flush_events()
+            n = 0
+        self._rows[n] = row
+        self._n = n + 1
+
+    def _execute_event(self, code, gamestate, token):
+        outs, bases = gamestate.outs, gamestate.bases
+        result = self._original(code, gamestate, token)
+        if gamestate is not self._gamestate:
+            self._begin(gamestate)
+        if token is not self._token:
+            self._token = token
+            self._matchup = (self.players.add(token.batter), self.players.add(token.pitcher))
+
+        opcode = _OPCODE_BY_ID[id(code)]  # Enum hashing is slow; members are singletons
+        state = (self._game_id, self._pa, gamestate.current_inning, gamestate.inninghalf is InningHalf.BOT, outs,
+                 (bases.fst is not None) | (bases.snd is not None) << 1 | (bases.thd is not None) << 2,
+                 *self._matchup)
+        if opcode < FIRST_MICRO:
+            self._unlogged_pitches = max(self._unlogged_pitches - 1, 0)
+        elif self._unlogged_pitches:
+            for _ in range(self._unlogged_pitches):
+                self._append((*state, IN_PLAY, 0, 0))
+            self._unlogged_pitches = 0
+        self._append((*state, opcode, result.runs, result.outs))
+        if opcode >= FIRST_MACRO:
+            self._pa += 1
+        return result
+
+    # ==================== STORAGE ====================
+
+    def _reindex(self, rows: int):
+        """ Feed the events already on disk (when resuming) to the index writer, a chunk at a time. """
+        self._events.flush()
+        columns = _read_columns(self.path, "events", EVENT_DTYPE, rows)
+        for start in range(0, rows, self._chunk_rows):
+            stop = min(start + self._chunk_rows, rows)
+            chunk = self.chunk[:stop - start]
+            for name, column in columns.items():
+                chunk[name] = column[start:stop]
+            self._index.add(chunk, start)
+
+    def _flush_events(self):
+        n = self._n
+        if n:
+            # Column-wise conversion is several times cheaper than assigning structured rows one by one
+            for name, values in zip(EVENT_DTYPE.names, zip(*self._rows[:n])):
+                self.chunk[name][:n] = values
+            self._index.add(self.chunk[:n], self._events.rows)
+        self._events.write(self.chunk[:n])
+        self._n = 0
+
+    def _flush_games(self):
+        self._game_rows.write(self.games[:self._n_games])
+        self._n_games = 0
+
+    def flush(self):
+        """ Write buffered rows and refresh meta.json (atomically) and players.csv. """
+        self._flush_events()
+        self._flush_games()
+        self._events.flush()
+        self._game_rows.flush()
+        self._write_meta()
+
+    def position(self) -> Tuple[int, int]:
+        """ Flush, then report the events and games on disk (pass to `resume` to continue from here). """
+        self.flush()
+        return self._events.rows, self._game_rows.rows
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, "players.csv.tmp"), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(PLAYER_FIELDS)
+            writer.writerows(self.players.rows())
+        os.replace(os.path.join(self.path, "players.csv.tmp"), os.path.join(self.path, "players.csv"))
+
+        meta = {"format": LOG_FORMAT, "events": self._events.rows, "games": self._game_rows.rows,
+                "opcodes": [opcode_name(i) for i in range(len(OPCODES))],
+                "indexes": sorted(INDEX_KEYS) if self._indexed else []}
+        with open(os.path.join(self.path, "meta.json.tmp"), 'w') as f:
+            json.dump(meta, f)
+        os.replace(os.path.join(self.path, "meta.json.tmp"), os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        """ Flush, build the secondary indexes and mark them usable in meta.json. """
+        self.flush()
+        self._events.close()
+        self._game_rows.close()
+        self._index.finalize()
+        self._indexed = True
+        self._write_meta()
+
+    def __enter__(self):
+        self._descriptor = AtBatFactory.__dict__['execute_event']
+        self._original = AtBatFactory.execute_event
+        self._record_descriptor = StatsManager.__dict__['record_pitch']
+        self._original_record = StatsManager.record_pitch
+        self._unlogged_pitches = 0
+        AtBatFactory.execute_event = self._execute_event
+        StatsManager.record_pitch = self._record_pitch
+        return self
+
+    def __exit__(self, *exc):
+        AtBatFactory.execute_event = self._descriptor
+        StatsManager.record_pitch = self._record_descriptor
+        self.close()
+        return False
+
+
+class EventStore:
+    """
+    Read side of an EventLog directory. Columns are memory-mapped, so opening a log of
+    any size is instant and only the pages a query touches are read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != LOG_FORMAT:
+            raise ValueError(f"Unsupported event log format in {path}: {self.meta.get('format')}")
+        self.events = _read_columns(path, "events", EVENT_DTYPE, self.meta["events"])
+        self.games = _read_columns(path, "games", GAME_LOG_DTYPE, self.meta["games"])
+        self._players = None
+        self._player_columns = {}
+        self._indexes = {}
+        self._game_rows = None
+
+    def __len__(self):
+        return self.meta["events"]
+
+    @property
+    def players(self) -> list:
+        """ players.csv rows as dicts, in player-index order. """
+        if self._players is None:
+            with open(os.path.join(self.path, "players.csv"), newline='') as f:
+                self._players = list(csv.DictReader(f))
+        return self._players
+
+    def player_column(self, field: str) -> np.ndarray:
+        """ One players.csv field as an array indexed by player index (e.g. 'throws'). """
+        column = self._player_columns.get(field)
+        if column is None:
+            column = self._player_columns[field] = np.array([p[field] for p in self.players])
+        return column
+
+    # ==================== INDEXES ====================
+
+    @property
+    def indexed(self) -> bool:
+        return bool(self.meta.get("indexes"))
+
+    def postings(self, name: str, key: int) -> np.ndarray:
+        """ Row offsets whose `name` key (INDEX_KEYS) equals `key`: a memory-mapped, ascending slice. """
+        index = self._indexes.get(name)
+        if index is None:
+            rows_path = os.path.join(self.path, f"index.{name}.rows.bin")
+            rows = np.memmap(rows_path, np.uint64, 'r') if len(self) else np.empty(0, np.uint64)
+            bounds = np.fromfile(os.path.join(self.path, f"index.{name}.bounds.bin"), dtype=np.uint64)
+            index = self._indexes[name] = (rows, bounds)
+        rows, bounds = index
+        if key < 0 or key + 1 >= len(bounds):
+            return rows[0:0]
+        return rows[int(bounds[key]):int(bounds[key + 1])]
+
+    def game_range(self, game_id: int):
+        """ (start, stop) event rows of a game; games are stored contiguously. """
+        if self._game_rows is None:
+            firsts = np.append(np.asarray(self.games['first_event'], dtype=np.uint64), np.uint64(len(self)))
+            self._game_rows = ({int(g): i for i, g in enumerate(self.games['game_id'])}, firsts)
+        positions, firsts = self._game_rows
+        i = positions.get(game_id)
+        if i is None:
+            return 0, 0
+        return int(firsts[i]), int(firsts[i + 1])
+
+    def game(self, game_id: int) -> Dict[str, np.ndarray]:
+        """ Memory-mapped column slices for one game's events. """
+        start, stop = self.game_range(game_id)
+        return {name: column[start:stop] for name, column in self.events.items()}
+
+    def opcode(self, code) -> int:
+        """ Opcode for an engine code (e.g. Macro.HR), using this log's own table. """
+        return self.meta["opcodes"].index(f"{type(code).__name__}.{code.name}")
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """ Rows [start, stop) gathered into an EVENT_DTYPE array. """
+        stop = len(self) if stop is None else stop
+        out = np.empty(max(stop - start, 0), dtype=EVENT_DTYPE)
+        for name, column in self.events.items():
+            out[name] = column[start:stop]
+        return out
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        """ Gather arbitrary rows (e.g. a query result) into an EVENT_DTYPE array. """
+        out = np.empty(len(rows), dtype=EVENT_DTYPE)
+        for name, column in self.events.items():
+            out[name] = column[rows]
+        return out
@@ -0,0 +1,171 @@
+import argparse
+import glob
+import os
+import time
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+from SIMULATION.EVENT_LOG import EventStore
+
+# Base codes with a runner on second or third
+RISP_CODES = tuple(code for code in range(8) if code & 0b110)
+
+
+def find_player(store: EventStore, team: str, player_id: int) -> int:
+    """ Player index for a (team, player id) pair, as used in the batter/pitcher columns. """
+    for row in store.players:
+        if row['team'] == team.upper() and int(row['player_id']) == player_id:
+            return int(row['index'])
+    raise KeyError(f"{team}:{player_id} not in {store.path}")
+
+
+def _states(outs: Optional[Iterable[int]], bases: Optional[Iterable[int]], risp: bool) -> Optional[List[int]]:
+    """ Allowed base-out states (outs * 8 + base code), or None for no restriction. """
+    if outs is None and bases is None and not risp:
+        return None
+    outs = range(3) if outs is None else outs
+    codes = set(range(8) if bases is None else bases)
+    if risp:
+        codes &= set(RISP_CODES)
+    return sorted(o * 8 + code for o in outs for code in codes)
+
+
+def _lookup(allowed) -> np.ndarray:
+    """ Boolean table over one-byte codes (opcodes, base-out states): cheaper than np.isin per call. """
+    table = np.zeros(256, dtype=bool)
+    table[list(allowed)] = True
+    return table
+
+
+def query(store: EventStore, batter: int = None, pitcher: int = None, game: int = None,
+          outs: Iterable[int] = None, bases: Iterable[int] = None, risp: bool = False,
+          batter_bats: str = None, pitcher_throws: str = None, opcodes: Iterable[int] = None,
+          plate_appearances: bool = False) -> np.ndarray:
+    """
+    Event rows matching every given filter, ascending.
+
+    The most selective available index picks the candidate rows (game range, then batter,
+    pitcher, base-out state); the remaining filters are checked on just those rows, so
+    only their pages of the memory-mapped columns are read. Logs without finished indexes
+    (still being written) are scanned instead.
+
+    Args:
+        batter, pitcher: Player indices (see find_player)
+        game: Game id
+        outs, bases, risp: Base-out filters (base codes: 1st = 1, 2nd = 2, 3rd = 4)
+        batter_bats, pitcher_throws: Handedness ('L', 'R', 'B')
+        opcodes: Event opcodes to keep (store.opcode(Macro.HR), ...)
+        plate_appearances: Keep only plate-appearance results (macro events)
+
+    Returns:
+        Row offsets into the store (use store.take(rows) for the records)
+    """
+    events = store.events
+    states = _states(outs, bases, risp)
+    checks = []  # (column, allowed values) still to apply
+
+    if game is not None:
+        start, stop = store.game_range(game)
+        rows = np.arange(start, stop, dtype=np.uint64)
+    elif store.indexed and batter is not None:
+        rows = store.postings('batter', batter)
+        batter = None
+    elif store.indexed and pitcher is not None:
+        rows = store.postings('pitcher', pitcher)
+        pitcher = None
+    elif store.indexed and states is not None:
+        rows = np.sort(np.concatenate([store.postings('state', state) for state in states]))
+        states = None
+    else:
+        rows = np.arange(len(store), dtype=np.uint64)
+
+    if batter is not None:
+        checks.append(('batter', [batter]))
+    if pitcher is not None:
+        checks.append(('pitcher', [pitcher]))
+    if opcodes is not None:
+        checks.append(('opcode', list(opcodes)))
+    if plate_appearances:
+        checks.append(('opcode', [i for i, name in enumerate(store.meta["opcodes"])
+                                  if name.startswith("Macro.") and name != "Macro.NA"]))
+
+    for column, allowed in checks:
+        values = events[column][rows]
+        rows = rows[values == allowed[0] if len(allowed) == 1 else _lookup(allowed)[values]]
+    if states is not None:
+        state = events['outs'][rows].astype(np.int32) * 8 + events['bases'][rows]
+        rows = rows[_lookup(states)[state]]
+    if batter_bats is not None:
+        rows = rows[store.player_column('bats')[events['batter'][rows]] == batter_bats]
+    if pitcher_throws is not None:
+        rows = rows[store.player_column('throws')[events['pitcher'][rows]] == pitcher_throws]
+    return np.asarray(rows)
+
+
+def outcome_counts(store: EventStore, rows: np.ndarray) -> dict:
+    """ Events per opcode name among the rows (e.g. {'Macro.HR': 12, ...}). """
+    counts = np.bincount(store.events['opcode'][rows], minlength=len(store.meta["opcodes"]))
+    return {name: int(n) for name, n in zip(store.meta["opcodes"], counts) if n}
+
+
+class EventCorpus:
+    """ Several event logs (e.g. one per simulated season) queried as one. """
+
+    def __init__(self, paths: Iterable[str]):
+        self.stores = [EventStore(path) for path in paths]
+
+    @classmethod
+    def from_glob(cls, pattern: str) -> 'EventCorpus':
+        return cls(sorted(path for path in glob.glob(pattern) if os.path.exists(os.path.join(path, "meta.json"))))
+
+    def __len__(self):
+        return sum(len(store) for store in self.stores)
+
+    def query(self, **filters) -> List[Tuple[EventStore, np.ndarray]]:
+        """ Matching rows per store (see `query` for the filters). """
+        return [(store, query(store, **filters)) for store in self.stores]
+
+    def take(self, **filters) -> np.ndarray:
+        """ Every matching record, concatenated across stores. """
+        parts = [store.take(rows) for store, rows in self.query(**filters)]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def outcome_counts(self, **filters) -> dict:
+        totals = {}
+        for store, rows in self.query(**filters):
+            for name, n in outcome_counts(store, rows).items():
+                totals[name] = totals.get(name, 0) + n
+        return totals
+
+
+def main():
+    """ Entry point: python -m SIMULATION.EVENT_QUERY "LOGS/season_*" --batter BOS:1029 --vs L --risp """
+    parser = argparse.ArgumentParser(description="Query play-by-play event logs")
+    parser.add_argument("logs", help="Log directory or glob of log directories")
+    parser.add_argument("--batter", help="TEAM:player_id")
+    parser.add_argument("--pitcher", help="TEAM:player_id")
+    parser.add_argument("--vs", choices=("L", "R"), help="Pitcher handedness")
+    parser.add_argument("--risp", action="store_true", help="Runners in scoring position")
+    parser.add_argument("--outs", type=int, nargs="*")
+    args = parser.parse_args()
+
+    started = time.time()
+    corpus = EventCorpus.from_glob(args.logs)
+    if not corpus.stores:
+        parser.error(f"No event logs match {args.logs}")
+
+    filters = {"plate_appearances": True, "pitcher_throws": args.vs, "risp": args.risp, "outs": args.outs}
+    for role in ("batter", "pitcher"):
+        spec = getattr(args, role)
+        if spec:
+            team, player_id = spec.split(":")
+            filters[role] = find_player(corpus.stores[0], team, int(player_id))
+
+    counts = corpus.outcome_counts(**filters)
+    print(f"{len(corpus.stores)} logs, {len(corpus):,} events, {sum(counts.values()):,} PAs "
+          f"in {(time.time() - started) * 1000:.1f} ms")
+    for name, n in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {name.split('.', 1)[1]:<4}{n:>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import numpy as np
+from typing import Dict, Optional
+from SIMULATION.RESULT_STREAM import RESULT_DTYPE, read_results
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+
+# Table: column name -> 1-D array, all the same length
+Table = Dict[str, np.ndarray]
+
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".npz": "npz"}
+DEFAULT_COMPRESSION = "zstd"
+
+BATTING_FIELDS = ('PA', 'AB', 'H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'BB', 'SO', 'HBP', 'TB', 'SB', 'CS')
+PITCHING_FIELDS = ('IP', 'PT', 'H', 'R', 'ER', 'BB', 'SO', 'HR', 'BF', 'Outs')
+
+
+def _rate(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """ numerator / denominator, 0.0 where the denominator is 0 (as StatsCalculator does). """
+    out = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+# ==================== TABLES ====================
+
+def results_table(results: np.ndarray) -> Table:
+    """ Game results (RESULT_DTYPE rows, e.g. read_results(path)) as columns; team codes become strings. """
+    table = {name: np.asarray(results[name]) for name in RESULT_DTYPE.names}
+    for name in ('away_team', 'home_team'):
+        table[name] = table[name].astype(str)
+    return table
+
+
+def game_results_table(game_results: list, season: int = 0) -> Table:
+    """ SeasonSimulator.game_results (kept in memory) as columns. """
+    table = {'season': np.full(len(game_results), season, dtype=np.uint32)}
+    for name, dtype in (('game_num', np.uint32), ('away_team', str), ('home_team', str),
+                        ('away_score', np.int16), ('home_score', np.int16)):
+        table[name] = np.array([game[name] for game in game_results], dtype=dtype)
+    return table
+
+
+def _lines_table(stats: dict, fields) -> Table:
+    keys = list(stats)
+    table = {'team': np.array([key[0] for key in keys], dtype=str),
+             'player_id': np.array([key[1] for key in keys], dtype=np.int64),
+             'name': np.array([stats[key]['player'].full_name for key in keys], dtype=str)}
+    for field in fields:
+        table[field] = np.fromiter((stats[key].get(field, 0) for key in keys),
+                                   dtype=np.float64 if field == 'IP' else np.int64, count=len(keys))
+    return table
+
+
+def batting_table() -> Table:
+    """ Every batter's line from the current StatsManager tables, with AVG/OBP/SLG/OPS computed on the columns. """
+    table = _lines_table(StatsManager.batter_stats, BATTING_FIELDS)
+    on_base = table['H'] + table['BB'] + table['HBP']
+    table['AVG'] = _rate(table['H'], table['AB'])
+    table['OBP'] = _rate(on_base, table['AB'] + table['BB'] + table['HBP'])
+    table['SLG'] = _rate(table['TB'], table['AB'])
+    table['OPS'] = table['OBP'] + table['SLG']
+    return table
+
+
+def pitching_table() -> Table:
+    """ Every pitcher's line from the current StatsManager tables, with ERA/WHIP/K9/BB9 computed on the columns. """
+    table = _lines_table(StatsManager.pitcher_stats, PITCHING_FIELDS)
+    table['ERA'] = _rate(table['ER'] * 9, table['IP'])
+    table['WHIP'] = _rate(table['BB'] + table['H'], table['IP'])
+    table['K9'] = _rate(table['SO'] * 9, table['IP'])
+    table['BB9'] = _rate(table['BB'] * 9, table['IP'])
+    return table
+
+
+def monte_carlo_tables(runner) -> Dict[str, Table]:
+    """
+    A MonteCarloRunner's aggregates: 'summary' (one row per club) and 'wins' (long form:
+    team, wins, seasons finishing with that many wins; empty cells left out).
+    """
+    summary = runner.summary()
+    summary_table = {'team': np.array([row['team'] for row in summary], dtype=str)}
+    for name in ('mean_wins', 'sd_wins', 'p10_wins', 'p90_wins'):
+        summary_table[name] = np.array([row[name] for row in summary])
+
+    team_index, wins = np.nonzero(runner.win_counts)
+    wins_table = {'team': np.array(runner.teams, dtype=str)[team_index],
+                  'wins': wins.astype(np.int16),
+                  'seasons': runner.win_counts[team_index, wins]}
+    return {'summary': summary_table, 'wins': wins_table}
+
+
+# ==================== FILES ====================
+
+def _format(path: str, fmt: Optional[str]) -> str:
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in FORMATS.values():
+        raise ValueError(f"Unknown table format for {path} (use {', '.join(FORMATS)})")
+    return fmt
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.feather
+    except ImportError as e:
+        raise RuntimeError("Parquet and Arrow export need pyarrow (pip install pyarrow); .npz works without it") from e
+    return pyarrow
+
+
+def write_table(table: Table, path: str, fmt: Optional[str] = None, compression: str = DEFAULT_COMPRESSION):
+    """
+    Write a table straight from its arrays: Parquet or Arrow IPC (pyarrow, compressed) or
+    compressed .npz (numpy only). The format follows the extension unless given.
+    """
+    fmt = _format(path, fmt)
+    if fmt == "npz":
+        np.savez_compressed(path, **table)
+        return
+
+    pa = _pyarrow()
+    arrow_table = pa.table({name: pa.array(column) for name, column in table.items()})
+    if fmt == "parquet":
+        pa.parquet.write_table(arrow_table, path, compression=compression)
+    else:
+        pa.feather.write_feather(arrow_table, path, compression=compression)
+
+
+def read_table(path: str, fmt: Optional[str] = None) -> Table:
+    """ Load a table written by write_table back into column arrays. """
+    fmt = _format(path, fmt)
+    if fmt == "npz":
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    pa = _pyarrow()
+    arrow_table = pa.parquet.read_table(path) if fmt == "parquet" else pa.feather.read_table(path)
+    return {name: arrow_table.column(name).to_numpy() for name in arrow_table.column_names}
+
+
+def export_results(results_path: str, path: str, fmt: Optional[str] = None):
+    """ Convert a ResultWriter output (.csv or column directory) to Parquet / Arrow / .npz. """
+    write_table(results_table(read_results(results_path)), path, fmt)
+
+
+def export_stats(directory: str, fmt: str = "parquet"):
+    """ Write batting.<ext> and pitching.<ext> from the current StatsManager tables. """
+    os.makedirs(directory, exist_ok=True)
+    extension = next(ext for ext, name in FORMATS.items() if name == fmt)
+    write_table(batting_table(), os.path.join(directory, f"batting{extension}"), fmt)
+    write_table(pitching_table(), os.path.join(directory, f"pitching{extension}"), fmt)
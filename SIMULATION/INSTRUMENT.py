@@ -0,0 +1,191 @@
+import json
+import time
+from typing import Dict, List
+from ATBAT.ATBAT_FACTORY import AtBatFactory
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from GAME_LOGIC import INNING_SIM
+from TEAM_UTILS.BULLPEN_MANAGER import BullpenManager
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import Macro
+
+SUB_BUCKETS = 4  # Buckets per power of two (the two bits after the leading one), each at most 25% wide
+
+# Stage -> the engine functions it times. Stages nest (a half inning contains its at-bats,
+# pitching decisions look up matchup probabilities), so each stage's time is inclusive.
+STAGES = {
+    'half_inning': ((INNING_SIM, 'simulate_half_inning'),),
+    'at_bat': ((AtBatSimulator, 'simulate_at_bat'),),
+    'matchup_probs': ((AtBatSimulator, 'generate_matchup_probs'),),
+    'outcome_draw': ((AtBatSimulator, 'generate_macro_outcome'),),
+    'pitch_sequence': ((AtBatSimulator, 'generate_modified_sequence'),),
+    'stats_recording': ((StatsManager, 'record_at_bat'), (StatsManager, 'record_pitch')),
+    'pitching_decisions': ((BullpenManager, 'should_change_pitcher'), (BullpenManager, 'change_pitcher')),
+}
+# AtBatFactory.execute_event is timed per kind of event: event_execution.pitch / .micro / .macro
+EVENT_STAGE = "event_execution"
+
+
+class LatencyHistogram:
+    """ Call count, total and a log-bucketed distribution of durations in nanoseconds. """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets: Dict[int, int] = {}
+
+    @staticmethod
+    def bucket(ns: int) -> int:
+        """ Bucket index: the power of two, split into SUB_BUCKETS linear steps. """
+        bits = ns.bit_length()
+        if bits <= 2:
+            return ns
+        return bits * SUB_BUCKETS + ((ns >> (bits - 3)) & (SUB_BUCKETS - 1))
+
+    @staticmethod
+    def upper_bound(index: int) -> int:
+        """ Largest duration (ns) that falls in a bucket. """
+        if index < SUB_BUCKETS:
+            return index
+        bits, step = divmod(index, SUB_BUCKETS)
+        return ((SUB_BUCKETS + step + 1) << (bits - 3)) - 1
+
+    def record(self, ns: int):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        index = self.bucket(ns)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, q: float) -> int:
+        """ Upper bound of the bucket holding the q-th quantile (0..1), capped at the largest value seen. """
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'total_ns': self.total, 'min_ns': self.min or 0, 'max_ns': self.max,
+                'buckets': {str(self.upper_bound(index)): n for index, n in sorted(self.buckets.items())}}
+
+
+def _timed(function, histogram: LatencyHistogram):
+    clock = time.perf_counter_ns
+    record = histogram.record
+
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(clock() - start)
+    return timed
+
+
+class Instrumentation:
+    """
+    Opt-in per-stage timing of the plate-appearance hot path.
+
+    While active (as a context manager), the functions in STAGES and
+    AtBatFactory.execute_event are replaced by timed copies that record into one
+    LatencyHistogram per stage; on exit the originals go back. Nothing is patched
+    outside the block, so a run without instrumentation pays nothing at all. The timers
+    themselves add a little to every stage that contains others.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._saved = []
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        return self.histograms.setdefault(stage, LatencyHistogram())
+
+    def _swap(self, owner, name: str, make):
+        original = owner.__dict__[name]
+        self._saved.append((owner, name, original))
+        if isinstance(original, classmethod):
+            replacement = classmethod(make(original.__func__))
+        elif isinstance(original, staticmethod):
+            replacement = staticmethod(make(original.__func__))
+        else:
+            replacement = make(original)
+        setattr(owner, name, replacement)
+
+    def __enter__(self):
+        for stage, targets in STAGES.items():
+            histogram = self._histogram(stage)
+            for owner, name in targets:
+                self._swap(owner, name, lambda function, h=histogram: _timed(function, h))
+
+        kinds = {type(code): self._histogram(f"{EVENT_STAGE}.{type(code).__name__.lower()}")
+                 for executors in (AtBatFactory.PITCH_EXECUTORS, AtBatFactory.MICRO_EXECUTORS,
+                                   AtBatFactory.MACRO_EXECUTORS) for code in executors}
+
+        def make_execute(function):
+            clock = time.perf_counter_ns
+
+            def execute_event(cls, code, gamestate, token):
+                start = clock()
+                try:
+                    return function(cls, code, gamestate, token)
+                finally:
+                    kinds[type(code)].record(clock() - start)
+            return execute_event
+        self._swap(AtBatFactory, 'execute_event', make_execute)
+        return self
+
+    def __exit__(self, *exc):
+        while self._saved:
+            owner, name, original = self._saved.pop()
+            setattr(owner, name, original)
+        return False
+
+    # ==================== REPORT ====================
+
+    @property
+    def plate_appearances(self) -> int:
+        """ Completed plate appearances (one macro outcome each). """
+        macro = self.histograms.get(f"{EVENT_STAGE}.{Macro.__name__.lower()}")
+        return macro.count if macro else 0
+
+    def breakdown(self) -> List[Dict]:
+        """ One row per stage: calls, calls and microseconds per PA, mean and p50/p90/p99 latency (us). """
+        pa = self.plate_appearances or 1
+        rows = []
+        for stage, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            rows.append({'stage': stage, 'calls': histogram.count, 'calls_per_pa': histogram.count / pa,
+                         'us_per_pa': histogram.total / pa / 1000, 'mean_us': histogram.mean / 1000,
+                         'p50_us': histogram.percentile(0.50) / 1000, 'p90_us': histogram.percentile(0.90) / 1000,
+                         'p99_us': histogram.percentile(0.99) / 1000})
+        return rows
+
+    def report(self) -> str:
+        """ The breakdown as a table. """
+        lines = [f"Per-stage timing over {self.plate_appearances:,} plate appearances (inclusive; stages nest)",
+                 f"{'Stage':<26}{'Calls':>11}{'Calls/PA':>10}{'us/PA':>9}{'Mean us':>9}{'p50':>8}{'p90':>8}{'p99':>8}"]
+        for row in self.breakdown():
+            lines.append(f"{row['stage']:<26}{row['calls']:>11,}{row['calls_per_pa']:>10.2f}{row['us_per_pa']:>9.1f}"
+                         f"{row['mean_us']:>9.2f}{row['p50_us']:>8.1f}{row['p90_us']:>8.1f}{row['p99_us']:>8.1f}")
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        """ Write every histogram (bucket upper bounds in ns) and the PA count as JSON. """
+        with open(path, 'w') as f:
+            json.dump({'plate_appearances': self.plate_appearances,
+                       'stages': {stage: histogram.to_dict() for stage, histogram in self.histograms.items()}},
+                      f, indent=1)
@@ -0,0 +1,186 @@
+import argparse
+import contextlib
+import os
+import time
+import numpy as np
+from typing import List, Optional
+from SEASON import SeasonSimulator, DEFAULT_CHECKPOINT_EVERY, open_results
+from SIMULATION.CHECKPOINT import save_checkpoint, load_checkpoint
+from SIMULATION.EXPORT import FORMATS, monte_carlo_tables, write_table, export_results
+from SIMULATION.STANDINGS import StandingsIndex
+from SIMULATION.TELEMETRY import Telemetry, DEFAULT_INTERVAL as TELEMETRY_INTERVAL
+from SIMULATION.WAREHOUSE import ResultsWarehouse, WAREHOUSE_EXTENSIONS
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+
+
+class MonteCarloRunner:
+    """
+    Plays one schedule as many independent seasons, in memory that does not grow with the
+    number of seasons.
+
+    Every season starts from empty records and stat tables, and games reseed from
+    (seed, season, game number), so season k is the same whether it runs first or ten
+    thousandth. Results stream to disk when `results` is given (ResultWriter, or a
+    ResultsWarehouse for a .db path); the runner itself keeps only running aggregates
+    (a histogram of each club's wins) and one bit per game for who won it, from which
+    `standings_index()` rebuilds day-by-day standings for every season at once.
+    With `checkpoint`, the whole run (aggregates, the season in progress, the results
+    file's length) is saved every `checkpoint_every` games; run(resume=True) continues from
+    there and finishes exactly as an uninterrupted run would.
+    """
+
+    def __init__(self, schedule_csv: str, seasons: int, seed: Optional[int] = None, results: Optional[str] = None,
+                 simulator: Optional[SeasonSimulator] = None, checkpoint: Optional[str] = None,
+                 checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        self.sim = simulator or SeasonSimulator(schedule_csv, keep_results=False)
+        self.seasons = seasons
+        self.seed = seed
+        self.results = results
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.teams = sorted(self.sim.team_records)
+        self._team_index = {abbrev: i for i, abbrev in enumerate(self.teams)}
+
+        games = {abbrev: 0 for abbrev in self.teams}
+        for game in self.sim.schedule:
+            for abbrev in (game['away_team'], game['home_team']):
+                games[abbrev] = games.get(abbrev, 0) + 1
+        self.max_games = max(games.values(), default=0)
+        self.win_counts = np.zeros((len(self.teams), self.max_games + 1), dtype=np.int64)  # [team, wins] -> seasons
+        self.home_wins = np.zeros((seasons, (len(self.sim.schedule) + 7) // 8), dtype=np.uint8)  # [season] -> packed bits
+        self.seasons_done = 0
+
+    def _accumulate(self):
+        wins = np.array([self.sim.team_records[abbrev]['wins'] for abbrev in self.teams])
+        self.win_counts[np.arange(len(self.teams)), wins] += 1
+        self.home_wins[self.seasons_done] = np.packbits(self.sim.home_wins)
+        self.seasons_done += 1
+
+    def state(self) -> dict:
+        """ Aggregates plus the season in progress (SeasonSimulator.state). """
+        return {'seasons_done': self.seasons_done, 'win_counts': self.win_counts.copy(),
+                'home_wins': self.home_wins[:self.seasons_done].copy(), 'season': self.sim.state()}
+
+    def _save(self):
+        save_checkpoint(self.checkpoint, self.state())
+
+    def run_season(self, season: int, resume_state: Optional[dict] = None):
+        """ Play one season (or the rest of a checkpointed one) and fold it into the aggregates. """
+        with StatsManager.isolated():
+            if resume_state is None:
+                self.sim.reset_season(season)
+            else:
+                self.sim.restore(resume_state)
+            self.sim.play_schedule(self.seed, verbose=False, checkpoint=self._save if self.checkpoint else None,
+                                   checkpoint_every=self.checkpoint_every)
+            if isinstance(self.sim.results_writer, ResultsWarehouse):
+                self.sim.results_writer.write_player_lines(season)
+        self._accumulate()
+
+    def run(self, progress_every: int = 100, resume: bool = False) -> List[dict]:
+        """ Play the remaining seasons (from the checkpoint with `resume`); returns `summary()`. """
+        self.sim.initialize(verbose=False)
+        saved = load_checkpoint(self.checkpoint) if self.checkpoint and resume else None
+        in_progress = None
+        if saved is not None:
+            self.seasons_done = saved['seasons_done']
+            self.win_counts = saved['win_counts']
+            self.home_wins[:self.seasons_done] = saved['home_wins']
+            in_progress = saved['season']
+            print(f"Resuming season {self.seasons_done} after game {in_progress['cursor']} from {self.checkpoint}")
+
+        position = in_progress['results_position'] if in_progress else None
+        writer = open_results(self.results, position) if self.results else None
+        self.sim.results_writer = writer
+        start_time = time.time()
+        first = self.seasons_done
+        try:
+            for season in range(self.seasons_done, self.seasons):
+                self.run_season(season, in_progress)
+                in_progress = None
+                if progress_every and self.seasons_done % progress_every == 0:
+                    elapsed = time.time() - start_time
+                    rate = (self.seasons_done - first) / elapsed if elapsed > 0 else 0
+                    print(f"--- {self.seasons_done}/{self.seasons} seasons ({rate:.2f} seasons/sec) ---")
+        finally:
+            self.sim.results_writer = None
+            if writer is not None:
+                writer.close()
+        return self.summary()
+
+    def summary(self) -> List[dict]:
+        """ Per-club win distribution over the seasons played so far (mean, sd, 10th/90th percentile). """
+        wins = np.arange(self.max_games + 1)
+        out = []
+        for i, abbrev in enumerate(self.teams):
+            counts = self.win_counts[i]
+            n = counts.sum()
+            if n == 0:
+                continue
+            mean = float((counts * wins).sum() / n)
+            sd = float(np.sqrt((counts * (wins - mean) ** 2).sum() / n))
+            cdf = np.cumsum(counts) / n
+            out.append({'team': abbrev, 'mean_wins': mean, 'sd_wins': sd,
+                        'p10_wins': int(np.searchsorted(cdf, 0.10)), 'p90_wins': int(np.searchsorted(cdf, 0.90))})
+        return out
+
+    def standings_index(self, seasons: Optional[slice] = None) -> StandingsIndex:
+        """ Cumulative W-L by schedule day for the finished seasons (or a slice of them), all built in one pass. """
+        packed = self.home_wins[:self.seasons_done]
+        if seasons is not None:
+            packed = packed[seasons]
+        home_wins = np.unpackbits(packed, axis=1, count=len(self.sim.schedule)).astype(bool)
+        return StandingsIndex.build(self.sim.schedule, {abbrev: info['league'] for abbrev, info in self.sim.team_info.items()},
+                                    home_wins)
+
+    def export(self, directory: str, fmt: str = "parquet"):
+        """ Write the aggregates (summary, wins) and the streamed results as Parquet, Arrow IPC or .npz. """
+        os.makedirs(directory, exist_ok=True)
+        extension = next(ext for ext, name in FORMATS.items() if name == fmt)
+        for name, table in monte_carlo_tables(self).items():
+            write_table(table, os.path.join(directory, f"{name}{extension}"), fmt)
+        if self.results and not isinstance(self.sim.results_writer, ResultsWarehouse) and \
+                not self.results.lower().endswith(WAREHOUSE_EXTENSIONS):
+            export_results(self.results, os.path.join(directory, f"results{extension}"), fmt)
+
+
+def main():
+    """ Entry point: python -m SIMULATION.MONTE_CARLO GAME_DATA/SCHEDULE.csv --seasons 10000 --results RESULTS_MC """
+    parser = argparse.ArgumentParser(description="Simulate many seasons of one schedule")
+    parser.add_argument("schedule", help="Schedule CSV")
+    parser.add_argument("--seasons", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--results", help="Stream every game to this .csv file, SQLite .db or column directory")
+    parser.add_argument("--checkpoint", help="Save progress to this file periodically")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY, help="Games between saves")
+    parser.add_argument("--resume", action="store_true", help="Continue from --checkpoint")
+    parser.add_argument("--export", help="Directory to write aggregates (and results) to as tables")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())), default="parquet")
+    parser.add_argument("--standings", help="Save the day-by-day standings of every season to this .npz")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve live telemetry as Prometheus text on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-json", help="Rewrite live telemetry to this JSON file")
+    parser.add_argument("--metrics-interval", type=float, default=TELEMETRY_INTERVAL, help="Seconds between samples")
+    args = parser.parse_args()
+
+    runner = MonteCarloRunner(args.schedule, args.seasons, args.seed, args.results,
+                              checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every)
+    telemetry = None
+    if args.metrics_port is not None or args.metrics_json:
+        telemetry = Telemetry(args.metrics_port, args.metrics_json, args.metrics_interval)
+        runner.sim.attach_telemetry(telemetry)
+    with telemetry if telemetry is not None else contextlib.nullcontext():
+        if telemetry is not None and telemetry.port is not None:
+            print(f"Telemetry on http://127.0.0.1:{telemetry.port}/metrics")
+        summary = runner.run(resume=args.resume)
+    print(f"{'Team':<6}{'Wins':>8}{'SD':>7}{'P10':>6}{'P90':>6}")
+    for row in sorted(summary, key=lambda r: -r['mean_wins']):
+        print(f"{row['team']:<6}{row['mean_wins']:>8.1f}{row['sd_wins']:>7.1f}{row['p10_wins']:>6}{row['p90_wins']:>6}")
+    if args.export:
+        runner.export(args.export, args.format)
+    if args.standings:
+        runner.standings_index().save(args.standings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import math
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from SIMULATION.BATCH_SIM import simulate_chunk, init_worker, DEFAULT_CHUNK_SIZE
+from UTILITIES.STAT_TESTS import StatTests
+
+DEFAULT_MIN_BATCH = 200
+DEFAULT_MAX_GAMES = 100000
+INTERVAL_METHODS = ("wilson", "bayes")
+
+
+class PrecisionTracker:
+    """
+    Running win-rate and run-differential estimates for one matchup, with a stopping rule.
+
+    Wins are counted for one side (home by default when fed GAME_DTYPE batches through
+    `update`); the run differential is that side's runs minus the opponent's.
+    """
+
+    def __init__(self, win_margin: float = 0.005, run_diff_margin: Optional[float] = None,
+                 confidence: float = 0.95, method: str = "wilson",
+                 min_batch: int = DEFAULT_MIN_BATCH, max_games: int = DEFAULT_MAX_GAMES):
+        """
+        Args:
+            win_margin: Target half-width of the win-probability interval (0.005 = +/-0.5%)
+            run_diff_margin: Target half-width of the mean run-differential interval (None = ignore)
+            confidence: Interval confidence level
+            method: "wilson" (score interval) or "bayes" (Beta(1, 1) posterior, normal approximation)
+            min_batch: Smallest batch `next_batch` will ask for
+            max_games: Hard cap; the tracker reports done once it is reached
+        """
+        if method not in INTERVAL_METHODS:
+            raise ValueError(f"method must be one of {INTERVAL_METHODS}")
+        self.win_margin = win_margin
+        self.run_diff_margin = run_diff_margin
+        self.confidence = confidence
+        self.method = method
+        self.min_batch = min_batch
+        self.max_games = max_games
+        self.z = StatTests.z_score(confidence)
+
+        self.games = 0
+        self.wins = 0
+        self.diff_sum = 0.0
+        self.diff_sq_sum = 0.0
+
+    # ==================== UPDATES ====================
+
+    def add(self, wins: int, games: int, diff_sum: float = 0.0, diff_sq_sum: float = 0.0):
+        """ Fold in pre-aggregated batch totals (e.g. returned by a worker). """
+        self.wins += wins
+        self.games += games
+        self.diff_sum += diff_sum
+        self.diff_sq_sum += diff_sq_sum
+
+    def update(self, results: np.ndarray, side: str = "home"):
+        """ Fold in a GAME_DTYPE batch, counting wins and run differential for `side`. """
+        other = "away" if side == "home" else "home"
+        diff = results[f'{side}_runs'].astype(np.int32) - results[f'{other}_runs']
+        self.add(int((diff > 0).sum()), len(results), float(diff.sum()), float((diff * diff).sum()))
+
+    # ==================== ESTIMATES ====================
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.5
+
+    def win_interval(self):
+        """ Interval for the win probability using the configured method. """
+        if self.games == 0:
+            return 0.0, 1.0
+        if self.method == "wilson":
+            return StatTests.wilson_interval(self.wins, self.games, self.confidence)
+        a, b = 1 + self.wins, 1 + self.games - self.wins
+        mean = a / (a + b)
+        sd = math.sqrt(a * b / ((a + b) ** 2 * (a + b + 1)))
+        return max(mean - self.z * sd, 0.0), min(mean + self.z * sd, 1.0)
+
+    @property
+    def run_diff(self) -> float:
+        return self.diff_sum / self.games if self.games else 0.0
+
+    def run_diff_sd(self) -> float:
+        """ Sample standard deviation of the per-game run differential. """
+        if self.games < 2:
+            return float("inf")
+        variance = (self.diff_sq_sum - self.diff_sum ** 2 / self.games) / (self.games - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def run_diff_interval(self):
+        """ Normal interval for the mean run differential. """
+        half = self.z * self.run_diff_sd() / math.sqrt(self.games) if self.games else float("inf")
+        return self.run_diff - half, self.run_diff + half
+
+    # ==================== STOPPING ====================
+
+    @property
+    def precise(self) -> bool:
+        """ Every requested interval is within its margin. """
+        if self.games == 0:
+            return False
+        lo, hi = self.win_interval()
+        if (hi - lo) / 2 > self.win_margin:
+            return False
+        if self.run_diff_margin is not None:
+            lo, hi = self.run_diff_interval()
+            return (hi - lo) / 2 <= self.run_diff_margin
+        return True
+
+    @property
+    def done(self) -> bool:
+        return self.games >= self.max_games or self.precise
+
+    def next_batch(self) -> int:
+        """
+        Games to simulate next: a normal-approximation estimate of what is still needed to
+        reach every target, at least `min_batch` and never past `max_games`.
+        """
+        remaining = self.max_games - self.games
+        if self.games == 0:
+            return min(self.min_batch, remaining)
+
+        p = min(max(self.win_rate, 0.05), 0.95)
+        needed = self.z * self.z * p * (1 - p) / self.win_margin ** 2
+        if self.run_diff_margin is not None:
+            needed = max(needed, (self.z * self.run_diff_sd() / self.run_diff_margin) ** 2)
+        return min(max(int(math.ceil(needed)) - self.games, self.min_batch), remaining)
+
+    def summary(self) -> dict:
+        win_lo, win_hi = self.win_interval()
+        diff_lo, diff_hi = self.run_diff_interval()
+        return {"games": self.games, "win_pct": self.win_rate, "win_low": win_lo, "win_high": win_hi,
+                "run_diff": self.run_diff, "run_diff_low": diff_lo, "run_diff_high": diff_hi,
+                "converged": self.precise}
+
+
+def simulate_until_precision(away_abbrev: str, home_abbrev: str, win_margin: float = 0.005,
+                             run_diff_margin: Optional[float] = None, confidence: float = 0.95,
+                             method: str = "wilson", seed=None, workers: int = 1,
+                             min_batch: int = DEFAULT_MIN_BATCH, max_games: int = DEFAULT_MAX_GAMES,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Simulate AWAY @ HOME in growing batches until the home win probability (and, if asked,
+    the mean run differential) is known to the requested precision.
+
+    Games are numbered the same way as `simulate_matchups` on a single pair, so a seeded run
+    returns exactly the first N games a fixed-size run with that seed would.
+
+    Returns:
+        (summary dict from PrecisionTracker, GAME_DTYPE array of every simulated game)
+    """
+    tracker = PrecisionTracker(win_margin, run_diff_margin, confidence, method, min_batch, max_games)
+    away_abbrev, home_abbrev = away_abbrev.upper(), home_abbrev.upper()
+    batches = []
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker) if workers > 1 else None
+    try:
+        while not tracker.done:
+            count = tracker.next_batch()
+            if pool is None:
+                batch = simulate_chunk(away_abbrev, home_abbrev, tracker.games, count, seed)
+            else:
+                starts = range(tracker.games, tracker.games + count, chunk_size)
+                end = tracker.games + count
+                futures = [pool.submit(simulate_chunk, away_abbrev, home_abbrev, start,
+                                       min(chunk_size, end - start), seed) for start in starts]
+                batch = np.concatenate([future.result() for future in futures])
+            tracker.update(batch)
+            batches.append(batch)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return tracker.summary(), np.concatenate(batches)
+
+
+def main():
+    """ Entry point: python -m SIMULATION.PRECISION PIT WAS --margin 0.005 """
+    parser = argparse.ArgumentParser(description="Simulate a matchup until its win probability is precise enough")
+    parser.add_argument("away")
+    parser.add_argument("home")
+    parser.add_argument("--margin", type=float, default=0.005, help="Win-probability half-width (0.005 = +/-0.5%%)")
+    parser.add_argument("--run-diff-margin", type=float, default=None, help="Run-differential half-width")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--method", choices=INTERVAL_METHODS, default="wilson")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-games", type=int, default=DEFAULT_MAX_GAMES)
+    args = parser.parse_args()
+
+    summary, _ = simulate_until_precision(args.away, args.home, args.margin, args.run_diff_margin,
+                                          args.confidence, args.method, args.seed, args.workers,
+                                          max_games=args.max_games)
+    print(f"{args.away.upper()} @ {args.home.upper()}: {summary['games']:,} games")
+    print(f"  Home win %:  {summary['win_pct']:.4f}  [{summary['win_low']:.4f}, {summary['win_high']:.4f}]")
+    print(f"  Run diff:    {summary['run_diff']:+.3f}  [{summary['run_diff_low']:+.3f}, {summary['run_diff_high']:+.3f}]")
+    if not summary["converged"]:
+        print("  Stopped at max games before reaching the requested precision")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from typing import Callable, Dict, Tuple
+
+PROFILERS = ("cprofile", "sample")
+DEFAULT_OUT = os.path.join("GAME_DATA", "PROFILE", "profile")
+DEFAULT_TOP = 25
+DEFAULT_INTERVAL = 0.001    # Seconds between stack samples
+MAX_STACK_DEPTH = 64
+MIN_STACK_SHARE = 1e-5      # Call-graph stacks below this share of the run are dropped from the .folded output
+
+
+def _frame_name(filename: str, lineno: int, name: str) -> str:
+    if filename == "~":  # Built-ins
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+# ==================== COLLAPSED STACKS ====================
+
+def write_collapsed(stacks: Dict[str, float], path: str):
+    """ Write stacks in collapsed form ("outer;inner;leaf count" per line) for flamegraph.pl / speedscope. """
+    with open(path, 'w') as f:
+        for stack, weight in sorted(stacks.items()):
+            if round(weight) > 0:
+                f.write(f"{stack} {round(weight)}\n")
+
+
+def collapsed_from_stats(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Collapsed stacks (weights in microseconds of self time) rebuilt from cProfile's call graph.
+
+    cProfile keeps caller -> callee edges, not whole stacks, so a function reached from
+    several callers has its time split between them in proportion to each edge's share;
+    exact for call trees, an estimate where paths merge.
+    """
+    table = stats.stats
+    children = {}
+    for function, (_, _, _, _, callers) in table.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((function, edge[3]))
+    roots = [function for function, row in table.items() if not row[4]]
+    floor = MIN_STACK_SHARE * sum(table[root][3] for root in roots)
+    out = {}
+
+    def walk(function, path: Tuple[str, ...], seen: frozenset, share: float):
+        inclusive = table[function][3]
+        scale = share / inclusive if inclusive else 0.0
+        path = path + (_frame_name(*function),)
+        stack = ";".join(path)
+        out[stack] = out.get(stack, 0.0) + table[function][2] * scale * 1e6
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for child, edge_time in children.get(function, ()):
+            if child not in seen and edge_time * scale >= floor:
+                walk(child, path, seen | {child}, edge_time * scale)
+
+    for root in roots:
+        walk(root, (), frozenset((root,)), table[root][3])
+    return out
+
+
+class SamplingProfiler:
+    """
+    Samples the calling thread's Python stack every `interval` seconds from a background
+    thread; `stacks` counts each distinct stack (outermost frame first, ';'-joined).
+    The interpreter's thread switch interval is lowered to match while sampling, or the
+    sampler would only get the GIL every 5 ms.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._switch_interval = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(_frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if names:
+                stack = ";".join(reversed(names))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        return False
+
+    def top(self, count: int = DEFAULT_TOP) -> str:
+        """ Functions with the most samples on top of the stack (self time). """
+        leaves = {}
+        for stack, samples in self.stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + samples
+        total = sum(leaves.values()) or 1
+        lines = [f"{'Self %':>7}{'Samples':>9}  Function"]
+        for leaf, samples in sorted(leaves.items(), key=lambda item: -item[1])[:count]:
+            lines.append(f"{100 * samples / total:>6.1f}%{samples:>9}  {leaf}")
+        return "\n".join(lines)
+
+
+# ==================== ENTRY POINTS ====================
+
+@contextlib.contextmanager
+def profiled(kind: str = "cprofile", out: str = DEFAULT_OUT, top: int = DEFAULT_TOP,
+             interval: float = DEFAULT_INTERVAL):
+    """
+    Profile the block and write flamegraph-ready output next to `out`:
+    cprofile -> <out>.prof (pstats) and <out>.folded (from the call graph);
+    sample   -> <out>.folded (sampled stacks).
+    The top `top` functions are printed when the block ends.
+    """
+    if kind not in PROFILERS:
+        raise ValueError(f"kind must be one of {PROFILERS}")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+
+    if kind == "sample":
+        sampler = SamplingProfiler(interval)
+        with sampler:
+            yield sampler
+        write_collapsed(sampler.stacks, out + ".folded")
+        print(f"\nSampled {sum(sampler.stacks.values()):,} stacks -> {out}.folded")
+        print(sampler.top(top))
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+    profiler.dump_stats(out + ".prof")
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    write_collapsed(collapsed_from_stats(stats), out + ".folded")
+    stats.sort_stats("cumulative").print_stats(top)
+    print(f"\nProfile written to {out}.prof (pstats) and {out}.folded (collapsed stacks)")
+    print(text.getvalue())
+
+
+@contextlib.contextmanager
+def allocation_sites(games: Callable[[], int], top: int = DEFAULT_TOP, frames: int = 1):
+    """
+    Trace allocations in the block with tracemalloc and print the `top` source lines by
+    memory still held at the end, per game played (`games()` is read when the block ends),
+    with the traced peak. Sites that allocate and free within a game show up only in the peak.
+    """
+    tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        yield
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    played = max(games(), 1)
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+    print(f"\nTop {top} allocation sites, memory held per game over {played} game(s) (traced peak {peak / 2**20:.1f} MiB)")
+    print(f"{'KiB/game':>10}{'Blocks/game':>13}  Site")
+    for stat in sorted(diff, key=lambda s: -s.size_diff)[:top]:
+        frame = stat.traceback[0]
+        print(f"{stat.size_diff / 1024 / played:>10.2f}{stat.count_diff / played:>13.1f}  {frame.filename}:{frame.lineno}")
@@ -0,0 +1,260 @@
+import os
+import pickle
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from ATBAT.ATBAT_FACTORY import AtBatFactory
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from GAME_LOGIC.BASESTATE import BaseState
+from CONTEXT.GAME_CONTEXT import GameContext
+from CONTEXT.REPLAY_CONTEXT import PACheckpoint
+from GAME_LOGIC.GAMESTATE import GameState
+from GAMEDAY import setup_game, run_game
+from SIMULATION.BATCH_SIM import init_worker, get_team
+from SIMULATION.EVENT_LOG import EventStore, FIRST_MACRO
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import InningHalf, Macro
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed, stream_state, restore_stream_state
+
+DEFAULT_PA_EVERY = 10     # Plate appearances between in-game checkpoints
+
+
+class _Pause(Exception):
+    """ Raised from inside the engine to stop a game just before a plate appearance. """
+
+
+class _PAHook:
+    """
+    Counts plate appearances the way EventLog does (one per executed macro event) and,
+    at the start of each one, records checkpoints or stops the game. Installed inside a
+    `with` block by swapping AtBatSimulator.simulate_at_bat and AtBatFactory.execute_event.
+    """
+
+    def __init__(self, replayer: 'GameReplayer', game: int, ctx: GameContext, pa: int = 0,
+                 stop: Optional[int] = None):
+        self.replayer = replayer
+        self.game = game
+        self.ctx = ctx
+        self.pa = pa
+        self.stop = stop
+        self._saved = None
+        self._simulate = None
+        self._execute = None
+
+    def _at_bat(self, gamestate, token):
+        pa = self.pa
+        self.replayer._capture(self.game, pa, self.ctx)
+        if pa == self.stop:
+            raise _Pause
+        return self._simulate(gamestate, token)
+
+    def _execute_event(self, code, gamestate, token):
+        result = self._execute(code, gamestate, token)
+        if code.__class__ is Macro:
+            self.pa += 1
+        return result
+
+    def __enter__(self):
+        self._saved = AtBatSimulator.__dict__['simulate_at_bat'], AtBatFactory.__dict__['execute_event']
+        self._simulate, self._execute = AtBatSimulator.simulate_at_bat, AtBatFactory.execute_event
+        AtBatSimulator.simulate_at_bat = self._at_bat
+        AtBatFactory.execute_event = self._execute_event
+        return self
+
+    def __exit__(self, *exc):
+        AtBatSimulator.simulate_at_bat, AtBatFactory.execute_event = self._saved
+        return exc[0] is _Pause
+
+
+class GameReplayer:
+    """
+    Deterministic replay of a seeded run of one matchup, down to a single plate appearance.
+
+    Games are replayed as SIMULATION.BATCH_SIM.simulate_chunk plays them with the same seed
+    and stream: each in its own empty stat tables, with its streams reseeded from
+    (seed, stream, game). A game is therefore rebuilt from its key alone, without playing
+    the games before it. Every game replayed keeps a checkpoint every `pa_every` plate
+    appearances, so reaching PA 60 of game 1,200 plays that game up to PA 60 the first
+    time and restores a snapshot after that.
+
+        replayer = GameReplayer("NYY", "BOS", seed=7)
+        with replayer.at(1200, 60) as game:
+            game.gamestate.bases          # state before PA 60
+            run_game(game, resume=True)   # ... and the rest of the game, bit for bit
+    """
+
+    def __init__(self, away_abbrev: str, home_abbrev: str, seed: int, stream: int = 0,
+                 pa_every: int = DEFAULT_PA_EVERY, teams=None):
+        if teams is None:
+            init_worker()
+            teams = (get_team(away_abbrev.upper()), get_team(home_abbrev.upper()))
+        self.away_team, self.home_team = teams
+        self.seed = seed
+        self.stream = stream
+        self.pa_every = pa_every
+        self.pa_checkpoints: Dict[int, Dict[int, PACheckpoint]] = {}
+        self._recording = None  # PA checkpoints of the game being played
+
+    def key(self, game: int) -> int:
+        """ Stream key of a game (as stored in the event log's games table). """
+        return derive_seed(self.seed, self.stream, game)
+
+    # ==================== CHECKPOINTS ====================
+
+    def _capture(self, game: int, pa: int, ctx: GameContext):
+        """ Called at the start of every replayed plate appearance. """
+        if self._recording is not None and pa % self.pa_every == 0 and pa not in self._recording:
+            self._recording[pa] = PACheckpoint(game, pa, ctx.snapshot(), stream_state())
+
+    def _play(self, game: int, ctx: Optional[GameContext] = None, pa: int = 0, stop: Optional[int] = None):
+        """ Play (or continue) a game; returns the context, stopped before PA `stop` if given. """
+        if ctx is None:
+            reseed_streams(self.key(game))
+            ctx = setup_game(self.away_team, self.home_team)
+        self._recording = self.pa_checkpoints.setdefault(game, {})
+        try:
+            with _PAHook(self, game, ctx, pa, stop) as hook:
+                run_game(ctx, resume=pa > 0)
+        finally:
+            self._recording = None
+        if stop is not None and hook.pa != stop:
+            raise ValueError(f"Game {game} ended after {hook.pa} plate appearances (asked for PA {stop})")
+        return ctx
+
+    # ==================== REPLAY ====================
+
+    @contextmanager
+    def at(self, game: int, pa: int = 0):
+        """
+        Yield game `game` stopped just before plate appearance `pa`, with the random streams
+        and the game's pitcher lines exactly as the original run had them there. Continue it
+        with run_game(game, resume=True). Stats are isolated: the caller's tables are untouched.
+        """
+        seed_random(self.seed)  # Pools built from the seed (rewound if already built)
+        with StatsManager.isolated():
+            saved = self.pa_checkpoints.get(game, {})
+            nearest = max((p for p in saved if p <= pa), default=None)
+            if nearest is None:
+                ctx = self._play(game, stop=pa)
+            else:
+                checkpoint = saved[nearest]
+                ctx = GameContext.from_snapshot(checkpoint.snapshot, self.away_team, self.home_team)
+                restore_stream_state(checkpoint.streams)
+                if nearest < pa:
+                    ctx = self._play(game, ctx, nearest, stop=pa)
+            yield ctx
+
+    def play(self, game: int, event_log=None) -> GameContext:
+        """ Replay a whole game (optionally into an EventLog) and return the finished context. """
+        with self.at(game) as ctx:
+            if event_log is not None:
+                event_log.start_game(game, self.key(game))
+            run_game(ctx)
+        return ctx
+
+    def checkpoints(self, game: int) -> List[PACheckpoint]:
+        """ In-game checkpoints recorded so far for a game, in PA order. """
+        return [self.pa_checkpoints[game][pa] for pa in sorted(self.pa_checkpoints.get(game, {}))]
+
+    def save(self, path: str):
+        """ Write every checkpoint (atomically) so a later process can jump straight to them. """
+        state = {'away': self.away_team.abbreviation, 'home': self.home_team.abbreviation,
+                 'seed': self.seed, 'stream': self.stream, 'pa_every': self.pa_every,
+                 'pas': self.pa_checkpoints}
+        with open(path + ".tmp", 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str, teams=None) -> 'GameReplayer':
+        """ Rebuild a replayer from `save` output (pools must be built the same way as the original run). """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        replayer = cls(state['away'], state['home'], state['seed'], state['stream'], state['pa_every'], teams)
+        replayer.pa_checkpoints.update(state['pas'])
+        return replayer
+
+
+class LogReplay:
+    """
+    State before any plate appearance of a logged game, rebuilt from the event log alone.
+
+    The log records each event's inning, half, outs, base occupancy, batter and pitcher,
+    runs and outs, so situations and scores replay exactly. Runner identities are not
+    logged: `gamestate` puts the team's most recent batters on the occupied bases as
+    stand-ins. Use GameReplayer with the game's stream key for an exact continuation.
+    """
+
+    def __init__(self, store: EventStore, game_id: int):
+        self.store = store
+        self.game_id = game_id
+        start, stop = store.game_range(game_id)
+        if start == stop:
+            raise KeyError(f"Game {game_id} not in {store.path}")
+        self.events = store.records(start, stop)
+        entry = int(np.flatnonzero(np.asarray(store.games['game_id']) == game_id)[0])
+        self.key = int(store.games['key'][entry])
+        self.away_abbrev = bytes(store.games['away'][entry]).decode().strip()
+        self.home_abbrev = bytes(store.games['home'][entry]).decode().strip()
+
+        # Score before every event: runs from earlier events in each half
+        runs = self.events['runs'].astype(np.int32)
+        bottom = self.events['half'].astype(bool)
+        self._away = np.cumsum(np.where(bottom, 0, runs)) - np.where(bottom, 0, runs)
+        self._home = np.cumsum(np.where(bottom, runs, 0)) - np.where(bottom, runs, 0)
+
+    @property
+    def plate_appearances(self) -> int:
+        return int(np.count_nonzero(self.events['opcode'] >= FIRST_MACRO))
+
+    def pa_start(self, pa: int) -> int:
+        """ Offset (within the game) of the first event of plate appearance `pa`. """
+        i = int(np.searchsorted(self.events['pa'], pa, 'left'))
+        if i == len(self.events) or self.events['pa'][i] != pa:
+            raise IndexError(f"Game {self.game_id} has no plate appearance {pa}")
+        return i
+
+    def state(self, pa: int) -> dict:
+        """ Inning, half, outs, bases (code: 1st = 1, 2nd = 2, 3rd = 4), score and matchup before `pa`. """
+        i = self.pa_start(pa)
+        event = self.events[i]
+        return {'inning': int(event['inning']), 'half': InningHalf.BOT if event['half'] else InningHalf.TOP,
+                'outs': int(event['outs']), 'bases': int(event['bases']),
+                'away_score': int(self._away[i]), 'home_score': int(self._home[i]),
+                'batter': int(event['batter']), 'pitcher': int(event['pitcher'])}
+
+    def _player(self, index: int, team) -> Optional[object]:
+        row = self.store.players[index]
+        return next((p for p in team.batters + team.pitchers if p.player_id == int(row['player_id'])), None)
+
+    def gamestate(self, pa: int, away_team, home_team) -> GameState:
+        """ A GameState in the situation before `pa` (stand-in runners, see class notes). """
+        i = self.pa_start(pa)
+        state = self.state(pa)
+        gs = GameState(away_team, home_team)
+        gs.current_inning = state['inning']
+        gs.inninghalf = state['half']
+        top = state['half'] == InningHalf.TOP
+        batting = away_team if top else home_team
+        gs.batting_team = batting
+        gs.fielding_team = gs.pitching_team = home_team if top else away_team
+        gs.outs = state['outs']
+
+        # Stand-in runners: this half-inning's latest distinct batters, most recent on the lowest base
+        events = self.events[:i]
+        in_half = (events['inning'] == state['inning']) & (events['half'] == (not top))
+        recent = []
+        for index in events['batter'][in_half][::-1]:
+            player = self._player(int(index), batting)
+            if player is not None and player not in recent:
+                recent.append(player)
+        runners = iter(recent)
+        gs.bases = BaseState(*(next(runners, None) if state['bases'] & bit else None for bit in (1, 2, 4)))
+
+        gs.away_score, gs.home_score = state['away_score'], state['home_score']
+        for side, half, played in (('away_team', 0, gs.current_inning), ('home_team', 1, gs.current_inning - top)):
+            mask = events['half'] == half
+            line = np.bincount(events['inning'][mask], weights=events['runs'][mask], minlength=played + 1)
+            gs.stats[side]['score'] = state['away_score' if half == 0 else 'home_score']
+            gs.stats[side]['score_by_inning'] = [int(runs) for runs in line[1:played + 1]]
+        return gs
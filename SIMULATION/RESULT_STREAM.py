@@ -0,0 +1,192 @@
+import csv
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from typing import Optional
+from SIMULATION.EVENT_LOG import _ColumnWriter, _read_columns
+
+DEFAULT_BATCH_ROWS = 4096
+DEFAULT_MAX_BATCHES = 16  # Batches queued for the writer before producers block
+RESULTS_FORMAT = 1
+
+# One row per simulated game
+RESULT_DTYPE = np.dtype([
+    ('season', np.uint32),
+    ('game_num', np.uint32),
+    ('day', np.uint16),
+    ('away_team', 'S4'),
+    ('home_team', 'S4'),
+    ('away_score', np.int16),
+    ('home_score', np.int16),
+])
+RESULT_FIELDS = RESULT_DTYPE.names
+
+_STOP = object()
+
+
+class _CsvSink:
+    """ Writes batches to a CSV file after a header. Positions are byte offsets. """
+
+    def __init__(self, path: str, position: Optional[int] = None):
+        if position is None:
+            self.file = open(path, 'w', newline='')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(RESULT_FIELDS)
+        else:
+            with open(path, 'r+b') as f:
+                f.truncate(position)
+            self.file = open(path, 'a', newline='')
+            self.writer = csv.writer(self.file)
+
+    def write(self, batch: list):
+        self.writer.writerows(batch)
+
+    def flush(self):
+        self.file.flush()
+
+    def position(self) -> int:
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class _ColumnSink:
+    """ Appends batches to one binary file per column (as EventLog does) plus meta.json. Positions are rows. """
+
+    def __init__(self, path: str, position: Optional[int] = None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.columns = _ColumnWriter(path, "results", RESULT_DTYPE, rows=position or 0)
+
+    def write(self, batch: list):
+        chunk = np.empty(len(batch), dtype=RESULT_DTYPE)
+        for name, values in zip(RESULT_FIELDS, zip(*batch)):
+            chunk[name] = values
+        self.columns.write(chunk)
+
+    def flush(self):
+        self.columns.flush()
+        with open(os.path.join(self.path, "meta.json.tmp"), 'w') as f:
+            json.dump({"format": RESULTS_FORMAT, "rows": self.columns.rows}, f)
+        os.replace(os.path.join(self.path, "meta.json.tmp"), os.path.join(self.path, "meta.json"))
+
+    def position(self) -> int:
+        return self.columns.rows
+
+    def close(self):
+        self.flush()
+        self.columns.close()
+
+
+class ResultWriter:
+    """
+    Streams game results to disk from a background thread.
+
+    Rows (tuples in RESULT_FIELDS order) are staged into batches; full batches go through a
+    bounded queue to the writer thread, so the simulation never waits on the disk unless
+    the writer falls `max_batches` behind, and memory stays constant however many games
+    are written. A path ending in .csv is written as CSV; any other path is a directory of
+    per-column binary files (read back with `read_results`). Everything written is flushed
+    after each batch, so a crash loses at most the rows still queued; `resume` with a
+    `position()` taken earlier discards anything written after it and appends from there.
+    """
+
+    def __init__(self, path: str, batch_rows: int = DEFAULT_BATCH_ROWS, max_batches: int = DEFAULT_MAX_BATCHES,
+                 resume: Optional[int] = None):
+        self.path = path
+        self.columnar = not path.lower().endswith(".csv")
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self.busy_seconds = 0.0  # Writer thread time spent writing (for telemetry)
+        self._batch = []
+        self._queue = queue.Queue(maxsize=max_batches)
+        self._error: Optional[BaseException] = None
+        self._sink = _ColumnSink(path, resume) if self.columnar else _CsvSink(path, resume)
+        self._thread = threading.Thread(target=self._run, name="ResultWriter", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is _STOP:
+                    return
+                if self._error is None:
+                    start = time.perf_counter()
+                    self._sink.write(batch)
+                    self._sink.flush()
+                    self.busy_seconds += time.perf_counter() - start
+            except BaseException as e:  # Surfaced in the producer on its next call
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _check(self):
+        if self._error is not None:
+            raise RuntimeError(f"Result writer for {self.path} failed") from self._error
+
+    def write(self, row: tuple):
+        """ Queue one result row (season, game_num, day, away_team, home_team, away_score, home_score). """
+        self._batch.append(row)
+        self.rows += 1
+        if len(self._batch) >= self.batch_rows:
+            self._check()
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def queue_depth(self) -> int:
+        """ Full batches waiting for the writer thread. """
+        return self._queue.qsize()
+
+    def flush(self):
+        """ Hand over the partial batch and wait until everything queued is on disk. """
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+        self._queue.join()
+        self._check()
+
+    def position(self) -> int:
+        """ Flush, then report where the output ends (pass to `resume` to continue from here). """
+        self.flush()
+        return self._sink.position()
+
+    def close(self):
+        if self._thread.is_alive():
+            self.flush()
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._sink.close()
+        self._check()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def read_results(path: str) -> np.ndarray:
+    """ Results written by ResultWriter as a RESULT_DTYPE array (columns memory-mapped, then gathered). """
+    if path.lower().endswith(".csv"):
+        with open(path, newline='') as f:
+            rows = [tuple(row) for row in csv.reader(f)][1:]
+        out = np.empty(len(rows), dtype=RESULT_DTYPE)
+        for name, values in zip(RESULT_FIELDS, zip(*rows)):
+            out[name] = values
+        return out
+
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"Unsupported results format in {path}: {meta.get('format')}")
+    columns = _read_columns(path, "results", RESULT_DTYPE, meta["rows"])
+    out = np.empty(meta["rows"], dtype=RESULT_DTYPE)
+    for name, column in columns.items():
+        out[name] = column
+    return out
@@ -0,0 +1,127 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+class StandingsIndex:
+    """
+    Cumulative standings by schedule day, so the table on any date is a lookup rather than
+    a re-scan of the results.
+
+    `wins[season, day, team]` is a club's win total through the end of `day` (day 0 is
+    before opening day) and `games[day, team]` its games played by then, which the schedule
+    fixes for every season; losses are the difference. `totals[team]` is the full season's
+    games, for magic numbers. Built once per season (or for all seasons of a Monte Carlo
+    run at once) from the schedule and which games the home club won, with a cumulative
+    sum per club.
+    """
+
+    def __init__(self, teams: Sequence[str], leagues: Sequence[str], wins: np.ndarray, games: np.ndarray,
+                 totals: np.ndarray):
+        self.teams = list(teams)
+        self.leagues = np.asarray(leagues, dtype=str)
+        self.wins = wins          # [season, day, team]
+        self.games = games        # [day, team]
+        self.totals = totals      # [team]
+        self.days = games.shape[0] - 1
+        self.seasons = wins.shape[0]
+        self.team_index = {abbrev: i for i, abbrev in enumerate(self.teams)}
+        self._same_league = self.leagues[:, None] == self.leagues[None, :]
+
+    @classmethod
+    def build(cls, schedule: List[dict], team_leagues: Dict[str, str], home_wins: np.ndarray,
+              played: Optional[int] = None) -> 'StandingsIndex':
+        """
+        Index the schedule's games given who won them.
+
+        Args:
+            schedule: SeasonSimulator.schedule rows ('day', 'away_team', 'home_team')
+            team_leagues: League of every club, by abbreviation
+            home_wins: Home club won each scheduled game, shape (games,) for one season or
+                (seasons, games) for many
+            played: Only the first `played` scheduled games count (a season in progress)
+
+        Returns:
+            StandingsIndex over every season given
+        """
+        teams = sorted(team_leagues)
+        team_index = {abbrev: i for i, abbrev in enumerate(teams)}
+        day = np.array([game['day'] for game in schedule], dtype=np.int64)
+        away = np.array([team_index[game['away_team']] for game in schedule], dtype=np.int64)
+        home = np.array([team_index[game['home_team']] for game in schedule], dtype=np.int64)
+        days = int(day.max(initial=0))
+        through = np.arange(days + 1)
+        totals = (np.bincount(away, minlength=len(teams)) + np.bincount(home, minlength=len(teams))).astype(np.int16)
+        if played is not None:
+            day, away, home = day[:played], away[:played], home[:played]
+        home_wins = np.atleast_2d(np.asarray(home_wins, dtype=bool))[:, :len(day)]
+
+        wins = np.zeros((home_wins.shape[0], days + 1, len(teams)), dtype=np.int16)
+        games = np.zeros((days + 1, len(teams)), dtype=np.int16)
+        for t in range(len(teams)):
+            own = np.flatnonzero((away == t) | (home == t))
+            own = own[np.argsort(day[own], kind='stable')]
+            won = np.where(home[own] == t, home_wins[:, own], ~home_wins[:, own])
+            running = np.zeros((home_wins.shape[0], len(own) + 1), dtype=np.int16)
+            np.cumsum(won, axis=1, out=running[:, 1:])
+            # Games this club has played through each day, then its wins after that many games
+            count = np.searchsorted(day[own], through, side='right')
+            games[:, t] = count
+            wins[:, :, t] = running[:, count]
+        return cls(teams, [team_leagues[abbrev] for abbrev in teams], wins, games, totals)
+
+    # ==================== LOOKUPS ====================
+
+    def _day(self, day: int) -> int:
+        return min(max(day, 0), self.days)
+
+    def record(self, day: int, season: Optional[int] = 0):
+        """ (wins, losses) through a day, one column per club in `teams` order; season=None gives every season. """
+        day = self._day(day)
+        wins = self.wins[:, day] if season is None else self.wins[season, day]
+        return wins, self.games[day] - wins
+
+    def games_back(self, day: int, season: Optional[int] = 0) -> np.ndarray:
+        """ Games behind the league leader through a day, per club (0 for the leader). """
+        wins, losses = self.record(day, season)
+        margin = (wins - losses).astype(np.int32)
+        lead = np.where(self._same_league, margin[..., None, :], np.iinfo(np.int32).min).max(axis=-1)
+        return (lead - margin) / 2
+
+    def magic_numbers(self, day: int, season: Optional[int] = 0) -> np.ndarray:
+        """
+        Each club's magic number to finish first in its league outright through a day: its own
+        wins plus rivals' losses still needed to pass every rival's best possible total (0 once
+        clinched).
+        """
+        day = self._day(day)
+        wins, losses = self.record(day, season)
+        best = (self.totals - losses).astype(np.int32)  # Most wins each club can still reach
+        rivals = self._same_league & ~np.eye(len(self.teams), dtype=bool)
+        threat = np.where(rivals, best[..., None, :], 0).max(axis=-1)
+        return np.maximum(threat + 1 - wins, 0)
+
+    def standings(self, day: int, season: int = 0) -> List[dict]:
+        """ The table through a day for one season: league, then best record first. """
+        wins, losses = self.record(day, season)
+        back = self.games_back(day, season)
+        magic = self.magic_numbers(day, season)
+        rows = []
+        for i, abbrev in enumerate(self.teams):
+            played = int(wins[i] + losses[i])
+            rows.append({'team': abbrev, 'league': str(self.leagues[i]), 'wins': int(wins[i]),
+                         'losses': int(losses[i]), 'pct': round(int(wins[i]) / played, 3) if played else 0.0,
+                         'games_back': float(back[i]), 'magic_number': int(magic[i])})
+        rows.sort(key=lambda row: (row['league'], row['games_back'], row['team']))
+        return rows
+
+    # ==================== FILES ====================
+
+    def save(self, path: str):
+        """ Write the index as compressed .npz. """
+        np.savez_compressed(path, teams=np.array(self.teams, dtype=str), leagues=self.leagues,
+                            wins=self.wins, games=self.games, totals=self.totals)
+
+    @classmethod
+    def load(cls, path: str) -> 'StandingsIndex':
+        with np.load(path) as data:
+            return cls(data['teams'].tolist(), data['leagues'], data['wins'], data['games'], data['totals'])
@@ -0,0 +1,242 @@
+import gc
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+
+DEFAULT_INTERVAL = 5.0   # Seconds between samples (and JSON rewrites)
+DEFAULT_HALFLIFE = 60.0  # Seconds for the EWMA throughput to forget half of its history
+METRIC_PREFIX = "baseball_sim"
+SIMULATION_WORKER = "simulation"
+
+# Snapshot field -> (Prometheus type, help); labelled families are written from their dicts
+_METRICS = {
+    'games_total': ("counter", "Games completed"),
+    'games_per_second': ("gauge", "Games per second over the last sample interval"),
+    'games_per_second_ewma': ("gauge", "Exponentially weighted games per second"),
+    'plate_appearances_total': ("counter", "Plate appearances recorded"),
+    'plate_appearances_per_second': ("gauge", "Plate appearances per second over the last sample interval"),
+    'plate_appearances_per_second_ewma': ("gauge", "Exponentially weighted plate appearances per second"),
+    'resident_memory_bytes': ("gauge", "Resident set size of the process"),
+    'gc_seconds_total': ("counter", "Time spent in garbage collection"),
+    'gc_collections_total': ("counter", "Garbage collections run"),
+    'uptime_seconds': ("gauge", "Seconds since telemetry started"),
+}
+_LABELLED = {
+    'worker_utilization': ("worker", "gauge", "Share of the last sample interval each worker spent busy"),
+    'queue_depth': ("queue", "gauge", "Items waiting in each queue"),
+}
+
+
+def rss_bytes() -> Optional[int]:
+    """ Resident set size of this process: psutil when installed, else /proc (Linux); None if neither is available. """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Telemetry:
+    """
+    Live metrics for long-running simulation jobs, cheap enough to leave on.
+
+    The simulation only bumps a counter per game (`game_finished`); a background thread
+    takes a sample every `interval` seconds (rates, EWMA throughput, worker utilization,
+    queue depths, RSS, GC time) and rewrites `json_path` atomically, and with `port` the
+    latest sample is served as Prometheus text on http://127.0.0.1:<port>/metrics (and as
+    JSON on /metrics.json). Plate appearances are read from StatsManager's running count.
+    Workers report cumulative busy seconds and queues their depth through callables
+    registered with `add_worker` / `add_queue`; either may be read from the sampler thread.
+    """
+
+    def __init__(self, port: Optional[int] = None, json_path: Optional[str] = None,
+                 interval: float = DEFAULT_INTERVAL, halflife: float = DEFAULT_HALFLIFE):
+        self.port = port
+        self.json_path = json_path
+        self.interval = interval
+        self.halflife = halflife
+        self.games = 0
+        self.snapshot: Dict = {}
+        self._busy = {SIMULATION_WORKER: 0.0}  # Busy seconds reported through game_finished
+        self._workers: Dict[str, Callable[[], float]] = {SIMULATION_WORKER: lambda: self._busy[SIMULATION_WORKER]}
+        self._queues: Dict[str, Callable[[], int]] = {}
+        self._gc_seconds = 0.0
+        self._gc_collections = 0
+        self._gc_start = None
+        self._last = None  # (time, games, plate appearances, {worker: busy seconds}) at the previous sample
+        self._ewma = {}
+        self._started = None
+        self._pa_start = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    # ==================== REPORTING ====================
+
+    def game_finished(self, seconds: float = 0.0):
+        """ Count one game; `seconds` is how long the simulation worker was busy with it. """
+        self.games += 1
+        self._busy[SIMULATION_WORKER] += seconds
+
+    def add_worker(self, name: str, busy_seconds: Callable[[], float]):
+        """ Track a worker's utilization from its cumulative busy time (a drop is taken as a restart). """
+        self._workers[name] = busy_seconds
+
+    def add_queue(self, name: str, depth: Callable[[], int]):
+        self._queues[name] = depth
+
+    def _gc_callback(self, phase: str, info: Dict):
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self._gc_seconds += time.perf_counter() - self._gc_start
+            self._gc_collections += 1
+            self._gc_start = None
+
+    # ==================== SAMPLING ====================
+
+    def sample(self) -> Dict:
+        """ Take a sample now: update `snapshot` (and the JSON file) and return it. """
+        now = time.perf_counter()
+        games, plate_appearances = self.games, StatsManager.recorded
+        busy = {}
+        for name, read in self._workers.items():
+            try:
+                busy[name] = float(read())
+            except Exception:  # A worker that has gone away reports nothing rather than stopping telemetry
+                continue
+        queues = {}
+        for name, read in self._queues.items():
+            try:
+                queues[name] = int(read())
+            except Exception:
+                continue
+
+        utilization, rates = {}, {'games_per_second': 0.0, 'plate_appearances_per_second': 0.0}
+        if self._last is not None:  # The first sample (on entry) only sets the baseline
+            then, games_then, pa_then, busy_then = self._last
+            elapsed = max(now - then, 1e-9)
+            rates = {'games_per_second': (games - games_then) / elapsed,
+                     'plate_appearances_per_second': (plate_appearances - pa_then) / elapsed}
+            weight = 1.0 - 0.5 ** (elapsed / self.halflife)
+            for name, rate in rates.items():
+                previous = self._ewma.get(name)
+                self._ewma[name] = rate if previous is None else previous + weight * (rate - previous)
+            for name, seconds in busy.items():
+                spent = seconds - busy_then.get(name, 0.0)
+                utilization[name] = min(max(spent if spent >= 0 else seconds, 0.0) / elapsed, 1.0)
+        self._last = (now, games, plate_appearances, busy)
+
+        snapshot = {'time': time.time(), 'uptime_seconds': now - self._started, 'games_total': games,
+                    'plate_appearances_total': plate_appearances - self._pa_start, **rates,
+                    'games_per_second_ewma': self._ewma.get('games_per_second', 0.0),
+                    'plate_appearances_per_second_ewma': self._ewma.get('plate_appearances_per_second', 0.0),
+                    'worker_utilization': utilization, 'queue_depth': queues,
+                    'resident_memory_bytes': rss_bytes(), 'gc_seconds_total': self._gc_seconds,
+                    'gc_collections_total': self._gc_collections}
+        with self._lock:
+            self.snapshot = snapshot
+        if self.json_path:
+            self._write_json(snapshot)
+        return snapshot
+
+    def _write_json(self, snapshot: Dict):
+        """ Rewrite the JSON file atomically, so a reader never sees it half written. """
+        directory = os.path.dirname(self.json_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.json_path + ".tmp", 'w') as f:
+            json.dump(snapshot, f, indent=1)
+        os.replace(self.json_path + ".tmp", self.json_path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    # ==================== EXPOSITION ====================
+
+    def prometheus(self) -> str:
+        """ The latest sample in the Prometheus text exposition format. """
+        with self._lock:
+            snapshot = self.snapshot
+        lines = []
+        for field, (kind, description) in _METRICS.items():
+            value = snapshot.get(field)
+            if value is None:
+                continue
+            name = f"{METRIC_PREFIX}_{field}"
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        for field, (label, kind, description) in _LABELLED.items():
+            values = snapshot.get(field)
+            if not values:
+                continue
+            name = f"{METRIC_PREFIX}_{field}"
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+            lines += [f'{name}{{{label}="{key}"}} {value}' for key, value in sorted(values.items())]
+        return "\n".join(lines) + "\n"
+
+    def _serve(self):
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = telemetry.prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    with telemetry._lock:
+                        body, content_type = json.dumps(telemetry.snapshot), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):  # Scrapes would otherwise print to stderr
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        if self.port == 0:
+            self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="TelemetryServer", daemon=True).start()
+
+    # ==================== LIFECYCLE ====================
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self._pa_start = StatsManager.recorded
+        self._last = None
+        self._ewma = {}
+        gc.callbacks.append(self._gc_callback)
+        self.sample()
+        if self.port is not None:
+            self._serve()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="Telemetry", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        gc.callbacks.remove(self._gc_callback)
+        self.sample()  # The file is left holding the final numbers
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        return False
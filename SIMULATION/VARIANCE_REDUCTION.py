@@ -0,0 +1,187 @@
+import contextlib
+import math
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from CONTEXT.VARIANT_CONTEXT import SimVariant
+from GAMEDAY import setup_game, run_game
+from SIMULATION.BATCH_SIM import init_worker, DEFAULT_CHUNK_SIZE
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+from UTILITIES.ENUMS import InningHalf
+from UTILITIES.RANDOM import seed_random, reseed_streams, derive_seed, set_antithetic
+from UTILITIES.STAT_TESTS import StatTests
+
+COMPARE_MODES = ("independent", "crn")
+
+# One row per game replication, scored from the compared side's point of view
+PAIR_DTYPE = np.dtype([
+    ('a_win', np.int8),
+    ('a_run_diff', np.int16),
+    ('b_win', np.int8),
+    ('b_run_diff', np.int16),
+])
+
+
+class StreamAligner:
+    """
+    Reseeds the project RNG at every game and every plate appearance.
+
+    A PA's stream is keyed by (game key, inning, half, PA number within the half), so two
+    variants draw the same numbers for the same PA slot even after their games diverge
+    (a different hitter in the slot, an extra baserunner, ...). Installed inside a `with`
+    block by swapping AtBatSimulator.simulate_at_bat; the engine is untouched outside it.
+    """
+
+    def __init__(self):
+        self.game_key = 0
+        self._half = None
+        self._pa = 0
+        self._descriptor = None
+        self._original = None
+
+    def start_game(self, key: int):
+        """ Align game setup (starters, lineups) and reset the PA counter. """
+        self.game_key = key
+        self._half = None
+        reseed_streams(key)
+
+    def _simulate_at_bat(self, gamestate, token):
+        half = (gamestate.current_inning, gamestate.inninghalf)
+        if half != self._half:
+            self._half, self._pa = half, 0
+        reseed_streams(derive_seed(self.game_key, gamestate.current_inning,
+                                   int(gamestate.inninghalf is InningHalf.BOT), self._pa))
+        self._pa += 1
+        return self._original(gamestate, token)
+
+    def __enter__(self):
+        self._descriptor = AtBatSimulator.__dict__['simulate_at_bat']
+        self._original = AtBatSimulator.simulate_at_bat
+        AtBatSimulator.simulate_at_bat = self._simulate_at_bat
+        return self
+
+    def __exit__(self, *exc):
+        AtBatSimulator.simulate_at_bat = self._descriptor
+        return False
+
+
+def _play(variant: SimVariant, side: str):
+    """ Play one game of a variant in isolated stat tables; returns (won, run differential) for `side`. """
+    with StatsManager.isolated():
+        game = setup_game(variant.away_team, variant.home_team)
+        if variant.away_order:
+            game.away_lineup.set_batting_order(list(variant.away_order))
+        if variant.home_order:
+            game.home_lineup.set_batting_order(list(variant.home_order))
+        away_score, home_score = run_game(game).score
+    diff = home_score - away_score if side == "home" else away_score - home_score
+    return int(diff > 0), diff
+
+
+def compare_chunk(variant_a: SimVariant, variant_b: SimVariant, start: int, count: int, seed: int,
+                  mode: str = "crn", antithetic: bool = False, side: str = "home") -> np.ndarray:
+    """
+    Play games [start, start + count) of both variants.
+
+    In "crn" mode both variants replay game g from the same game and PA streams; in
+    "independent" mode each variant gets its own streams (the baseline to measure against).
+    With `antithetic`, every game is also replayed on mirrored pools.
+
+    Returns:
+        PAIR_DTYPE array of shape (count, 2 if antithetic else 1)
+    """
+    init_worker()
+    seed_random(seed)
+    replications = (False, True) if antithetic else (False,)
+    out = np.zeros((count, len(replications)), dtype=PAIR_DTYPE)
+
+    aligner = StreamAligner()
+    try:
+        with aligner if mode == "crn" else contextlib.nullcontext():
+            for i in range(count):
+                game_num = start + i
+                for rep, mirrored in enumerate(replications):
+                    set_antithetic(mirrored)
+                    row = []
+                    for stream, variant in enumerate((variant_a, variant_b)):
+                        # Mirrored replays reuse the same keys so they draw 1 - u of the originals
+                        key = derive_seed(seed, game_num) if mode == "crn" else derive_seed(seed, stream, game_num)
+                        aligner.start_game(key)
+                        row.extend(_play(variant, side))
+                    out[i, rep] = tuple(row)
+    finally:
+        set_antithetic(False)
+    return out
+
+
+def summarize_comparison(results: np.ndarray, confidence: float = 0.95) -> dict:
+    """
+    Estimate B - A for win rate and run differential from compare_chunk output.
+
+    For each metric:
+        mean_a / mean_b: per-game means
+        diff, ci_low, ci_high: estimated difference and its interval
+        paired_var: variance of the paired difference per unit (one game, or one
+            antithetic pair of games, of each variant)
+        independent_var: per-game variance of the difference with independent streams
+        variance_reduction: independent_var over the paired variance per game spent;
+            an independent comparison needs this many times more games for the same interval
+    """
+    units, reps = results.shape[:2]
+    z = StatTests.z_score(confidence)
+    summary = {"games_per_variant": units * reps, "units": units, "replications": reps}
+
+    for metric in ("win", "run_diff"):
+        a = results[f'a_{metric}'].astype(np.float64)
+        b = results[f'b_{metric}'].astype(np.float64)
+        paired = (b - a).mean(axis=1)
+        diff = float(paired.mean())
+        paired_var = float(paired.var(ddof=1)) if units > 1 else float("nan")
+        independent_var = float(a.var(ddof=1) + b.var(ddof=1)) if a.size > 1 else float("nan")
+        half = z * math.sqrt(paired_var / units) if units > 1 else float("inf")
+        summary[metric] = {
+            "mean_a": float(a.mean()), "mean_b": float(b.mean()),
+            "diff": diff, "ci_low": diff - half, "ci_high": diff + half,
+            "paired_var": paired_var, "independent_var": independent_var,
+            "variance_reduction": independent_var / (paired_var * reps) if paired_var > 0 else float("inf"),
+        }
+    return summary
+
+
+def compare_variants(variant_a: SimVariant, variant_b: SimVariant, n_games: int, seed=None,
+                     mode: str = "crn", antithetic: bool = False, side: str = "home",
+                     workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE, confidence: float = 0.95):
+    """
+    Compare two variants (before/after a trade, lineup A vs lineup B) with variance reduction.
+
+    Args:
+        variant_a, variant_b: The two SimVariants; `side` picks which club's wins and run
+            differential are compared ("home" or "away")
+        n_games: Games per variant (halved into mirrored pairs when antithetic)
+        seed: Base seed (None draws one, so unseeded runs still align the two variants)
+        mode: "crn" (aligned per game and per PA slot) or "independent"
+        antithetic: Also replay each game on mirrored random pools
+        workers: Processes to spread chunks across (1 = run in this process)
+
+    Returns:
+        (summary dict from summarize_comparison, raw PAIR_DTYPE results)
+    """
+    if mode not in COMPARE_MODES:
+        raise ValueError(f"mode must be one of {COMPARE_MODES}")
+    if seed is None:
+        seed = random.getrandbits(63)
+    units = n_games // 2 if antithetic else n_games
+    plan = [(start, min(chunk_size, units - start)) for start in range(0, units, chunk_size)]
+
+    if workers <= 1:
+        chunks = [compare_chunk(variant_a, variant_b, start, count, seed, mode, antithetic, side)
+                  for start, count in plan]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            futures = [pool.submit(compare_chunk, variant_a, variant_b, start, count, seed, mode, antithetic, side)
+                       for start, count in plan]
+            chunks = [future.result() for future in futures]
+
+    results = np.concatenate(chunks)
+    return summarize_comparison(results, confidence), results
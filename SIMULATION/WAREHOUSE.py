@@ -0,0 +1,182 @@
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+from SIMULATION.EXPORT import BATTING_FIELDS, PITCHING_FIELDS, batting_table, pitching_table
+
+DEFAULT_BATCH_ROWS = 50000
+
+WAREHOUSE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+_LINE_COLUMNS = {
+    'batting': tuple(f'"{field}"' for field in BATTING_FIELDS),
+    'pitching': tuple(f'"{field}"' for field in PITCHING_FIELDS),
+}
+_LINE_TYPES = {
+    'batting': ", ".join(f"{column} INTEGER" for column in _LINE_COLUMNS['batting']),
+    'pitching': ", ".join(f"{column} {'REAL' if field == 'IP' else 'INTEGER'}"
+                          for field, column in zip(PITCHING_FIELDS, _LINE_COLUMNS['pitching'])),
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS games (
+    run_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    game_num INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    away_team TEXT NOT NULL,
+    home_team TEXT NOT NULL,
+    away_score INTEGER NOT NULL,
+    home_score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batting (
+    run_id INTEGER NOT NULL, season INTEGER NOT NULL, team TEXT NOT NULL, player_id INTEGER NOT NULL, name TEXT,
+    {_LINE_TYPES['batting']}
+);
+CREATE TABLE IF NOT EXISTS pitching (
+    run_id INTEGER NOT NULL, season INTEGER NOT NULL, team TEXT NOT NULL, player_id INTEGER NOT NULL, name TEXT,
+    {_LINE_TYPES['pitching']}
+);
+
+-- One index serves day, team and standings-as-of-day lookups; each extra index on games
+-- roughly halves insert throughput
+CREATE INDEX IF NOT EXISTS games_by_day ON games (run_id, season, day, away_team, home_team);
+CREATE INDEX IF NOT EXISTS batting_by_player ON batting (run_id, team, player_id);
+CREATE INDEX IF NOT EXISTS pitching_by_player ON pitching (run_id, team, player_id);
+
+-- One row per club per game, from its own point of view
+CREATE VIEW IF NOT EXISTS team_games AS
+    SELECT run_id, season, day, game_num, away_team AS team, home_team AS opponent,
+           away_score AS runs_for, home_score AS runs_against, away_score > home_score AS win
+    FROM games
+    UNION ALL
+    SELECT run_id, season, day, game_num, home_team, away_team,
+           home_score, away_score, home_score > away_score
+    FROM games;
+
+CREATE VIEW IF NOT EXISTS standings AS
+    SELECT run_id, season, team, SUM(win) AS wins, COUNT(*) - SUM(win) AS losses,
+           ROUND(1.0 * SUM(win) / COUNT(*), 3) AS pct,
+           SUM(runs_for) AS runs_for, SUM(runs_against) AS runs_against
+    FROM team_games
+    GROUP BY run_id, season, team;
+
+CREATE VIEW IF NOT EXISTS batting_totals AS
+    SELECT run_id, team, player_id, name, COUNT(*) AS seasons,
+           {", ".join(f"SUM({column}) AS {column}" for column in _LINE_COLUMNS['batting'])},
+           ROUND(1.0 * SUM("H") / NULLIF(SUM("AB"), 0), 3) AS "AVG"
+    FROM batting
+    GROUP BY run_id, team, player_id;
+
+CREATE VIEW IF NOT EXISTS pitching_totals AS
+    SELECT run_id, team, player_id, name, COUNT(*) AS seasons,
+           {", ".join(f"SUM({column}) AS {column}" for column in _LINE_COLUMNS['pitching'])},
+           ROUND(9.0 * SUM("ER") / NULLIF(SUM("IP"), 0), 2) AS "ERA"
+    FROM pitching
+    GROUP BY run_id, team, player_id;
+"""
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """ Open (creating if needed) a results warehouse in WAL mode. """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class ResultsWarehouse:
+    """
+    SQLite sink for simulated games, usable wherever a ResultWriter is (same write /
+    position / close interface), plus per-season player lines.
+
+    Rows are staged and inserted with executemany, one transaction per `batch_rows`
+    games, into a WAL-mode database; every run gets its own run_id so many runs share
+    one file. Query it with the views (team_games, standings, batting_totals,
+    pitching_totals) or `standings()` below.
+    """
+
+    def __init__(self, path: str, label: Optional[str] = None, batch_rows: int = DEFAULT_BATCH_ROWS,
+                 resume: Optional[Tuple[int, int, int]] = None):
+        self.path = path
+        self.conn = connect(path)
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._batch = []
+        if resume is None:
+            with self.conn:
+                self.run_id = self.conn.execute("INSERT INTO runs (created, label) VALUES (?, ?)",
+                                                (time.time(), label)).lastrowid
+            self._lines_through = -1
+        else:
+            # Drop anything written after the checkpoint, then carry on in the same run
+            self.run_id, last_game, self._lines_through = resume
+            with self.conn:
+                self.conn.execute("DELETE FROM games WHERE run_id = ? AND rowid > ?", (self.run_id, last_game))
+                for table in _LINE_COLUMNS:
+                    self.conn.execute(f"DELETE FROM {table} WHERE run_id = ? AND season > ?",
+                                      (self.run_id, self._lines_through))
+
+    def write(self, row: tuple):
+        """ Stage one result row (season, game_num, day, away_team, home_team, away_score, home_score). """
+        self._batch.append((self.run_id, *row))
+        self.rows += 1
+        if len(self._batch) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if self._batch:
+            with self.conn:
+                self.conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._batch)
+            self._batch = []
+
+    def write_player_lines(self, season: int):
+        """ Insert every batting and pitching line from the current StatsManager tables for a season. """
+        self.flush()
+        with self.conn:
+            for table, lines in (('batting', batting_table()), ('pitching', pitching_table())):
+                columns = ('team', 'player_id', 'name') + (BATTING_FIELDS if table == 'batting' else PITCHING_FIELDS)
+                values = [lines[column].tolist() for column in columns]
+                rows = [(self.run_id, season, *line) for line in zip(*values)]
+                placeholders = ", ".join("?" * (len(columns) + 2))
+                self.conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+        self._lines_through = season
+
+    def position(self) -> Tuple[int, int, int]:
+        """ Flush, then report (run_id, last game rowid, last season with player lines) for `resume`. """
+        self.flush()
+        last = self.conn.execute("SELECT MAX(rowid) FROM games WHERE run_id = ?", (self.run_id,)).fetchone()[0] or 0
+        return self.run_id, last, self._lines_through
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def standings(conn: sqlite3.Connection, run_id: int, season: int, through_day: Optional[int] = None) -> List[tuple]:
+    """
+    (team, wins, losses, pct, games back) for one season, through a schedule day if given,
+    best record first, e.g. standings(conn, run_id, 412, through_day=80).
+    """
+    rows = conn.execute(
+        "SELECT team, SUM(win), COUNT(*) - SUM(win) FROM team_games "
+        "WHERE run_id = ? AND season = ? AND day <= ? GROUP BY team",
+        (run_id, season, through_day if through_day is not None else 1 << 30)).fetchall()
+    rows.sort(key=lambda row: (row[2] - row[1], row[0]))
+    if not rows:
+        return []
+    lead_wins, lead_losses = rows[0][1], rows[0][2]
+    return [(team, wins, losses, round(wins / (wins + losses), 3),
+             ((lead_wins - wins) + (losses - lead_losses)) / 2) for team, wins, losses in rows]
@@ -0,0 +1,130 @@
+from typing import List, Optional, Tuple
+from ATBAT.ATBAT_SIM import AtBatSimulator
+from CONTEXT.ATBAT_CONTEXT import AtBatToken
+from CONTEXT.PLAYER_CONTEXT import Player
+from TEAM_UTILS.STATS_MANAGER import StatsManager
+
+# Leverage thresholds (1.0 = average plate appearance)
+HIGH_LEVERAGE = 1.5
+LOW_LEVERAGE = 0.7
+
+MIN_BATTERS_FACED = 3   # A pitcher faces this many batters before a leverage-driven change
+MATCHUP_EDGE = 0.05     # Runs over the upcoming batters a reliever must save to come in early
+
+# Approximate run values per outcome (outs are the zero point)
+_RUN_VALUES = {'BB': 0.69, 'HP': 0.72, 'HR': 2.00, 'IH': 0.88, 'SL': 0.88, 'DL': 1.25, 'TL': 1.58}
+_HIT_KEYS = ('IH', 'SL', 'DL', 'TL')
+
+
+class BullpenManager:
+    """
+    Leverage-aware bullpen decisions layered over PitchingManager's fatigue limits.
+
+    The leverage index comes from the win-expectancy table installed on GameState
+    (ANALYSIS.WIN_EXPECTANCY); without one, every decision is exactly PitchingManager's.
+    In high-leverage spots a tired or outmatched pitcher gives way to the reliever with
+    the best matchup against the next three hitters; in low-leverage spots the top arms
+    are saved and the lowest-ranked reliever comes in instead.
+    """
+
+    # Expected runs per (pitcher, upcoming batters, park), keyed by identities.
+    # Entries hold references to those objects so their ids cannot be reused while cached.
+    _matchup_cache = {}
+    # Whole bullpens ranked against the upcoming batters, keyed by (staff, park, batters)
+    _pen_cache = {}
+
+    @classmethod
+    def clear_matchup_cache(cls):
+        """ Drop cached matchup values (call alongside AtBatSimulator.clear_matchup_cache). """
+        cls._matchup_cache.clear()
+        cls._pen_cache.clear()
+
+    # ==================== MATCHUPS ====================
+
+    @staticmethod
+    def upcoming_batters(batting_lineup) -> Tuple[Player, ...]:
+        """ The current batter and the two after him. """
+        order, index = batting_lineup.batting_order, batting_lineup.current_batter_index
+        return order[index], order[(index + 1) % 9], order[(index + 2) % 9]
+
+    @staticmethod
+    def expected_runs(outcome_probs: dict) -> float:
+        """ Run value of one plate appearance from matchup probabilities (same outcome tree as the engine). """
+        value = sum(outcome_probs[key] * _RUN_VALUES[key] for key in ('BB', 'HP', 'HR'))
+        in_play = 1.0 - outcome_probs['SO'] - outcome_probs['BB'] - outcome_probs['HP'] - outcome_probs['HR']
+        hit_total = sum(outcome_probs[key] for key in _HIT_KEYS)
+        if in_play > 0 and hit_total > 0:
+            hit_value = sum(outcome_probs[key] * _RUN_VALUES[key] for key in _HIT_KEYS) / hit_total
+            value += in_play * outcome_probs['BA'] * hit_value
+        return value
+
+    @classmethod
+    def matchup_value(cls, gamestate, pitcher: Player, batters: Tuple[Player, ...]) -> float:
+        """ Expected runs the batters produce against a pitcher in this park (lower is better, cached). """
+        park = gamestate.home_team.park_factors
+        key = (id(pitcher), id(park), id(batters[0]), id(batters[1]), id(batters[2]))
+        cached = cls._matchup_cache.get(key)
+        if cached is not None:
+            return cached[0]
+
+        value = sum(cls.expected_runs(AtBatSimulator.generate_matchup_probs(gamestate, AtBatToken(batter, pitcher)))
+                    for batter in batters)
+        cls._matchup_cache[key] = (value, pitcher, park, batters)
+        return value
+
+    @classmethod
+    def best_matchup(cls, gamestate, pitching_mgr, batters) -> Tuple[Optional[Player], float]:
+        """ Available reliever who allows the fewest expected runs to the batters. """
+        staff, park = pitching_mgr.all_pitchers, gamestate.home_team.park_factors
+        key = (id(staff), id(park), id(batters[0]), id(batters[1]), id(batters[2]))
+        cached = cls._pen_cache.get(key)
+        if cached is None:
+            ranked = sorted(((cls.matchup_value(gamestate, reliever, batters), reliever)
+                             for reliever in pitching_mgr.reliever_rank), key=lambda pair: pair[0])
+            cached = cls._pen_cache[key] = (ranked, staff, park, batters)
+
+        for value, reliever in cached[0]:
+            if reliever not in pitching_mgr.pitchers_used:
+                return reliever, value
+        return None, float("inf")
+
+    # ==================== DECISIONS ====================
+
+    @classmethod
+    def should_change_pitcher(cls, gamestate, batting_lineup, pitching_mgr) -> bool:
+        """
+        Fatigue limits first; then, only in high-leverage spots, whether a fresh reliever
+        matches up better enough against the next three hitters to justify the move.
+        """
+        if pitching_mgr.should_change_pitcher():
+            return True
+
+        leverage = gamestate.leverage()
+        if leverage is None or leverage < HIGH_LEVERAGE:
+            return False
+
+        pitcher = pitching_mgr.current_pitcher
+        if StatsManager.get_pitcher_stat(pitcher, 'BF') - pitching_mgr.entry_batters_faced < MIN_BATTERS_FACED:
+            return False
+
+        batters = cls.upcoming_batters(batting_lineup)
+        best, best_value = cls.best_matchup(gamestate, pitching_mgr, batters)
+        return best is not None and cls.matchup_value(gamestate, pitcher, batters) - best_value > MATCHUP_EDGE
+
+    @classmethod
+    def choose_reliever(cls, gamestate, batting_lineup, pitching_mgr) -> Optional[Player]:
+        """ Reliever for the spot: best matchup when it matters, the last man in the pen when it doesn't. """
+        leverage = gamestate.leverage()
+        if leverage is None or LOW_LEVERAGE <= leverage < HIGH_LEVERAGE:
+            return None  # PitchingManager's default: best available by average
+
+        if leverage >= HIGH_LEVERAGE:
+            return cls.best_matchup(gamestate, pitching_mgr, cls.upcoming_batters(batting_lineup))[0]
+
+        available: List[Player] = pitching_mgr.get_available_relievers()
+        return max(available, key=lambda p: p.average) if available else None
+
+    @classmethod
+    def change_pitcher(cls, gamestate, batting_lineup, pitching_mgr) -> Player:
+        """ Make the change with the leverage-appropriate reliever. """
+        return pitching_mgr.change_pitcher(cls.choose_reliever(gamestate, batting_lineup, pitching_mgr))
@@ -21,10 +21,15 @@ class PitchingManager:
         self.starting_pitchers = [p for p in pitchers if p.position == 'SP']
         self.relief_pitchers = [p for p in pitchers if p.position == 'RP']
         
+        # Relievers best first (lower average is better); everyone before the cursor has pitched
+        self.reliever_rank = sorted(self.relief_pitchers, key=lambda p: p.average)
+        self._rank_cursor = 0
+        
         # Game state
         self.current_pitcher: Optional[Player] = None
         self.starting_pitcher: Optional[Player] = None
         self.pitchers_used: List[Player] = []
+        self.entry_batters_faced = 0  # Current pitcher's BF total when he entered
     
     def select_starting_pitcher(self, randomize: bool = True) -> Player:
         """ Select starting pitcher for the game. """
@@ -40,6 +45,7 @@ class PitchingManager:
         self.current_pitcher = pitcher
         self.starting_pitcher = pitcher
         self.pitchers_used.append(pitcher)
+        self.entry_batters_faced = StatsManager.get_pitcher_stat(pitcher, 'BF')
         
         return pitcher
 
@@ -66,6 +72,7 @@ class PitchingManager:
         # Make the change
         self.current_pitcher = new_pitcher
         self.pitchers_used.append(new_pitcher)
+        self.entry_batters_faced = StatsManager.get_pitcher_stat(new_pitcher, 'BF')
         
         return new_pitcher
     
@@ -85,21 +92,20 @@ class PitchingManager:
     
     def has_available_relievers(self) -> bool:
         """Check if any relievers are still available."""
-        return len(self.get_available_relievers()) > 0
+        return self.get_best_available_reliever() is not None
     
     def get_best_available_reliever(self) -> Optional[Player]:
         """
         Get the best available relief pitcher based on performance.
+        Relievers are ranked once per manager, so this only skips past the ones already used.
         
         Returns:
             Best available reliever or None if none available
         """
-        available = self.get_available_relievers()
-        if not available:
-            return None
-        
-        # Sort by average (lower is better for pitchers)
-        return min(available, key=lambda p: p.average)
+        rank = self.reliever_rank
+        while self._rank_cursor < len(rank) and rank[self._rank_cursor] in self.pitchers_used:
+            self._rank_cursor += 1
+        return rank[self._rank_cursor] if self._rank_cursor < len(rank) else None
     
     def get_pitcher_stats(self, pitcher: Player) -> Dict[str, int]:
         """ Get current game stats for a pitcher. """
@@ -128,18 +134,19 @@ class PitchingManager:
             return False
         
         pitcher = self.current_pitcher
-        stats = self.get_pitcher_stats(pitcher)
+        pitches = StatsManager.get_pitcher_stat(pitcher, 'PT', 0)
+        innings = StatsManager.get_pitcher_stat(pitcher, 'IP', 0.0)
         
         # Check limits based on position
         if pitcher.position == 'SP':
-            return (stats.get('PT', 0) >= STARTER_PITCH_LIMIT or 
-                    stats.get('IP', 0.0) >= STARTER_INNING_LIMIT)
+            return pitches >= STARTER_PITCH_LIMIT or innings >= STARTER_INNING_LIMIT
         else:  # RP
-            return (stats.get('PT', 0) >= RELIEVER_PITCH_LIMIT or 
-                    stats.get('IP', 0.0) >= RELIEVER_INNING_LIMIT)
+            return pitches >= RELIEVER_PITCH_LIMIT or innings >= RELIEVER_INNING_LIMIT
     
     def reset_for_new_game(self):
         """Reset pitching manager for a new game."""
         self.current_pitcher = None
         self.starting_pitcher = None
-        self.pitchers_used = []
\ No newline at end of file
+        self.pitchers_used = []
+        self.entry_batters_faced = 0
+        self._rank_cursor = 0
\ No newline at end of file
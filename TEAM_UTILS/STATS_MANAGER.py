@@ -1,5 +1,6 @@
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
+from contextlib import contextmanager
 from CONTEXT.PLAY_CONTEXT import PlayResult
 from UTILITIES.ENUMS import Micro, Macro
 from UTILITIES.STATS_CALCS import StatsCalculator
@@ -12,6 +13,7 @@ class StatsManager:
     batter_stats: Dict = {}  # Key: (team_abbrev, player_id), Value: stat dict
     pitcher_stats: Dict = {}  # Key: (team_abbrev, player_id), Value: stat dict
     _key_cache: Dict = {}  # Cache player keys to avoid repeated tuple creation
+    recorded: int = 0  # Plate appearances (macro results) recorded since start-up, never reset (read by telemetry)
     
     # ==================== INITIALIZATION ====================
     
@@ -80,6 +82,8 @@ class StatsManager:
         StatsManager._initialize_pitcher(result.pitcher)
         StatsManager._update_batter_stats(result)
         StatsManager._update_pitcher_stats(result)
+        if isinstance(result.type, Macro):  # Stolen bases, wild pitches, etc. come through here too
+            StatsManager.recorded += 1
     
     @staticmethod
     def _update_batter_stats(result: PlayResult):
@@ -216,6 +220,18 @@ class StatsManager:
             return {}
         return StatsManager.pitcher_stats[key].copy()
     
+    @staticmethod
+    def get_pitcher_stat(pitcher, stat: str, default=0):
+        """ Read one stat without copying the line (cheap enough to call every plate appearance). """
+        stats = StatsManager.pitcher_stats.get(StatsManager._get_player_key(pitcher))
+        return default if stats is None else stats.get(stat, default)
+    
+    @staticmethod
+    def load_pitcher_stats(pitcher, stats: Dict):
+        """ Overwrite a pitcher's line (e.g. pitch count restored from a snapshot). """
+        StatsManager._initialize_pitcher(pitcher)
+        StatsManager.pitcher_stats[StatsManager._get_player_key(pitcher)].update(stats)
+    
     @staticmethod
     def get_all_batter_stats() -> List[Dict]:
         """Get stats for all batters as a list."""
@@ -304,4 +320,34 @@ class StatsManager:
     def reset():
         """Clear all stats for a new game."""
         StatsManager.batter_stats.clear()
-        StatsManager.pitcher_stats.clear()
\ No newline at end of file
+        StatsManager.pitcher_stats.clear()
+
+    @staticmethod
+    def export_tables() -> Dict:
+        """ Both stat tables without player references (picklable; see import_tables). """
+        return {table: {key: {stat: value for stat, value in line.items() if stat != 'player'}
+                        for key, line in stats.items()}
+                for table, stats in (('batters', StatsManager.batter_stats), ('pitchers', StatsManager.pitcher_stats))}
+    
+    @staticmethod
+    def import_tables(tables: Dict, players: Dict):
+        """
+        Replace both stat tables with export_tables output.
+        
+        Args:
+            tables: export_tables() result
+            players: Player objects by (team_abbrev, player_id), to relink each line
+        """
+        StatsManager.batter_stats = {key: {'player': players[key], **line} for key, line in tables['batters'].items()}
+        StatsManager.pitcher_stats = {key: {'player': players[key], **line} for key, line in tables['pitchers'].items()}
+    
+    @staticmethod
+    @contextmanager
+    def isolated():
+        """ Record into empty stat tables inside the block, then restore the previous ones. """
+        saved = StatsManager.batter_stats, StatsManager.pitcher_stats
+        StatsManager.batter_stats, StatsManager.pitcher_stats = {}, {}
+        try:
+            yield
+        finally:
+            StatsManager.batter_stats, StatsManager.pitcher_stats = saved
@@ -17,6 +17,8 @@ class RandomPool:
         self.pool = [random.uniform(min_val, max_val) for _ in range(size)]
         self.index = 0
         self.size = size
+        self.min_val = min_val
+        self.max_val = max_val
     
     def next(self):
         """Get next random number from pool (wraps around if exhausted)."""
@@ -28,6 +30,18 @@ class RandomPool:
         """Reset index to start of pool."""
         self.index = 0
 
+    def mirrored(self):
+        """ Antithetic copy of this pool: every value v becomes min_val + max_val - v. """
+        mirror = RandomPool.__new__(RandomPool)
+        mirror.pool = [self.min_val + self.max_val - value for value in self.pool]
+        mirror.index = 0
+        mirror.size = self.size
+        mirror.min_val = self.min_val
+        mirror.max_val = self.max_val
+        return mirror
+
+_MASK64 = (1 << 64) - 1
+
 # Global pools for different decision types
 _rand_pool = None       # General decisions (0.0 to 1.0)
 _outs_pool = None         # Out/safe decisions - low probabilities (0.001 to 0.100)
@@ -37,9 +51,17 @@ _sacs_pool = None       # Sacrifice decisions - low probabilities (0.001 to 0.10
 _stls_pool = None       # Steal decisions - medium-high probabilities (0.640 to 0.870)
 _poff_pool = None       # Pickoff decisions - low probabilities (0.001 to 0.100)
 
+# (normal pools, mirrored pools) built on first use of set_antithetic; cleared when pools are rebuilt
+_antithetic = None
+
+# (seed, size, random state after building) for pools built by seed_random
+_pool_seed = None
+
 def init_random_pool(size=10000):
     """ Initialize all random pools for a game with appropriate ranges. """
-    global _rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool
+    global _rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool, _antithetic, _pool_seed
+    _antithetic = None
+    _pool_seed = None
     _rand_pool = RandomPool(size, min_val=0.000, max_val=1.000)      # Full range for general use
     _outs_pool = RandomPool(size, min_val=0.030, max_val=0.100)     # Low probabilities for outs
     _advs_pool = RandomPool(size, min_val=0.150, max_val=0.850)     # Medium range for advances
@@ -49,6 +71,99 @@ def init_random_pool(size=10000):
     _poff_pool = RandomPool(size, min_val=0.001, max_val=0.100)     # Low probabilities for pickoffs
 
 
+def seed_random(seed, size=None):
+    """
+    Seed the random module and rebuild every pool so a run can be reproduced exactly.
+    Pools already built from the same seed are rewound instead of regenerated.
+    """
+    global _pool_seed
+    if size is None:
+        size = _rand_pool.size if _rand_pool else 500
+    if _pool_seed is not None and _pool_seed[:2] == (seed, size):
+        set_antithetic(False)
+        for pool in _all_pools():
+            pool.reset()
+        random.setstate(_pool_seed[2])
+        return
+    random.seed(seed)
+    init_random_pool(size=size)
+    _pool_seed = (seed, size, random.getstate())
+
+
+def derive_seed(seed, *keys) -> int:
+    """ Derive an independent 64-bit child seed from a base seed and integer keys (splitmix64). """
+    x = seed & _MASK64
+    for key in keys:
+        x = (x + 0x9E3779B97F4A7C15 + (key & _MASK64)) & _MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+        x ^= x >> 31
+    return x
+
+
+def reseed_streams(key: int):
+    """
+    Reposition every stream for a sub-run (one game, one plate appearance, ...).
+    Pools keep their values; only the read positions and the random module state move,
+    so two runs that reseed with the same key draw identical numbers from that point on.
+    """
+    random.seed(key)
+    for offset, pool in enumerate(_all_pools(), 1):
+        pool.index = ((key >> (offset * 3)) + key * offset) % pool.size
+
+
+def stream_state():
+    """ Position of every stream (random module state, pool indices), for checkpoints. """
+    return random.getstate(), tuple(pool.index for pool in _all_pools())
+
+
+def restore_stream_state(state):
+    """ Return every stream to a position captured by stream_state (pools must be the same). """
+    random.setstate(state[0])
+    for pool, index in zip(_all_pools(), state[1]):
+        pool.index = index
+
+
+def export_random_state():
+    """ Everything behind the streams (pool values and positions, random module state), picklable. """
+    return {'random': random.getstate(), 'pool_seed': _pool_seed,
+            'pools': [(pool.pool, pool.index, pool.min_val, pool.max_val) for pool in _all_pools()]}
+
+
+def import_random_state(state):
+    """ Rebuild the streams from export_random_state output (e.g. when resuming a checkpointed run). """
+    global _rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool, _antithetic, _pool_seed
+    pools = []
+    for values, index, min_val, max_val in state['pools']:
+        pool = RandomPool.__new__(RandomPool)
+        pool.pool, pool.index, pool.size = list(values), index, len(values)
+        pool.min_val, pool.max_val = min_val, max_val
+        pools.append(pool)
+    _rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool = pools
+    _antithetic = None
+    _pool_seed = state['pool_seed']
+    random.setstate(state['random'])
+
+
+def set_antithetic(enabled: bool):
+    """
+    Swap every pool for its mirror image (or back). Positions set by reseed_streams are
+    unaffected, so a mirrored run draws 1 - u wherever the normal run drew u.
+    Draws made straight from the random module are not mirrored.
+    """
+    global _rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool, _antithetic
+    if _antithetic is None:
+        if not enabled:
+            return
+        normal = _all_pools()
+        _antithetic = (normal, tuple(pool.mirrored() for pool in normal))
+    _rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool = _antithetic[1 if enabled else 0]
+
+
+def _all_pools():
+    return (_rand_pool, _outs_pool, _advs_pool, _scrs_pool, _sacs_pool, _stls_pool, _poff_pool)
+
+
 def get_random():
     """Get next random number from the general pool."""
     return _rand_pool.next()
@@ -0,0 +1,239 @@
+import math
+import numpy as np
+from statistics import NormalDist
+from typing import List, Sequence, Tuple
+
+EXACT_MAX_SAMPLES = 40  # Mann-Whitney: exact null distribution up to this many samples in all
+MIN_EXPECTED = 5        # Chi-squared: columns expected to hold fewer counts are merged with a neighbour
+
+
+class StatTests:
+    """ Interval estimates and hypothesis tests used by the analysis and benchmark tools. """
+
+    @staticmethod
+    def z_score(confidence: float = 0.95) -> float:
+        """ Two-sided normal critical value, e.g. 1.96 for 95%. """
+        return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    @staticmethod
+    def wilson_interval(successes, trials, confidence: float = 0.95) -> Tuple[float, float]:
+        """
+        Wilson score interval for a binomial proportion.
+
+        Works on scalars or NumPy arrays; trials of 0 give the uninformative (0, 1).
+        """
+        if trials is None or (np.ndim(trials) == 0 and trials == 0):
+            return 0.0, 1.0
+        z = StatTests.z_score(confidence)
+        if np.ndim(trials) > 0:
+            # Score empty cells against one trial so nothing divides by zero, then overwrite them
+            played = np.asarray(trials) > 0
+            low, high = StatTests._wilson(np.asarray(successes, dtype=float), np.where(played, trials, 1), z)
+            return np.where(played, low, 0.0), np.where(played, high, 1.0)
+        return StatTests._wilson(successes, trials, z)
+
+    @staticmethod
+    def _wilson(successes, trials, z: float):
+        """ Wilson bounds for trials known to be positive. """
+        p = successes / trials
+        denom = 1 + z * z / trials
+        center = (p + z * z / (2 * trials)) / denom
+        half = z * (p * (1 - p) / trials + z * z / (4 * trials * trials)) ** 0.5 / denom
+        return center - half, center + half
+
+    @staticmethod
+    def _u_distribution(n1: int, n2: int) -> List[int]:
+        """ Number of orderings giving each U = 0..n1*n2 for untied samples of sizes n1 and n2. """
+        counts = [[[1] for _ in range(n2 + 1)] for _ in range(n1 + 1)]
+        for m in range(1, n1 + 1):
+            for n in range(1, n2 + 1):
+                shifted = [0] * n + counts[m - 1][n]
+                smaller = counts[m][n - 1]
+                counts[m][n] = [(shifted[u] if u < len(shifted) else 0) + (smaller[u] if u < len(smaller) else 0)
+                                for u in range(m * n + 1)]
+        return counts[n1][n2]
+
+    @staticmethod
+    def mann_whitney_u(x: Sequence[float], y: Sequence[float], alternative: str = "two-sided") -> Tuple[float, float]:
+        """
+        Mann-Whitney U test: do values in x tend to be smaller ("less") or larger ("greater")
+        than values in y, or either ("two-sided")?
+
+        Exact for small untied samples, otherwise the normal approximation with tie and
+        continuity corrections.
+
+        Returns:
+            (U for x, p-value)
+        """
+        if alternative not in ("two-sided", "less", "greater"):
+            raise ValueError("alternative must be 'two-sided', 'less' or 'greater'")
+        n1, n2 = len(x), len(y)
+        if n1 == 0 or n2 == 0:
+            return 0.0, 1.0
+        pooled = sorted([(value, 0) for value in x] + [(value, 1) for value in y])
+        ranks = [0.0] * len(pooled)
+        ties = 0.0
+        i = 0
+        while i < len(pooled):
+            j = i
+            while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+                j += 1
+            for k in range(i, j + 1):
+                ranks[k] = (i + j) / 2 + 1
+            ties += (j - i + 1) ** 3 - (j - i + 1)
+            i = j + 1
+        u = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 0) - n1 * (n1 + 1) / 2
+
+        if ties == 0 and n1 + n2 <= EXACT_MAX_SAMPLES:
+            counts = StatTests._u_distribution(n1, n2)
+            total = sum(counts)
+            below = sum(counts[:int(u) + 1]) / total
+            above = sum(counts[int(u):]) / total
+        else:
+            n = n1 + n2
+            sigma = (n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))) ** 0.5
+            if sigma == 0:
+                return u, 1.0
+            mean = n1 * n2 / 2
+            below = NormalDist().cdf((u - mean + 0.5) / sigma)
+            above = 1 - NormalDist().cdf((u - mean - 0.5) / sigma)
+
+        if alternative == "less":
+            return u, below
+        if alternative == "greater":
+            return u, above
+        return u, min(1.0, 2 * min(below, above))
+
+    @staticmethod
+    def mann_kendall(series: Sequence[float], alternative: str = "two-sided") -> Tuple[float, float]:
+        """
+        Mann-Kendall trend test: does the series tend to rise ("increasing"), fall
+        ("decreasing"), or either ("two-sided") over its order?
+
+        Normal approximation with tie and continuity corrections (fine from about 10 points).
+
+        Returns:
+            (Kendall's tau against position, p-value)
+        """
+        if alternative not in ("two-sided", "increasing", "decreasing"):
+            raise ValueError("alternative must be 'two-sided', 'increasing' or 'decreasing'")
+        n = len(series)
+        if n < 3:
+            return 0.0, 1.0
+        s = 0
+        for i in range(n - 1):
+            first = series[i]
+            for later in series[i + 1:]:
+                s += (later > first) - (later < first)
+        counts = {}
+        for value in series:
+            counts[value] = counts.get(value, 0) + 1
+        variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in counts.values())) / 18
+        tau = s / (n * (n - 1) / 2)
+        if variance <= 0:
+            return tau, 1.0
+        z = (s - (s > 0) + (s < 0)) / variance ** 0.5
+        rising, falling = 1 - NormalDist().cdf(z), NormalDist().cdf(z)
+        if alternative == "increasing":
+            return tau, rising
+        if alternative == "decreasing":
+            return tau, falling
+        return tau, min(1.0, 2 * min(rising, falling))
+
+    @staticmethod
+    def chi_squared_sf(x: float, dof: int) -> float:
+        """ Upper tail P(X >= x) of the chi-squared distribution (regularized incomplete gamma). """
+        if x <= 0 or dof <= 0:
+            return 1.0
+        a, x = dof / 2, x / 2
+        log_front = a * math.log(x) - x - math.lgamma(a)
+        if x < a + 1:  # Series for the lower tail
+            term = total = 1 / a
+            n = a
+            while abs(term) > abs(total) * 1e-15:
+                n += 1
+                term *= x / n
+                total += term
+            return max(0.0, 1 - total * math.exp(log_front))
+        # Continued fraction for the upper tail (modified Lentz)
+        tiny = 1e-300
+        b = x + 1 - a
+        c, d = 1 / tiny, 1 / b
+        h = d
+        for i in range(1, 1000):
+            an = -i * (i - a)
+            b += 2
+            d = an * d + b
+            d = tiny if abs(d) < tiny else d
+            c = b + an / c
+            c = tiny if abs(c) < tiny else c
+            d = 1 / d
+            h *= d * c
+            if abs(d * c - 1) < 1e-15:
+                break
+        return min(1.0, h * math.exp(log_front))
+
+    @staticmethod
+    def chi_squared_homogeneity(table: Sequence[Sequence[float]]) -> Tuple[float, int, float]:
+        """
+        Chi-squared test that the rows of a contingency table (e.g. two samples' counts per
+        category) come from one distribution. Empty columns are dropped and columns expected
+        to hold fewer than MIN_EXPECTED in any row are merged into their neighbours.
+
+        Returns:
+            (statistic, degrees of freedom, p-value)
+        """
+        rows = [sum(row) for row in table]
+        total = sum(rows)
+        if total == 0 or min(rows) == 0:
+            return 0.0, 0, 1.0
+        merged, pending = [], None
+        for column in zip(*table):
+            pending = list(column) if pending is None else [p + c for p, c in zip(pending, column)]
+            if min(row * sum(pending) / total for row in rows) >= MIN_EXPECTED:
+                merged.append(pending)
+                pending = None
+        if pending is not None and sum(pending):
+            if merged:
+                merged[-1] = [m + p for m, p in zip(merged[-1], pending)]
+            else:
+                merged.append(pending)
+        if len(merged) < 2:
+            return 0.0, 0, 1.0
+        statistic = 0.0
+        for column in merged:
+            share = sum(column) / total
+            for observed, row in zip(column, rows):
+                expected = row * share
+                statistic += (observed - expected) ** 2 / expected
+        dof = (len(merged) - 1) * (len(rows) - 1)
+        return statistic, dof, StatTests.chi_squared_sf(statistic, dof)
+
+    @staticmethod
+    def ks_two_sample(x: Sequence[float], y: Sequence[float]) -> Tuple[float, float]:
+        """
+        Two-sample Kolmogorov-Smirnov test: largest gap D between the empirical CDFs, with the
+        asymptotic p-value (conservative for discrete data such as runs or pitch counts).
+
+        Returns:
+            (D, p-value)
+        """
+        n1, n2 = len(x), len(y)
+        if n1 == 0 or n2 == 0:
+            return 0.0, 1.0
+        x, y = sorted(x), sorted(y)
+        i = j = 0
+        d = 0.0
+        while i < n1 and j < n2:
+            value = min(x[i], y[j])
+            while i < n1 and x[i] == value:
+                i += 1
+            while j < n2 and y[j] == value:
+                j += 1
+            d = max(d, abs(i / n1 - j / n2))
+        root = (n1 * n2 / (n1 + n2)) ** 0.5
+        lam = (root + 0.12 + 0.11 / root) * d
+        if lam < 0.2:
+            return d, 1.0
+        p = 2 * sum((-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam) for k in range(1, 101))
+        return d, min(1.0, max(0.0, p))
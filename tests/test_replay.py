@@ -0,0 +1,19 @@
+from GAMEDAY import run_game
+from SIMULATION.BATCH_SIM import simulate_chunk
+from SIMULATION.REPLAY import GameReplayer
+
+
+def _row(game):
+    stats = game.gamestate.stats
+    return (stats['away_team']['score'], stats['home_team']['score'], game.gamestate.current_inning,
+            stats['away_team']['hits'], stats['home_team']['hits'])
+
+
+def test_replayed_games_match_the_chunk():
+    games = simulate_chunk("PIT", "WAS", 0, 6, seed=7)
+    replayer = GameReplayer("PIT", "WAS", seed=7)
+    for game in (4, 1):
+        assert _row(replayer.play(game)) == tuple(games[game])[:5]
+        with replayer.at(game, 23) as resumed:  # Continues from the PA 20 checkpoint
+            run_game(resumed, resume=True)
+        assert _row(resumed) == tuple(games[game])[:5]
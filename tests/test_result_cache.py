@@ -0,0 +1,14 @@
+from SERVICE.RESULT_CACHE import ResultCache
+
+
+def test_reversed_matchups_get_different_keys(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for op in ("games", "h2h_cell"):
+        forward, _ = cache.make_key(op, ["PIT", "WAS"], 7, 100)
+        reverse, _ = cache.make_key(op, ["WAS", "PIT"], 7, 100)
+        assert forward != reverse
+
+
+def test_team_sets_key_like_their_sorted_list(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.make_key("season", {"WAS", "PIT"}, 7)[0] == cache.make_key("season", ["PIT", "WAS"], 7)[0]
@@ -0,0 +1,12 @@
+import warnings
+import numpy as np
+from UTILITIES.STAT_TESTS import StatTests
+
+
+def test_wilson_interval_fills_empty_array_cells():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        low, high = StatTests.wilson_interval(np.array([0, 3, 5]), np.array([0, 10, 5]))
+    np.testing.assert_array_equal([low[0], high[0]], [0.0, 1.0])
+    np.testing.assert_allclose([low[1], high[1]], StatTests.wilson_interval(3, 10))
+    assert 0 < low[2] < 1 and np.isclose(high[2], 1.0)
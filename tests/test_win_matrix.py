@@ -0,0 +1,10 @@
+import numpy as np
+from ANALYSIS.WIN_MATRIX import compute_win_matrix
+
+
+def test_seeded_matrix_does_not_depend_on_workers():
+    kwargs = dict(teams=["PIT", "WAS"], width=0.2, seed=11, batch=40, max_games=200)
+    serial = compute_win_matrix(workers=1, **kwargs)
+    pooled = compute_win_matrix(workers=4, **kwargs)
+    for name in ("p", "lo", "hi", "games"):
+        np.testing.assert_array_equal(serial[name], pooled[name])